@@ -7,6 +7,7 @@ import requests
 from typing import Dict, Any, Optional
 import logging
 from .config import Config, ETHERSCAN_API_KEY, ETHERSCAN_BASE_URL
+from governance_token_analyzer.core.rate_limiter import get_rate_limiter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -53,7 +54,8 @@ class EtherscanAPI:
         params["apikey"] = self.api_key
 
         try:
-            # Make the request
+            # Make the request once the shared Etherscan quota allows it
+            get_rate_limiter("etherscan").acquire()
             response = requests.get(self.base_url, params=params)
             response.raise_for_status()  # Raise exception for 4XX/5XX responses
 
@@ -252,6 +254,7 @@ class TheGraphAPI:
             payload["variables"] = variables
 
         try:
+            get_rate_limiter("graph").acquire()
             response = requests.post(self.subgraph_url, json=payload)
             response.raise_for_status()
             return response.json()
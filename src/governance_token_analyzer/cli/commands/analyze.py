@@ -4,12 +4,15 @@ import os
 import sys
 import json
 from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
 import click
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from governance_token_analyzer.core.bootstrap import bootstrap_confidence_intervals
+from governance_token_analyzer.core.fixed_point import parse_balances
 from governance_token_analyzer.core.metrics_collector import MetricsCollector
 
 
@@ -22,6 +25,8 @@ def execute_analyze_command(
     live_data: bool = True,
     simulated_data: bool = False,
     verbose: bool = False,
+    confidence_level: Optional[float] = None,
+    stream: bool = False,
 ) -> None:
     """
     Execute the analyze command.
@@ -35,6 +40,8 @@ def execute_analyze_command(
         live_data: Whether to use live blockchain data
         simulated_data: Whether to use simulated data
         verbose: Whether to show detailed metrics
+        confidence_level: If set, report bootstrap confidence intervals at this level
+        stream: Whether to compute metrics page by page without keeping the holder list
     """
     # Ensure output directory exists
     try:
@@ -51,6 +58,10 @@ def execute_analyze_command(
     else:
         click.echo("🎲 Generating simulated data...")
 
+    if stream:
+        _execute_streaming_analysis(metrics_collector, protocol, limit, output_format, output_dir, verbose)
+        return
+
     # Collect protocol data with error handling
     try:
         data = metrics_collector.collect_protocol_data(protocol, limit=limit)
@@ -63,9 +74,7 @@ def execute_analyze_command(
 
     # Calculate metrics
     if "token_holders" in data and "metrics" in data:
-        balances = [
-            float(holder.get("balance", 0)) for holder in data["token_holders"] if float(holder.get("balance", 0)) > 0
-        ]
+        balances = parse_balances([holder.get("balance", 0) for holder in data["token_holders"]]).positive()
         metrics = data["metrics"]
 
         if balances:
@@ -81,6 +90,14 @@ def execute_analyze_command(
                 click.echo(f"  • Theil index: {metrics.get('theil_index', 'N/A')}")
                 click.echo(f"  • Palma ratio: {metrics.get('palma_ratio', 'N/A')}")
 
+            if confidence_level:
+                ci = bootstrap_confidence_intervals(balances, confidence=confidence_level)
+                data["confidence_intervals"] = ci
+                click.echo(f"\n📏 {confidence_level:.0%} bootstrap confidence intervals ({ci['resamples']} resamples):")
+                for name, interval in ci["intervals"].items():
+                    label = name.replace("_", " ").capitalize()
+                    click.echo(f"  • {label}: {interval['lower']:.4f} – {interval['upper']:.4f}")
+
             # Save output file
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             output_file = os.path.join(output_dir, f"{protocol}_analysis_{timestamp}.{output_format}")
@@ -110,9 +127,9 @@ def execute_analyze_command(
                 plt.figure(figsize=(10, 6))
 
                 # Sort balances in descending order
-                balances_sorted = sorted(balances, reverse=True)
+                balances_sorted = balances[balances.argsort(descending=True)].to_float()
 
-                if not balances_sorted:
+                if not balances_sorted.size:
                     click.secho("⚠️ No balances to plot", fg="yellow")
                     plt.close()
                     return
@@ -127,9 +144,9 @@ def execute_analyze_command(
 
                 # Add Lorenz curve on second axis
                 ax2 = plt.twinx()
-                total = sum(balances_sorted)
+                total = balances_sorted.sum()
                 if total > 0:  # Prevent division by zero
-                    lorenz = [sum(balances_sorted[: i + 1]) / total for i in range(len(balances_sorted))]
+                    lorenz = np.cumsum(balances_sorted) / total
                     ax2.plot(range(1, len(balances_sorted) + 1), lorenz, "r-", alpha=0.7)
                     ax2.set_ylabel("Cumulative Share", color="r")
                 else:
@@ -144,3 +161,62 @@ def execute_analyze_command(
             click.echo("❌ No positive balances found in the data")
     else:
         click.echo("❌ No token holders or metrics found in the data")
+
+
+def _execute_streaming_analysis(
+    metrics_collector: MetricsCollector,
+    protocol: str,
+    limit: int,
+    output_format: str,
+    output_dir: str,
+    verbose: bool,
+) -> None:
+    """Analyze a protocol from streamed holder pages and save the metrics.
+
+    Args:
+        metrics_collector: Collector whose API client pages through the holders
+        protocol: Protocol to analyze (compound, uniswap, aave)
+        limit: Maximum number of token holders to analyze
+        output_format: Output format (json, csv)
+        output_dir: Directory to save output files
+        verbose: Whether to show detailed metrics
+
+    """
+    try:
+        streamed = metrics_collector.stream_protocol_metrics(protocol, limit=limit)
+    except Exception as e:
+        click.secho(f"❌ Error collecting data for {protocol}: {e}", fg="red")
+        sys.exit(1)
+
+    metrics = streamed["metrics"]
+    if not metrics.get("total_holders"):
+        click.echo("❌ No positive balances found in the data")
+        return
+
+    click.echo(f"\n📊 Token Distribution Analysis (streamed in {streamed['pages']} pages):")
+    click.echo(f"  • Total holders analyzed: {metrics['total_holders']}")
+    click.echo(f"  • Nakamoto coefficient (estimate): {metrics.get('nakamoto_coefficient', 'N/A')}")
+    click.echo(f"  • Theil index: {metrics.get('theil_index', 'N/A')}")
+
+    if verbose:
+        click.echo(f"  • Shannon entropy: {metrics.get('shannon_entropy', 'N/A')}")
+        click.echo(f"  • Herfindahl index: {metrics.get('herfindahl_index', 'N/A')}")
+        click.echo(f"  • Palma ratio (estimate): {metrics.get('palma_ratio', 'N/A')}")
+        click.echo(f"  • Sketch relative error: {metrics.get('sketch_relative_error', 'N/A')}")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = os.path.join(output_dir, f"{protocol}_analysis_{timestamp}.{output_format}")
+    if output_format == "json":
+        data = {
+            "protocol": protocol,
+            "pages": streamed["pages"],
+            "metrics": metrics,
+            "balance_sketch": streamed["sketch"].to_dict(),
+        }
+        with open(output_file, "w") as f:
+            json.dump(data, f, indent=2)
+    else:
+        flat = {name: value for name, value in metrics.items() if not isinstance(value, dict)}
+        pd.DataFrame([flat]).to_csv(output_file, index=False)
+
+    click.echo(f"\n💾 Analysis saved to {output_file}")
@@ -11,6 +11,7 @@ from typing import List
 import click
 import matplotlib.pyplot as plt
 
+from governance_token_analyzer.core.metric_registry import METRIC_REGISTRY
 from governance_token_analyzer.core.metrics_collector import MetricsCollector
 from governance_token_analyzer.core.historical_data import HistoricalDataManager
 from .utils import (
@@ -155,8 +156,9 @@ def execute_compare_protocols_command(
         # Initialize metrics collector
         metrics_collector = MetricsCollector(use_live_data=True)
 
-        # Compare protocols
-        comparison_data = metrics_collector.compare_protocols(protocol_list, metric)
+        # Compute only the requested metric unless detailed output was asked for
+        metrics = None if detailed or metric not in METRIC_REGISTRY else [metric]
+        comparison_data = metrics_collector.compare_protocols(protocol_list, metric, metrics=metrics)
 
         # Display comparison results
         display_protocol_comparison(comparison_data, metric)
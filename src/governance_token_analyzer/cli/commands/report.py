@@ -9,6 +9,8 @@ allowing users to create detailed analysis reports with visualizations.
 from typing import Dict, Any, List, Optional
 
 import click
+from governance_token_analyzer.core.advanced_metrics import calculate_all_concentration_metrics
+from governance_token_analyzer.core.fixed_point import parse_balances
 from governance_token_analyzer.core.historical_data import HistoricalDataManager
 from governance_token_analyzer.visualization.report_generator import ReportGenerator
 from .utils import ensure_output_directory, handle_cli_error, CLIError
@@ -134,10 +136,12 @@ def execute_generate_report_command(
             click.echo(f"⚠️ Error fetching votes data: {e}")
             votes_data = []
 
-        # Process token holders data
+        # Process token holders data; metrics for an unchanged holder set come from the metric cache
+        balances = parse_balances([holder.get("balance", 0) for holder in holders_data]).positive()
+        metrics = calculate_all_concentration_metrics(balances) if balances else {}
         current_data = {
             "token_holders": holders_data,
-            "metrics": {},  # Will be calculated by the report generator
+            "metrics": {name: value for name, value in metrics.items() if isinstance(value, (int, float))},
         }
 
         # Initialize report generator
@@ -11,6 +11,7 @@ from datetime import datetime
 from typing import Dict, List, Any, Tuple, Optional
 
 import click
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -308,7 +309,7 @@ def create_distribution_chart(balances: List[float], protocol: str, chart_file:
         ax2 = plt.twinx()
         total = sum(balances_sorted)
         if total > 0:  # Prevent division by zero
-            lorenz = [sum(balances_sorted[: i + 1]) / total for i in range(len(balances_sorted))]
+            lorenz = np.cumsum(balances_sorted) / total
             ax2.plot(range(1, len(balances_sorted) + 1), lorenz, "r-", alpha=0.7)
             ax2.set_ylabel("Cumulative Share", color="r")
         else:
@@ -18,12 +18,13 @@ import click
 try:
     # Import core functionality
     from governance_token_analyzer.core.api_client import APIClient
-    from governance_token_analyzer.core.advanced_metrics import (
-        calculate_all_concentration_metrics,
-        calculate_gini_coefficient,
-        calculate_nakamoto_coefficient,
-    )
+    from governance_token_analyzer.core.circuit_breaker import circuit_breaker_states
+    from governance_token_analyzer.core.advanced_metrics import calculate_all_concentration_metrics
+    from governance_token_analyzer.core.concentration_engine import ConcentrationEngine, calculate_batch_metrics
+    from governance_token_analyzer.core.metric_registry import available_metrics, compute_metrics
     from governance_token_analyzer.core.config import PROTOCOLS
+    from governance_token_analyzer.core.fixed_point import parse_balances
+    from governance_token_analyzer.core.http_cache import set_offline_mode
     from governance_token_analyzer.core.data_simulator import TokenDistributionSimulator
     from governance_token_analyzer.core import historical_data
     from governance_token_analyzer.visualization.report_generator import ReportGenerator
@@ -45,21 +46,22 @@ except ImportError as e:
 
 # Configuration constants
 SUPPORTED_PROTOCOLS = list(PROTOCOLS.keys())
-SUPPORTED_METRICS = [
-    "gini_coefficient",
-    "nakamoto_coefficient",
-    "shannon_entropy",
-    "herfindahl_index",
-    "participation_rate",
-]
+# Distribution metrics come from the metric registry; participation is a governance metric
+SUPPORTED_METRICS = available_metrics(scalar_only=True) + ["participation_rate"]
 SUPPORTED_FORMATS = ["json", "csv", "html", "png"]
 
 
 # CLI Group Configuration
 @click.group(context_settings={"max_content_width": 120})
 @click.version_option(version="1.0.0", prog_name="gova")
+@click.option(
+    "--offline",
+    is_flag=True,
+    envvar="GOVA_OFFLINE",
+    help="Serve provider responses only from the local HTTP cache",
+)
 @click.pass_context
-def cli(ctx):
+def cli(ctx, offline):
     """🏛️ Governance Token Distribution Analyzer
 
     A comprehensive tool for analyzing token concentration,
@@ -89,9 +91,14 @@ def cli(ctx):
     [E] -c, --chart          Generate charts/visualizations
 
     [F] -h, --help           Show command help
+
+    [G] --offline            Use only cached provider responses (before the command)
     """
     # Ensure context object exists
     ctx.ensure_object(dict)
+    ctx.obj["offline"] = offline
+    if offline:
+        set_offline_mode(True)
 
 
 class ProtocolChoice(click.Choice):
@@ -160,7 +167,21 @@ def validate_positive_int(ctx, param, value):
     help="Use simulated data instead of live data",
 )
 @click.option("--verbose", "-v", is_flag=True, help="Enable verbose output with detailed metrics")
-def analyze(protocol, limit, output_format, output_dir, chart, live_data, simulated_data, verbose):
+@click.option(
+    "--ci",
+    "confidence_level",
+    type=click.FloatRange(0, 1, min_open=True, max_open=True),
+    default=None,
+    help="Report bootstrap confidence intervals at this level (e.g. 0.95)",
+)
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Compute metrics page by page in bounded memory, without keeping the holder list",
+)
+def analyze(
+    protocol, limit, output_format, output_dir, chart, live_data, simulated_data, verbose, confidence_level, stream
+):
     """📊 Analyze token distribution for a specific protocol.
 
     Calculates concentration metrics and generates detailed analysis reports.
@@ -174,11 +195,15 @@ def analyze(protocol, limit, output_format, output_dir, chart, live_data, simula
       -L, --live-data            Use live blockchain data (default)
       -S, --simulated-data       Use simulated data instead of live data
       -v, --verbose              Enable verbose output with detailed metrics
+      --ci                       Report bootstrap confidence intervals at this level
+      --stream                   Compute metrics page by page in bounded memory
 
     Examples:
       gova analyze -p compound -f json
       gova analyze -p uniswap -c -v
       gova analyze -p aave -S
+      gova analyze -p compound --ci 0.95
+      gova analyze -p uniswap -l 5000000 --stream
     """
     # Handle mutually exclusive options
     if live_data and simulated_data:
@@ -186,6 +211,9 @@ def analyze(protocol, limit, output_format, output_dir, chart, live_data, simula
             "Options --live-data and --simulated-data are mutually exclusive. Please specify only one."
         )
 
+    if stream and (chart or confidence_level):
+        raise click.UsageError("--stream cannot be combined with --chart or --ci, which need every balance.")
+
     # Set live_data based on simulated_data flag
     if simulated_data:
         live_data = False
@@ -199,6 +227,8 @@ def analyze(protocol, limit, output_format, output_dir, chart, live_data, simula
             chart=chart,
             live_data=live_data,
             verbose=verbose,
+            confidence_level=confidence_level,
+            stream=stream,
         )
     except click.Abort:
         sys.exit(1)
@@ -486,7 +516,7 @@ def _ensure_directories(dirs):
         return False
 
 
-def _process_snapshot(index, date_str, snapshot_data, protocol, protocol_dir):
+def _process_snapshot(index, date_str, snapshot_data, protocol, protocol_dir, metrics=None):
     """Process a single historical snapshot.
 
     Args:
@@ -495,6 +525,7 @@ def _process_snapshot(index, date_str, snapshot_data, protocol, protocol_dir):
         snapshot_data: Snapshot data dictionary
         protocol: Protocol name
         protocol_dir: Directory for protocol data
+        metrics: Precomputed metrics for this snapshot (optional)
 
     Returns:
         Tuple of date string and gini coefficient
@@ -506,15 +537,15 @@ def _process_snapshot(index, date_str, snapshot_data, protocol, protocol_dir):
 
     # Calculate metrics if not present or if token holders are available
     if token_holders:
-        balances = [balance for holder in token_holders if (balance := float(holder.get("balance", 0))) > 0]
+        balances = parse_balances([holder.get("balance", 0) for holder in token_holders]).positive()
 
         if balances:
-            # Calculate metrics
-            metrics = {}
-            metrics["gini_coefficient"] = calculate_gini_coefficient(balances)
-            metrics["nakamoto_coefficient"] = calculate_nakamoto_coefficient(balances)
-            metrics["total_holders"] = len(balances)
-            metrics["total_supply"] = sum(balances)
+            if metrics is None:
+                # Calculate only the snapshot metrics from one shared engine
+                engine = ConcentrationEngine(balances)
+                metrics = compute_metrics(engine, ["gini_coefficient", "nakamoto_coefficient"])
+                metrics["total_holders"] = engine.n
+                metrics["total_supply"] = engine.total
 
             # Create snapshot with metrics
             snapshot = {
@@ -569,9 +600,25 @@ def process_and_save_historical_snapshots(historical_snapshots_dict, protocol, p
         click.echo(f"❌ Error creating directories: {e}")
         return dates, gini_values
 
+    # Calculate metrics for all snapshots in one batched pass
+    snapshot_balances = [
+        parse_balances([holder.get("balance", 0) for holder in snapshot_data.get("token_holders", [])])
+        for snapshot_data in historical_snapshots_dict.values()
+    ]
+    batch = calculate_batch_metrics(snapshot_balances)
+    batch_metrics = [
+        {
+            "gini_coefficient": float(batch["gini_coefficient"][i]),
+            "nakamoto_coefficient": int(batch["nakamoto_coefficient"][i]),
+            "total_holders": int(batch["total_holders"][i]),
+            "total_supply": float(batch["total_supply"][i]),
+        }
+        for i in range(len(snapshot_balances))
+    ]
+
     # Process all snapshots and collect visualization data
     visualization_data = [
-        _process_snapshot(i, date_str, snapshot_data, protocol, protocol_dir)
+        _process_snapshot(i, date_str, snapshot_data, protocol, protocol_dir, metrics=batch_metrics[i])
         for i, (date_str, snapshot_data) in enumerate(historical_snapshots_dict.items())
     ]
 
@@ -770,6 +817,19 @@ def status(check_apis, test_protocols, verbose):
             except Exception as e:
                 click.echo(f"    ❌ Error: {e}")
 
+    # Provider circuit breakers live in memory, so only the probes above can move them
+    click.echo("\n🔌 Provider Health (this process only):")
+    if not test_protocols:
+        click.echo("  ℹ️ Circuit breakers start closed in every gova process; add -t to probe the providers first")
+    state_icons = {"closed": "✅", "half_open": "🟡", "open": "⛔"}
+    for provider, circuit in circuit_breaker_states().items():
+        details = circuit["state"].replace("_", "-")
+        if circuit["consecutive_failures"]:
+            details += f", {circuit['consecutive_failures']} consecutive failures"
+        if circuit["retry_in"]:
+            details += f", probing again in {circuit['retry_in']:.0f}s"
+        click.echo(f"  {state_icons[circuit['state']]} {provider}: {details}")
+
     click.echo("\n✅ Status check complete")
 
 
@@ -1,18 +1,32 @@
 """Advanced Concentration Metrics for Token Distribution Analysis.
 
 This module provides advanced metrics for analyzing token distribution concentration
-beyond the basic Gini coefficient and Herfindahl index.
+beyond the basic Gini coefficient and Herfindahl index. All metrics are computed by
+the shared ConcentrationEngine, so each function also accepts a prebuilt engine or a
+parsed FixedPointBalances column.
+Rank-based metrics additionally support an approximate mode backed by a BalanceSketch.
 """
 
 import logging
-from typing import Any, Dict, List
-
-import numpy as np
+from typing import Any, Dict, List, Optional, Union
+
+from .balance_parsing import clean_balances
+from .balance_sketch import BalanceSketch
+from .concentration_engine import (
+    DEFAULT_CONCENTRATION_CURVE_RESOLUTION,
+    DEFAULT_LORENZ_RESOLUTION,
+    ConcentrationEngine,
+)
+from .fixed_point import FixedPointBalances
+from .metric_cache import get_metric_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Control thresholds that commonly decide governance outcomes, in percent of supply
+GOVERNANCE_THRESHOLDS = {"quorum": 4.0, "blocking_minority": 33.0, "majority": 50.0}
+
 
 def calculate_gini_coefficient(balances: List[float]) -> float:
     """Calculate the Gini coefficient, which measures inequality in token distribution.
@@ -26,21 +40,7 @@ def calculate_gini_coefficient(balances: List[float]) -> float:
         Gini coefficient as a float between 0 and 1
 
     """
-    if not balances or sum(balances) == 0:
-        return 0.0
-
-    # Sort balances in ascending order
-    sorted_balances = sorted(balances)
-    n = len(sorted_balances)
-
-    # Calculate the Gini coefficient using the formula:
-    # G = (2 * sum(i * x_i)) / (n * sum(x_i)) - (n + 1) / n
-    total = sum(sorted_balances)
-    weighted_sum = sum((i + 1) * balance for i, balance in enumerate(sorted_balances))
-
-    gini = (2 * weighted_sum) / (n * total) - (n + 1) / n
-
-    return max(0.0, min(1.0, gini))  # Ensure result is between 0 and 1
+    return ConcentrationEngine.from_balances(balances).gini_coefficient()
 
 
 def calculate_herfindahl_index(balances: List[float]) -> float:
@@ -56,18 +56,10 @@ def calculate_herfindahl_index(balances: List[float]) -> float:
         Herfindahl index as a float
 
     """
-    if not balances or sum(balances) == 0:
-        return 0.0
-
-    total = sum(balances)
-
-    # Calculate the sum of squared market shares
-    hhi = sum((balance / total) ** 2 for balance in balances)
+    return ConcentrationEngine.from_balances(balances).herfindahl_index()
 
-    return hhi * 10000  # Scale to traditional HHI range (0-10000)
 
-
-def calculate_palma_ratio(balances: List[float]) -> float:
+def calculate_palma_ratio(balances: List[float], approximate: bool = False) -> float:
     """Calculate the Palma ratio, which is the ratio of the share of total income held by the
     top 10% to that held by the bottom 40%.
 
@@ -75,34 +67,16 @@ def calculate_palma_ratio(balances: List[float]) -> float:
     of holders versus the bottom 40%.
 
     Args:
-        balances: List of token balances sorted in descending order
+        balances: List of token balances sorted in descending order, or a BalanceSketch
+        approximate: Whether to answer from a fixed-size BalanceSketch instead of a full sort
 
     Returns:
         Palma ratio as a float
 
     """
-    if not balances or sum(balances) == 0:
-        return 0.0
-
-    # Sort balances in descending order to ensure correct calculation
-    sorted_balances = sorted(balances, reverse=True)
-
-    total = sum(sorted_balances)
-
-    # Calculate the number of holders representing the top 10% and bottom 40%
-    n = len(sorted_balances)
-    top_10_count = max(1, int(n * 0.1))
-    bottom_40_count = max(1, int(n * 0.4))
-
-    # Calculate share of top 10% and bottom 40%
-    top_10_share = sum(sorted_balances[:top_10_count]) / total
-    bottom_40_share = sum(sorted_balances[-bottom_40_count:]) / total
-
-    # Avoid division by zero
-    if bottom_40_share == 0:
-        return float("inf")  # Infinite inequality
-
-    return top_10_share / bottom_40_share
+    if approximate or isinstance(balances, BalanceSketch):
+        return BalanceSketch.from_balances(balances).palma_ratio()
+    return ConcentrationEngine.from_balances(balances).palma_ratio()
 
 
 def calculate_hoover_index(balances: List[float]) -> float:
@@ -116,20 +90,7 @@ def calculate_hoover_index(balances: List[float]) -> float:
         Hoover index as a float between 0 and 1
 
     """
-    if not balances or sum(balances) == 0:
-        return 0.0
-
-    total = sum(balances)
-    n = len(balances)
-
-    # Calculate the mean balance
-    mean_balance = total / n
-
-    # Calculate the sum of absolute deviations from the mean
-    sum_deviations = sum(abs(balance - mean_balance) for balance in balances)
-
-    # The Hoover index is half of the relative mean deviation
-    return sum_deviations / (2 * total)
+    return ConcentrationEngine.from_balances(balances).hoover_index()
 
 
 def calculate_theil_index(balances: List[float]) -> float:
@@ -143,160 +104,145 @@ def calculate_theil_index(balances: List[float]) -> float:
         Theil index as a float (0 = perfect equality, higher values = more inequality)
 
     """
-    if not balances or sum(balances) == 0:
-        return 0.0
-
-    n = len(balances)
-    total = sum(balances)
-    mean = total / n
-
-    # Calculate Theil index
-    theil = 0
-    for balance in balances:
-        if balance <= 0:
-            continue  # Skip zero or negative balances
-
-        # Calculate individual contribution to Theil index
-        x_i = balance / mean
-        theil += (x_i * np.log(x_i)) / n
+    return ConcentrationEngine.from_balances(balances).theil_index()
 
-    return theil
 
-
-def calculate_nakamoto_coefficient(balances: List[float], threshold: float = 51.0) -> int:
+def calculate_nakamoto_coefficient(balances: List[float], threshold: float = 51.0, approximate: bool = False) -> int:
     """Calculate the Nakamoto coefficient, which is the minimum number of entities
     required to achieve a specified threshold of control (usually 51%).
 
     Args:
-        balances: List of token balances in descending order
+        balances: List of token balances in descending order, or a BalanceSketch
         threshold: Control threshold percentage (default: 51%)
+        approximate: Whether to answer from a fixed-size BalanceSketch instead of a full sort
 
     Returns:
         Nakamoto coefficient as an integer
 
     """
-    if not balances or sum(balances) == 0:
-        return 0
+    if approximate or isinstance(balances, BalanceSketch):
+        return BalanceSketch.from_balances(balances).nakamoto_coefficient(threshold)
+    return ConcentrationEngine.from_balances(balances).nakamoto_coefficient(threshold)
 
-    # Sort balances in descending order to ensure correct calculation
-    sorted_balances = sorted(balances, reverse=True)
 
-    total = sum(sorted_balances)
-    running_sum = 0
+def calculate_nakamoto_thresholds(
+    balances: List[float],
+    thresholds: Optional[Dict[str, float]] = None,
+    proposal_threshold: Optional[float] = None,
+) -> Dict[str, Optional[int]]:
+    """Calculate the Nakamoto coefficient at several governance thresholds at once.
 
-    for i, balance in enumerate(sorted_balances):
-        running_sum += balance
-        if (running_sum / total * 100) >= threshold:
-            return i + 1
+    All thresholds are answered from one cumulative sum with a single binary search.
 
-    # If the threshold cannot be reached (unlikely in practice)
-    return len(sorted_balances)
+    Args:
+        balances: List of token balances
+        thresholds: Mapping of names to control threshold percentages
+            (default: GOVERNANCE_THRESHOLDS)
+        proposal_threshold: Token amount needed to submit a proposal, such as
+            ``PROTOCOL_INFO[protocol]["proposal_threshold"]``. Added as 'proposal_threshold':
+            the number of largest holders whose balances together reach that amount.
 
+    Returns:
+        Dictionary mapping threshold names to the number of holders needed. The
+        'proposal_threshold' entry is None if all balances together hold less than
+        the threshold amount.
 
-def calculate_lorenz_curve(balances: List[float]) -> Dict[str, List[float]]:
-    """Calculate the Lorenz curve coordinates for token distribution.
+    """
+    engine = ConcentrationEngine.from_balances(balances)
+    named = dict(GOVERNANCE_THRESHOLDS if thresholds is None else thresholds)
 
-    The Lorenz curve plots the cumulative share of tokens (y-axis) against
-    the cumulative share of holders (x-axis).
+    reachable = proposal_threshold is not None and 0 < proposal_threshold <= engine.total
+    if reachable:
+        # Percentages are shares of the balances' own total, so the amount converts against it
+        named["proposal_threshold"] = proposal_threshold / engine.total * 100
+
+    counts = dict(zip(named, engine.nakamoto_coefficients(list(named.values())).tolist()))
+    if proposal_threshold is not None and not reachable:
+        counts["proposal_threshold"] = None if proposal_threshold > engine.total else 0
+    return counts
+
+
+def calculate_concentration_curve(
+    balances: List[float], resolution: int = DEFAULT_CONCENTRATION_CURVE_RESOLUTION
+) -> Dict[str, List[float]]:
+    """Calculate the number of largest holders needed to control each share of supply.
 
     Args:
         balances: List of token balances
+        resolution: Number of evenly spaced share levels from 0% to 100%
 
     Returns:
-        Dictionary with 'x' and 'y' coordinates for the Lorenz curve
+        Dictionary with 'share' (percentage) and 'holders' (holders needed)
 
     """
-    if not balances or sum(balances) == 0:
-        return {"x": [0, 1], "y": [0, 1]}
+    return ConcentrationEngine.from_balances(balances).concentration_curve(resolution)
 
-    # Sort balances in ascending order for Lorenz curve calculation
-    sorted_balances = sorted(balances)
 
-    n = len(sorted_balances)
-    total = sum(sorted_balances)
+def calculate_lorenz_curve(balances: List[float], resolution: Optional[int] = None) -> Dict[str, List[float]]:
+    """Calculate the Lorenz curve coordinates for token distribution.
 
-    # Initialize with origin point
-    x_values = [0]
-    y_values = [0]
+    The Lorenz curve plots the cumulative share of tokens (y-axis) against
+    the cumulative share of holders (x-axis).
 
-    # Calculate cumulative percentages
-    cum_balance = 0
-    for i, balance in enumerate(sorted_balances):
-        cum_balance += balance
-        x_values.append((i + 1) / n)
-        y_values.append(cum_balance / total)
+    Args:
+        balances: List of token balances
+        resolution: Number of evenly spaced points to return, or None for one per holder
 
-    return {"x": x_values, "y": y_values}
+    Returns:
+        Dictionary with 'x' and 'y' coordinates for the Lorenz curve
+
+    """
+    return ConcentrationEngine.from_balances(balances).lorenz_curve(resolution)
 
 
-def calculate_top_percentiles(balances: List[float], percentiles: List[int] = None) -> Dict[str, float]:
+def calculate_top_percentiles(
+    balances: List[float], percentiles: List[int] = None, approximate: bool = False
+) -> Dict[str, float]:
     """Calculate the percentage of tokens held by the top X% of holders for specified percentiles.
 
     Args:
-        balances: List of token balances
+        balances: List of token balances, or a BalanceSketch
         percentiles: List of percentiles to calculate
+        approximate: Whether to answer from a fixed-size BalanceSketch instead of a full sort
 
     Returns:
         Dictionary mapping percentiles to concentration percentages
 
     """
-    if percentiles is None:
-        percentiles = [1, 5, 10, 20, 50]
+    if approximate or isinstance(balances, BalanceSketch):
+        return BalanceSketch.from_balances(balances).top_percentiles(percentiles)
+    return ConcentrationEngine.from_balances(balances).top_percentiles(percentiles)
 
-    if not balances or sum(balances) == 0:
-        return {str(p): 0.0 for p in percentiles}
 
-    # Sort balances in descending order
-    sorted_balances = sorted(balances, reverse=True)
-
-    total = sum(sorted_balances)
-    n = len(sorted_balances)
-
-    result = {}
-    for p in percentiles:
-        # Calculate the number of holders in the top p%
-        holder_count = max(1, int(n * p / 100))
-
-        # Calculate the percentage of tokens held by these holders
-        top_p_balance = sum(sorted_balances[:holder_count])
-        result[str(p)] = (top_p_balance / total) * 100
-
-    return result
-
-
-def calculate_all_concentration_metrics(balances: List[float]) -> Dict[str, Any]:
+def calculate_all_concentration_metrics(
+    balances: Union[List[float], FixedPointBalances],
+    lorenz_resolution: Optional[int] = DEFAULT_LORENZ_RESOLUTION,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
     """Calculate all concentration metrics available in this module.
 
+    Results are memoized in the shared metric cache under a digest of the parsed
+    balances, so repeated runs over an unchanged holder set skip the computation.
+
     Args:
-        balances: List of token balances
+        balances: List, array or Series of token balances as numbers or loosely formatted
+            strings, or a parsed FixedPointBalances column
+        lorenz_resolution: Number of Lorenz curve points, or None for one per holder
+        use_cache: Whether to reuse and store results in the shared metric cache
 
     Returns:
         Dictionary of concentration metrics
 
     """
-    # Convert to float and ensure positive balances for calculations
-    try:
-        numeric_balances = []
-        for b in balances:
-            try:
-                # Handle various string formats
-                if isinstance(b, str):
-                    # Remove common formatting characters
-                    clean_balance = b.replace(",", "").replace("$", "").replace(" ", "")
-                    if clean_balance:
-                        numeric_balances.append(float(clean_balance))
-                elif isinstance(b, (int, float)):
-                    numeric_balances.append(float(b))
-            except (ValueError, TypeError):
-                # Skip invalid values
-                continue
-
-        positive_balances = [b for b in numeric_balances if b > 0]
-    except Exception as e:
-        logger.error(f"Error processing balances: {str(e)}")
-        positive_balances = []
-
-    if not positive_balances:
+    if isinstance(balances, FixedPointBalances):
+        # Parsed once upstream, so no per-value conversion is needed
+        positive_balances = balances.positive()
+    else:
+        positive_balances, rejected = clean_balances(balances)
+        if rejected:
+            logger.info(f"Skipped {rejected} balances that could not be parsed")
+
+    if not len(positive_balances):
         logger.warning("No positive balances provided for concentration metrics calculation")
         return {
             "gini_coefficient": 0,
@@ -309,21 +255,16 @@ def calculate_all_concentration_metrics(balances: List[float]) -> Dict[str, Any]
             "lorenz_curve": {"x": [0, 1], "y": [0, 1]},
         }
 
-    # Sort balances in descending order for consistent calculations
-    sorted_balances = sorted(positive_balances, reverse=True)
-
     try:
-        # Calculate all metrics
-        return {
-            "gini_coefficient": calculate_gini_coefficient(sorted_balances),
-            "herfindahl_index": calculate_herfindahl_index(sorted_balances),
-            "palma_ratio": calculate_palma_ratio(sorted_balances),
-            "hoover_index": calculate_hoover_index(sorted_balances),
-            "theil_index": calculate_theil_index(sorted_balances),
-            "nakamoto_coefficient": calculate_nakamoto_coefficient(sorted_balances),
-            "top_percentile_concentration": calculate_top_percentiles(sorted_balances),
-            "lorenz_curve": calculate_lorenz_curve(sorted_balances),
-        }
+        # Sort once and derive every metric from the shared arrays
+        def compute() -> Dict[str, Any]:
+            return ConcentrationEngine(positive_balances).calculate_all(lorenz_resolution)
+
+        if not use_cache:
+            return compute()
+        return get_metric_cache().get_or_compute(
+            positive_balances, "concentration_metrics", compute, lorenz_resolution=lorenz_resolution
+        )
     except Exception as e:
         logger.error(f"Error calculating concentration metrics: {str(e)}")
         # Return empty metrics in case of calculation error
@@ -11,6 +11,7 @@ from typing import Any, Dict, Optional
 import requests
 
 from .config import ETHERSCAN_API_KEY, ETHERSCAN_BASE_URL, Config
+from .rate_limiter import get_rate_limiter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -129,7 +130,8 @@ class APIClient:
         params["apikey"] = self.api_key
 
         try:
-            # Make the request
+            # Make the request once the shared Etherscan quota allows it
+            get_rate_limiter("etherscan").acquire()
             response = requests.get(self.base_url, params=params)
             response.raise_for_status()  # Raise exception for 4XX/5XX responses
 
@@ -328,6 +330,7 @@ class TheGraphAPI:
             payload["variables"] = variables
 
         try:
+            get_rate_limiter("graph").acquire()
             response = requests.post(self.subgraph_url, json=payload)
             response.raise_for_status()
             return response.json()
@@ -5,19 +5,45 @@ This module provides a unified interface for fetching governance token data
 from various blockchain APIs including Etherscan, The Graph, and Alchemy.
 """
 
+import asyncio
+import functools
 import logging
 import os
 import random
-import time
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple, TypeVar
 
+import numpy as np
 import requests
 
+from governance_token_analyzer.core.balance_parsing import to_float_balances
+from governance_token_analyzer.core.circuit_breaker import get_circuit_breaker
+from governance_token_analyzer.core.config import Config
+from governance_token_analyzer.core.exceptions import AllProvidersFailedError, CircuitOpenError, DataAccessError
+from governance_token_analyzer.core.hedging import hedged_call
+from governance_token_analyzer.core.fixed_point import parse_balances
+from governance_token_analyzer.core.http_cache import NEVER_EXPIRES, HTTPResponseCache, get_http_cache
+from governance_token_analyzer.core.json_stream import iter_response_array
+from governance_token_analyzer.core.rate_limiter import get_rate_limiter
+from governance_token_analyzer.core.sample_data import (
+    ColumnRecords,
+    power_law_balances,
+    sample_holder_pages,
+    sample_holder_records,
+    sample_vote_records,
+)
+from governance_token_analyzer.core.transfer_logs import JSONRPCClient, TransferLogIngestor
+from governance_token_analyzer.core.transport import get_transport
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 # Default API keys (should be set through environment variables)
 DEFAULT_ETHERSCAN_API_KEY = os.environ.get("ETHERSCAN_API_KEY", "")
 DEFAULT_INFURA_API_KEY = os.environ.get("INFURA_API_KEY", "")
@@ -171,10 +197,79 @@ GOVERNANCE_QUERIES = {
     """,
 }
 
+# Largest page The Graph returns for a single entity query
+GRAPH_PAGE_SIZE = 1000
+
+# Cursor-paged proposal queries: each page starts after the last id of the previous page,
+# which stays fast at any depth, unlike skip-based paging
+PROPOSAL_PAGE_QUERIES = {
+    "compound": """
+        query GetProposalsPage($first: Int!, $lastId: String!) {
+            proposals(first: $first, where: {id_gt: $lastId}, orderBy: id, orderDirection: asc) {
+                id
+                title
+                description
+                proposer
+                startBlock
+                endBlock
+                forVotes
+                againstVotes
+                abstainVotes
+                canceled
+                queued
+                executed
+                eta
+                createdAt
+            }
+        }
+    """,
+    "uniswap": """
+        query GetProposalsPage($first: Int!, $lastId: String!) {
+            proposals(first: $first, where: {id_gt: $lastId}, orderBy: id, orderDirection: asc) {
+                id
+                title
+                description
+                proposer
+                startBlock
+                endBlock
+                forVotes
+                againstVotes
+                abstainVotes
+                canceled
+                queued
+                executed
+                eta
+                createdAt
+            }
+        }
+    """,
+    "aave": """
+        query GetProposalsPage($first: Int!, $lastId: String!) {
+            proposals(first: $first, where: {id_gt: $lastId}, orderBy: id, orderDirection: asc) {
+                id
+                title
+                description
+                proposer
+                startBlock
+                endBlock
+                forVotes
+                againstVotes
+                abstainVotes
+                canceled
+                queued
+                executed
+                eta
+                createdAt
+            }
+        }
+    """,
+}
+
+# Vote queries are cursor-paged by id so that proposals with many votes are not truncated
 VOTE_QUERIES = {
     "compound": """
-        query GetVotes($proposalId: String!) {
-            votes(where: {proposal: $proposalId}, first: 1000, orderBy: votingPower, orderDirection: desc) {
+        query GetVotes($proposalId: String!, $first: Int!, $lastId: String!) {
+            votes(where: {proposal: $proposalId, id_gt: $lastId}, first: $first, orderBy: id, orderDirection: asc) {
                 id
                 voter
                 support
@@ -187,8 +282,8 @@ VOTE_QUERIES = {
         }
     """,
     "uniswap": """
-        query GetVotes($proposalId: String!) {
-            votes(where: {proposal: $proposalId}, first: 1000, orderBy: votingPower, orderDirection: desc) {
+        query GetVotes($proposalId: String!, $first: Int!, $lastId: String!) {
+            votes(where: {proposal: $proposalId, id_gt: $lastId}, first: $first, orderBy: id, orderDirection: asc) {
                 id
                 voter
                 support
@@ -201,8 +296,8 @@ VOTE_QUERIES = {
         }
     """,
     "aave": """
-        query GetVotes($proposalId: String!) {
-            votes(where: {proposal: $proposalId}, first: 1000, orderBy: votingPower, orderDirection: desc) {
+        query GetVotes($proposalId: String!, $first: Int!, $lastId: String!) {
+            votes(where: {proposal: $proposalId, id_gt: $lastId}, first: $first, orderBy: id, orderDirection: asc) {
                 id
                 voter
                 support
@@ -217,6 +312,40 @@ VOTE_QUERIES = {
 }
 
 
+# Fields selected for each vote in batched vote queries, matching VOTE_QUERIES
+VOTE_FIELDS = ("id", "voter", "support", "votingPower", "reason", "blockNumber", "blockTimestamp", "transactionHash")
+
+
+@functools.lru_cache(maxsize=None)
+def build_vote_batch_query(count: int) -> str:
+    """Build one GraphQL document that pages the votes of several proposals at once.
+
+    Sub-query ``p{i}`` selects the votes of proposal ``$proposal{i}`` after the cursor
+    ``$lastId{i}``, so a single request returns one page for every proposal in the batch.
+
+    Args:
+        count: Number of proposals in the batch
+
+    Returns:
+        GraphQL query taking $first plus $proposal{i} and $lastId{i} for each proposal
+
+    Raises:
+        ValueError: If count is smaller than 1
+
+    """
+    if count < 1:
+        raise ValueError(f"A vote batch needs at least one proposal, got: {count}")
+
+    selection = " ".join(VOTE_FIELDS)
+    parameters = ", ".join(f"$proposal{i}: String!, $lastId{i}: String!" for i in range(count))
+    sub_queries = "\n".join(
+        f"    p{i}: votes(where: {{proposal: $proposal{i}, id_gt: $lastId{i}}}, first: $first, "
+        f"orderBy: id, orderDirection: asc) {{ {selection} }}"
+        for i in range(count)
+    )
+    return f"query GetVotesBatch($first: Int!, {parameters}) {{\n{sub_queries}\n}}"
+
+
 class APIClient:
     """Client for interacting with various blockchain APIs for governance token analysis."""
 
@@ -228,13 +357,22 @@ class APIClient:
         self.graph_api_key = os.getenv("GRAPH_API_KEY")
         self.moralis_api_key = os.getenv("MORALIS_API_KEY")  # New API key
 
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.2  # 200ms between requests
+        # Rate limiting: token buckets shared by every client in the process
+        self.rate_limiters = {provider: get_rate_limiter(provider) for provider in ("etherscan", "moralis")}
 
-        # Request session for connection pooling
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": "GovernanceTokenAnalyzer/1.0"})
+        # Circuit breakers: providers that keep failing are skipped instead of timing out every call
+        self.circuit_breakers = {provider: get_circuit_breaker(provider) for provider in ("etherscan", "moralis")}
+
+        # Requests go through the shared transport: pooled keep-alive connections and retries
+        self.transport = get_transport()
+        self.session = self.transport.create_session({"User-Agent": "GovernanceTokenAnalyzer/1.0"})
+
+        # IDs of proposals whose voting has closed, per protocol; their votes are cached indefinitely
+        self.closed_proposals: Dict[str, Set[int]] = {}
+
+        # Seed of the sample data generators; unseeded unless SAMPLE_DATA_SEED is set
+        self._sample_seed = np.random.SeedSequence(Config().sample_data_seed)
+        self._sample_seed_lock = threading.Lock()
 
         logger.info("APIClient initialized with available API keys:")
         logger.info(f"  Etherscan: {'✓' if self.etherscan_api_key else '✗'}")
@@ -290,6 +428,116 @@ class APIClient:
         logger.info(f"🔄 Using protocol-specific simulation for {protocol}")
         return self._generate_sample_holder_data(protocol, limit)
 
+    def iter_token_holder_pages(
+        self, protocol: str, limit: int = 1000, page_size: int = 100, use_real_data: bool = True
+    ) -> Iterator[Sequence[Dict[str, Any]]]:
+        """Yield token holders for a protocol one page at a time.
+
+        Unlike get_token_holders, pages are handed to the caller as soon as they are
+        fetched and are not retained, so consumers can aggregate metrics over holder
+        sets that do not fit in memory. When the response cache is disabled, holder
+        entries are decoded from each response body one at a time rather than parsing
+        the body whole.
+
+        Args:
+            protocol: Protocol name (compound, uniswap, aave)
+            limit: Maximum number of token holders to yield in total
+            page_size: Number of holders requested per page
+            use_real_data: Whether to attempt real API calls first
+
+        Yields:
+            Pages of token holder dictionaries; simulated pages are ColumnRecords views
+            that only build a dictionary when one is accessed
+
+        """
+        if protocol not in PROTOCOL_INFO or protocol not in TOKEN_ADDRESSES:
+            raise ValueError(f"Unsupported protocol: {protocol}")
+
+        fetched = 0
+        if use_real_data:
+            token_address = TOKEN_ADDRESSES[protocol]
+            # Without a response cache to fill, holders are decoded straight off the wire
+            streaming = get_http_cache() is None
+            page = 1
+            while fetched < limit:
+                try:
+                    if streaming:
+                        holders = list(
+                            islice(self.iter_etherscan_token_holders(token_address, page, page_size), limit - fetched)
+                        )
+                    else:
+                        holders = self.get_etherscan_token_holders(token_address, page, page_size).get("result") or []
+                except Exception as exception:
+                    logger.warning(f"❌ Paginated holder fetch failed for {protocol} on page {page}: {exception}")
+                    break
+
+                if isinstance(holders, str) or not holders:
+                    break
+
+                holders = holders[: limit - fetched]
+                fetched += len(holders)
+                yield self._normalize_holder_balances(holders)
+
+                if len(holders) < page_size:
+                    break
+                page += 1
+
+            if fetched:
+                return
+            logger.warning(f"⚠️  No paginated real data available for {protocol}, falling back to simulation")
+
+        # Fallback to protocol-specific simulation, generated one page at a time
+        info = PROTOCOL_INFO[protocol]
+        alpha, seed = self._sample_holder_params(protocol)
+        yield from sample_holder_pages(
+            protocol,
+            limit,
+            info["total_supply"],
+            alpha,
+            seed,
+            info.get("whale_addresses", []),
+            page_size=page_size,
+        )
+
+    def get_token_holders_from_logs(
+        self,
+        protocol: str,
+        from_block: int = 0,
+        to_block: Optional[int] = None,
+        rpc_url: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Reconstruct every token holder of a protocol from its on-chain Transfer logs.
+
+        Unlike the provider endpoints, which return a top-100 sample at most, this
+        returns the full holder set with exact balances. It needs a JSON-RPC node and
+        one eth_getLogs request per block range, so it is not part of the provider
+        fallback chain.
+
+        Args:
+            protocol: Protocol name (compound, uniswap, aave)
+            from_block: First block to scan, e.g. the token's deployment block
+            to_block: Last block to scan, defaults to the latest block
+            rpc_url: JSON-RPC endpoint, defaults to the configured Alchemy or Infura URL
+
+        Returns:
+            List of token holder dictionaries, largest balance first
+
+        Raises:
+            ValueError: If the protocol is unsupported or no JSON-RPC endpoint is configured
+            JSONRPCError: If the node rejects a log query
+
+        """
+        if protocol not in PROTOCOL_INFO or protocol not in TOKEN_ADDRESSES:
+            raise ValueError(f"Unsupported protocol: {protocol}")
+
+        rpc_url = rpc_url or Config().get_web3_provider_url()
+        if not rpc_url:
+            raise ValueError("No JSON-RPC endpoint configured; set ALCHEMY_API_KEY or INFURA_PROJECT_ID")
+
+        ingestor = TransferLogIngestor(JSONRPCClient(rpc_url), TOKEN_ADDRESSES[protocol])
+        table = ingestor.build_balance_table(from_block, to_block)
+        return table.to_holder_records(protocol, PROTOCOL_INFO[protocol]["decimals"])
+
     def get_governance_proposals(
         self, protocol: str, limit: int = 10, use_real_data: bool = False
     ) -> List[Dict[str, Any]]:
@@ -348,6 +596,117 @@ class APIClient:
             logger.error(f"Error fetching governance votes for {protocol}: {exception}")
             return []
 
+    def get_votes_for_proposals(
+        self,
+        protocol: str,
+        proposal_ids: List[int],
+        use_real_data: bool = False,
+        max_concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """Get votes for many governance proposals, fetched concurrently.
+
+        This is a blocking wrapper around AsyncAPIClient.get_votes_for_proposals.
+
+        Args:
+            protocol: Protocol name (compound, uniswap, aave)
+            proposal_ids: IDs of the proposals
+            use_real_data: Whether to use real data from APIs (vs. sample data)
+            max_concurrency: Maximum number of requests in flight, or None for the configured default
+            batch_size: Proposals per batched GraphQL request, or None for the configured default
+
+        Returns:
+            Dictionary mapping each proposal ID to its votes, in the order of proposal_ids
+
+        """
+        async_client = AsyncAPIClient(self, max_concurrency=max_concurrency, batch_size=batch_size)
+        return run_sync(async_client.get_votes_for_proposals(protocol, proposal_ids, use_real_data))
+
+    def iter_proposals(
+        self,
+        protocol: str,
+        limit: Optional[int] = None,
+        page_size: int = GRAPH_PAGE_SIZE,
+        use_real_data: bool = True,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield every governance proposal of a protocol, oldest first, fetched page by page.
+
+        Pages are requested with an ``id_gt`` cursor and are not retained, so the full
+        proposal history can be consumed in constant memory.
+
+        Args:
+            protocol: Protocol name (compound, uniswap, aave)
+            limit: Maximum number of proposals to yield, or None for all of them
+            page_size: Number of proposals requested per page
+            use_real_data: Whether to use real data from APIs (vs. sample data)
+
+        Yields:
+            Proposal dictionaries
+
+        Raises:
+            ValueError: If the protocol is not supported
+            DataAccessError: If a page fails after earlier pages were yielded
+
+        """
+        if protocol not in GRAPHQL_ENDPOINTS:
+            raise ValueError(f"Unsupported protocol: {protocol}")
+
+        def normalize(proposal: Dict[str, Any]) -> Dict[str, Any]:
+            record = self._normalize_proposal(proposal)
+            self._record_closed_proposals(protocol, [record])
+            return record
+
+        records = self._iter_graph_records(
+            protocol,
+            "proposals",
+            PROPOSAL_PAGE_QUERIES[protocol],
+            {},
+            page_size,
+            normalize,
+            lambda: self._generate_sample_proposal_data(protocol, limit or 10),
+            use_real_data,
+            cache_endpoint="graph:proposals",
+        )
+        yield from records if limit is None else islice(records, limit)
+
+    def iter_votes(
+        self, protocol: str, proposal_id: int, page_size: int = GRAPH_PAGE_SIZE, use_real_data: bool = True
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield every vote cast on a proposal, fetched page by page.
+
+        Pages are requested with an ``id_gt`` cursor and are not retained, so proposals
+        with more votes than fit in one response are neither truncated nor held in memory.
+
+        Args:
+            protocol: Protocol name (compound, uniswap, aave)
+            proposal_id: ID of the proposal
+            page_size: Number of votes requested per page
+            use_real_data: Whether to use real data from APIs (vs. sample data)
+
+        Yields:
+            Vote dictionaries
+
+        Raises:
+            ValueError: If the protocol is not supported
+            DataAccessError: If a page fails after earlier pages were yielded
+
+        """
+        if protocol not in GRAPHQL_ENDPOINTS:
+            raise ValueError(f"Unsupported protocol: {protocol}")
+
+        yield from self._iter_graph_records(
+            protocol,
+            "votes",
+            VOTE_QUERIES[protocol],
+            {"proposalId": str(proposal_id)},
+            page_size,
+            lambda vote: self._normalize_vote(vote, proposal_id),
+            lambda: self._sample_vote_records(protocol, proposal_id),
+            use_real_data,
+            cache_endpoint="graph:votes",
+            cache_ttl=self._vote_cache_ttl(protocol, proposal_id),
+        )
+
     def get_protocol_data(self, protocol: str, use_real_data: bool = False) -> Dict[str, Any]:
         """Get comprehensive protocol data including token holders, proposals, and governance metrics.
 
@@ -507,10 +866,35 @@ class APIClient:
         Returns:
             List of sample token holder dictionaries
 
+        """
+        return self._sample_holder_records(protocol, count).to_list()
+
+    def _sample_holder_records(self, protocol: str, count: int) -> ColumnRecords:
+        """Generate sample token holders as columns, building dictionaries only when accessed.
+
+        Args:
+            protocol: Protocol name
+            count: Number of holders to generate
+
+        Returns:
+            ColumnRecords of sample token holders, largest first
+
         """
         info = PROTOCOL_INFO[protocol]
-        total_supply = info["total_supply"]
+        alpha, seed = self._sample_holder_params(protocol)
+
+        return sample_holder_records(
+            protocol,
+            count,
+            info["total_supply"],
+            alpha,
+            seed,
+            info.get("whale_addresses", []),
+        )
 
+    @staticmethod
+    def _sample_holder_params(protocol: str) -> Tuple[float, int]:
+        """Return the power-law exponent and address seed of a protocol's sample holders."""
         # Protocol-specific power-law parameters for different distributions
         protocol_params = {
             "compound": {"alpha": 1.8, "seed": 42},  # More whale-dominated
@@ -519,40 +903,7 @@ class APIClient:
         }
 
         params = protocol_params.get(protocol, {"alpha": 1.5, "seed": 789})
-
-        # Set random seed for reproducible but different distributions
-        random.seed(params["seed"])
-
-        # Generate a power-law distribution of token balances with protocol-specific alpha
-        balances = self._generate_power_law_distribution(count, total_supply, params["alpha"])
-
-        # Create sample addresses
-        holders = []
-        for i in range(count):
-            # Use protocol-specific address generation
-            address_offset = params["seed"] + i
-            address = f"0x{address_offset:040x}"
-
-            # For the top holders, use "known" whale addresses if available
-            if i < len(info.get("whale_addresses", [])):
-                address = info["whale_addresses"][i]
-
-            balance = balances[i]
-            percentage = balance / total_supply
-
-            holders.append(
-                {
-                    "protocol": protocol,
-                    "address": address,
-                    "balance": balance,
-                    "percentage": percentage,
-                    "label": f"Whale {i + 1}" if i < 5 else f"Holder {i + 1}",
-                    "is_contract": i % 5 == 0,  # Every 5th holder is a contract
-                    "last_updated": datetime.now().isoformat(),
-                }
-            )
-
-        return holders
+        return params["alpha"], params["seed"]
 
     def _generate_power_law_distribution(self, count: int, total: float, alpha: float = 1.5) -> List[float]:
         """Generate a power-law distribution of values.
@@ -566,14 +917,7 @@ class APIClient:
             List of values following a power-law distribution
 
         """
-        # Generate raw power-law values
-        values = [1.0 / ((i + 1) ** alpha) for i in range(count)]
-
-        # Normalize to the total
-        total_raw = sum(values)
-        normalized = [v * total / total_raw for v in values]
-
-        return normalized
+        return power_law_balances(count, total, alpha).tolist()
 
     def _generate_sample_proposal_data(self, protocol: str, count: int) -> List[Dict[str, Any]]:
         """Generate sample governance proposal data for testing.
@@ -706,54 +1050,32 @@ class APIClient:
             List of sample vote dictionaries
 
         """
-        info = PROTOCOL_INFO[protocol]
-
-        # Generate between 50-200 votes for this proposal
-        vote_count = random.randint(50, 200)
-        votes = []
-
-        # Possible vote choices
-        choices = ["for", "against", "abstain"]
-        weights = [0.7, 0.2, 0.1]  # Most votes are "for" in sample data
-
-        # Generate random addresses or use whale addresses for top votes
-        for i in range(vote_count):
-            # For top voters, use whale addresses
-            if i < len(info.get("whale_addresses", [])):
-                voter = info["whale_addresses"][i]
-            else:
-                voter = f"0x{random.getrandbits(160):040x}"
+        return self._sample_vote_records(protocol, proposal_id).to_list()
 
-            # Determine vote choice weighted by the probabilities
-            vote_choice = random.choices(choices, weights=weights)[0]
+    def _sample_vote_records(self, protocol: str, proposal_id: int) -> ColumnRecords:
+        """Generate between 50 and 200 sample votes as columns, building dictionaries only when accessed.
 
-            # Generate vote power - whales have more voting power
-            if i < 5:  # Top 5 voters
-                vote_power = random.uniform(0.01, 0.1) * info["total_supply"]
-            elif i < 20:  # Next 15 voters
-                vote_power = random.uniform(0.001, 0.01) * info["total_supply"]
-            else:  # Remaining voters
-                vote_power = random.uniform(0.0001, 0.001) * info["total_supply"]
+        Args:
+            protocol: Protocol name
+            proposal_id: Proposal ID
 
-            # Create vote object
-            votes.append(
-                {
-                    "protocol": protocol,
-                    "proposal_id": proposal_id,
-                    "voter": voter,
-                    "vote_choice": vote_choice,
-                    "voting_power": vote_power,
-                    "vote_weight": vote_power / info["total_supply"],
-                    "voted_at": (datetime.now() - timedelta(days=random.randint(1, 14))).isoformat(),
-                    "tx_hash": f"0x{random.getrandbits(256):064x}",
-                }
-            )
+        Returns:
+            ColumnRecords of sample votes; whales vote first and with the most power
 
-        return votes
+        """
+        info = PROTOCOL_INFO[protocol]
+        with self._sample_seed_lock:
+            # Every call draws from its own child generator, so concurrent fallbacks do not share state
+            rng = np.random.default_rng(self._sample_seed.spawn(1)[0])
+        return sample_vote_records(rng, protocol, proposal_id, info["total_supply"], info.get("whale_addresses", []))
 
     @staticmethod
     def _normalize_holder_balances(holders: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Normalize holder balances to consistent string format and sort by balance.
+        """Normalize holder balances to exact decimal strings and sort by balance.
+
+        Balances are parsed once into a fixed-point column, so large wei-denominated
+        amounts keep every digit instead of round-tripping through float. Negative
+        balances, which the column cannot hold, keep their reported float value.
 
         Args:
             holders: List of token holder dictionaries
@@ -761,31 +1083,37 @@ class APIClient:
         Returns:
             List of normalized and sorted token holder dictionaries
         """
+        raw_balances = [holder.get("balance") for holder in holders]
+        column = parse_balances(raw_balances)
+        canonical = column.to_strings()
+
+        negative_rows: List[int] = []
+        if column.rejected:
+            reported, _ = to_float_balances(raw_balances)
+            negative_rows = np.flatnonzero(reported < 0)[np.argsort(-reported[reported < 0], kind="stable")].tolist()
+            for row in negative_rows:
+                canonical[row] = str(float(reported[row]))
+
         normalized_holders = []
-        for holder in holders:
+        for holder, balance in zip(holders, canonical):
             if "balance" in holder:
-                # Convert all balances to float first, then back to string for consistency
-                try:
-                    balance_float = float(holder["balance"]) if holder["balance"] is not None else 0.0
-                    holder_copy = holder.copy()
-                    holder_copy["balance"] = str(balance_float)
-                    normalized_holders.append(holder_copy)
-                except (ValueError, TypeError):
-                    # If balance can't be converted, use 0
-                    holder_copy = holder.copy()
-                    holder_copy["balance"] = "0"
-                    normalized_holders.append(holder_copy)
-            else:
-                normalized_holders.append(holder)
+                # Unparseable balances become "0"
+                holder = {**holder, "balance": balance}
+            normalized_holders.append(holder)
 
-        # Sort by balance in descending order to ensure consistent ordering
-        normalized_holders.sort(key=lambda h: float(h.get("balance", 0)), reverse=True)
-        return normalized_holders
+        # Sort by exact balance in descending order to ensure consistent ordering
+        negative = set(negative_rows)
+        order = [index for index in column.argsort(descending=True).tolist() if index not in negative]
+        return [normalized_holders[index] for index in order + negative_rows]
 
     def _fetch_token_holders_with_fallback(self, protocol: str, token_address: str, limit: int) -> List[Dict[str, Any]]:
         """Fetch token holders with multiple API fallbacks for better reliability.
         Prioritizes Alchemy (most generous free tier) -> The Graph -> Moralis -> Etherscan.
 
+        Providers are hedged rather than tried strictly in turn: the next provider starts
+        as soon as the current one fails or is slower than its usual latency, and the
+        first non-empty result wins.
+
         Args:
             protocol: Protocol name
             token_address: Token contract address
@@ -797,39 +1125,20 @@ class APIClient:
         """
         logger.info(f"Fetching token holders for {protocol} with fallback strategy")
 
-        # Try each API in order of priority, with fallbacks
+        # APIs in order of priority; slower ones are hedged with the next
         api_methods = [
-            (
-                "Alchemy",
-                lambda addr, lim: self._fetch_token_holders_alchemy(addr, lim),
-            ),
-            (
-                "Graph",
-                lambda addr, lim: self._fetch_token_holders_graph(addr, lim),
-            ),
-            (
-                "Moralis",
-                lambda addr, lim: self._fetch_token_holders_moralis(addr, lim),
-            ),
-            (
-                "Etherscan",
-                lambda addr, lim: self.get_etherscan_token_holders(addr, 1, lim)["result"],
-            ),
+            ("Alchemy", lambda: self._fetch_token_holders_alchemy(token_address, limit)),
+            ("Graph", lambda: self._fetch_token_holders_graph(token_address, limit)),
+            ("Moralis", lambda: self._fetch_token_holders_moralis(token_address, limit)),
+            ("Etherscan", lambda: self.get_etherscan_token_holders(token_address, 1, limit)["result"]),
         ]
 
-        for api_name, api_method in api_methods:
-            try:
-                logger.info(f"Trying {api_name} API for token holders")
-                holders = api_method(token_address, limit)
-
-                if holders and len(holders) > 0:
-                    logger.info(f"✅ Successfully fetched {len(holders)} holders from {api_name}")
-                    return self._normalize_holder_balances(holders)
-                else:
-                    logger.warning(f"⚠️  {api_name} returned no holders")
-
-            except Exception as exception:
-                logger.warning(f"❌ {api_name} API failed: {exception}")
+        try:
+            api_name, holders = hedged_call(api_methods, is_valid=lambda holders: bool(holders))
+            logger.info(f"✅ Successfully fetched {len(holders)} holders from {api_name}")
+            return self._normalize_holder_balances(holders)
+        except AllProvidersFailedError as exception:
+            logger.warning(f"❌ {exception}")
 
         # Final fallback to simulation
         logger.info("🔄 All APIs failed, using protocol-specific simulation")
@@ -842,6 +1151,105 @@ class APIClient:
 
         return holders
 
+    def _iter_graph_records(
+        self,
+        protocol: str,
+        entity: str,
+        query: str,
+        variables: Dict[str, Any],
+        page_size: int,
+        normalize: Callable[[Dict[str, Any]], Dict[str, Any]],
+        fallback: Callable[[], Sequence[Dict[str, Any]]],
+        use_real_data: bool,
+        cache_endpoint: str = "graph",
+        cache_ttl: Optional[float] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield normalized records of a cursor-paged Graph query, or sample data if none can be fetched.
+
+        A failure before the first record falls back to sample data, like the list APIs.
+        A failure after records were yielded raises instead, so a partial result is never
+        mistaken for a complete one. When the response cache is disabled, each page is
+        decoded incrementally and never held in memory as a whole.
+
+        Args:
+            protocol: Protocol name
+            entity: Top-level field of the query's response, e.g. 'votes'
+            query: GraphQL query taking $first and $lastId
+            variables: Further query variables
+            page_size: Number of records requested per page
+            normalize: Converts a raw record into the client's format
+            fallback: Produces sample records
+            use_real_data: Whether to use real data from APIs (vs. sample data)
+            cache_endpoint: Endpoint name that selects the cache TTL
+            cache_ttl: Seconds to cache each page, overriding the endpoint TTL
+
+        Yields:
+            Normalized record dictionaries
+
+        """
+        fetched = 0
+        graph_client = self.graph_clients.get(protocol)
+        if use_real_data and graph_client is not None:
+            logger.info(f"Streaming {protocol} {entity} from The Graph in pages of {page_size}")
+            if get_http_cache() is None:
+                records = graph_client.iter_records(query, entity, variables, page_size)
+            else:
+                pages = graph_client.iter_pages(query, entity, variables, page_size, cache_endpoint, cache_ttl)
+                records = (record for page in pages for record in page)
+            try:
+                for record in records:
+                    record = normalize(record)
+                    fetched += 1
+                    yield record
+            except Exception as exception:
+                if fetched:
+                    raise DataAccessError(
+                        f"Fetching {protocol} {entity} failed after {fetched} records: {exception}"
+                    ) from exception
+                logger.error(f"Error fetching {protocol} {entity}: {exception}")
+
+            if fetched:
+                logger.info(f"Successfully streamed {fetched} {entity} from The Graph")
+                return
+            logger.warning(f"No {entity} found for {protocol}, using sample data")
+
+        yield from fallback()
+
+    @staticmethod
+    def _normalize_proposal(proposal: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a Graph proposal record into the client's proposal format."""
+        return {
+            "id": int(proposal.get("id", 0)),
+            "title": proposal.get("title", ""),
+            "description": proposal.get("description", ""),
+            "proposer": proposal.get("proposer", ""),
+            "startBlock": int(proposal.get("startBlock", 0)),
+            "endBlock": int(proposal.get("endBlock", 0)),
+            "forVotes": proposal.get("forVotes", "0"),
+            "againstVotes": proposal.get("againstVotes", "0"),
+            "abstainVotes": proposal.get("abstainVotes", "0"),
+            "canceled": proposal.get("canceled", False),
+            "queued": proposal.get("queued", False),
+            "executed": proposal.get("executed", False),
+            "createdAt": proposal.get("createdAt", ""),
+            "eta": proposal.get("eta", ""),
+        }
+
+    @staticmethod
+    def _normalize_vote(vote: Dict[str, Any], proposal_id: int) -> Dict[str, Any]:
+        """Convert a Graph vote record into the client's vote format."""
+        return {
+            "id": vote.get("id", ""),
+            "voter": vote.get("voter", ""),
+            "support": vote.get("support", False),
+            "voting_power": float(vote.get("votingPower", "0")),
+            "reason": vote.get("reason", ""),
+            "block_number": int(vote.get("blockNumber", 0)),
+            "block_timestamp": vote.get("blockTimestamp", ""),
+            "transaction_hash": vote.get("transactionHash", ""),
+            "proposal_id": proposal_id,
+        }
+
     def _fetch_governance_proposals(self, protocol: str, limit: int) -> List[Dict[str, Any]]:
         """Fetch real governance proposals data from The Graph API.
 
@@ -868,7 +1276,7 @@ class APIClient:
             logger.info(f"Fetching {protocol} governance proposals from The Graph")
 
             variables = {"first": limit, "skip": 0}
-            response = graph_client.execute_query(query, variables)
+            response = graph_client.execute_query(query, variables, cache_endpoint="graph:proposals")
 
             if "errors" in response:
                 logger.error(f"GraphQL errors for {protocol}: {response['errors']}")
@@ -876,29 +1284,11 @@ class APIClient:
 
             proposals_data = response.get("data", {}).get("proposals", [])
 
-            proposals = []
-            for proposal in proposals_data:
-                proposals.append(
-                    {
-                        "id": int(proposal.get("id", 0)),
-                        "title": proposal.get("title", ""),
-                        "description": proposal.get("description", ""),
-                        "proposer": proposal.get("proposer", ""),
-                        "startBlock": int(proposal.get("startBlock", 0)),
-                        "endBlock": int(proposal.get("endBlock", 0)),
-                        "forVotes": proposal.get("forVotes", "0"),
-                        "againstVotes": proposal.get("againstVotes", "0"),
-                        "abstainVotes": proposal.get("abstainVotes", "0"),
-                        "canceled": proposal.get("canceled", False),
-                        "queued": proposal.get("queued", False),
-                        "executed": proposal.get("executed", False),
-                        "createdAt": proposal.get("createdAt", ""),
-                        "eta": proposal.get("eta", ""),
-                    }
-                )
+            proposals = [self._normalize_proposal(proposal) for proposal in proposals_data]
 
             if proposals:
                 logger.info(f"Successfully fetched {len(proposals)} proposals from The Graph")
+                self._record_closed_proposals(protocol, proposals)
                 return proposals
             else:
                 logger.warning(f"No proposals found for {protocol}, using sample data")
@@ -910,7 +1300,7 @@ class APIClient:
             return self._generate_sample_proposal_data(protocol, limit)
 
     def _fetch_governance_votes(self, protocol: str, proposal_id: int) -> List[Dict[str, Any]]:
-        """Fetch real governance votes data from The Graph API.
+        """Fetch all governance votes of a proposal from The Graph API.
 
         Args:
             protocol: Protocol name
@@ -921,58 +1311,51 @@ class APIClient:
 
         """
         try:
-            if protocol not in self.graph_clients:
-                logger.warning(f"No Graph client available for {protocol}, using sample data")
-                return self._generate_sample_vote_data(protocol, proposal_id)
+            return list(self.iter_votes(protocol, proposal_id))
 
-            graph_client = self.graph_clients[protocol]
-            query = VOTE_QUERIES.get(protocol)
+        except Exception as exception:
+            logger.error(f"Error fetching governance votes for {protocol}: {exception}")
+            logger.info(f"Falling back to sample data for {protocol}")
+            return self._generate_sample_vote_data(protocol, proposal_id)
 
-            if not query:
-                logger.warning(f"No vote query defined for {protocol}, using sample data")
-                return self._generate_sample_vote_data(protocol, proposal_id)
+    def _record_closed_proposals(self, protocol: str, proposals: List[Dict[str, Any]]) -> None:
+        """Remember proposals that were canceled, queued or executed, since their votes can no longer change."""
+        closed = self.closed_proposals.setdefault(protocol, set())
+        for proposal in proposals:
+            if proposal.get("canceled") or proposal.get("queued") or proposal.get("executed"):
+                closed.add(proposal["id"])
 
-            logger.info(f"Fetching votes for proposal {proposal_id} from The Graph")
+    def _vote_cache_ttl(self, protocol: str, proposal_id: int) -> Optional[float]:
+        """Cache TTL for a proposal's votes: indefinite once voting has closed, else the endpoint default."""
+        if proposal_id in self.closed_proposals.get(protocol, ()):
+            return NEVER_EXPIRES
+        return None
 
-            variables = {"proposalId": str(proposal_id)}
-            response = graph_client.execute_query(query, variables)
+    def _parse_governance_votes(
+        self, protocol: str, proposal_id: int, votes_data: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Normalize raw Graph vote records, falling back to sample data if there are none.
 
-            if "errors" in response:
-                logger.error(f"GraphQL errors for {protocol} votes: {response['errors']}")
-                return self._generate_sample_vote_data(protocol, proposal_id)
+        Args:
+            protocol: Protocol name
+            proposal_id: Proposal ID
+            votes_data: Vote records from every page of the vote query
 
-            votes_data = response.get("data", {}).get("votes", [])
-
-            votes = []
-            for vote in votes_data:
-                votes.append(
-                    {
-                        "id": vote.get("id", ""),
-                        "voter": vote.get("voter", ""),
-                        "support": vote.get("support", False),
-                        "voting_power": float(vote.get("votingPower", "0")),
-                        "reason": vote.get("reason", ""),
-                        "block_number": int(vote.get("blockNumber", 0)),
-                        "block_timestamp": vote.get("blockTimestamp", ""),
-                        "transaction_hash": vote.get("transactionHash", ""),
-                        "proposal_id": proposal_id,
-                    }
-                )
+        Returns:
+            List of vote dictionaries
 
-            if votes:
-                logger.info(f"Successfully fetched {len(votes)} votes from The Graph")
-                return votes
-            else:
-                logger.warning(f"No votes found for proposal {proposal_id}, using sample data")
-                return self._generate_sample_vote_data(protocol, proposal_id)
+        """
+        votes = [self._normalize_vote(vote, proposal_id) for vote in votes_data]
 
-        except Exception as exception:
-            logger.error(f"Error fetching governance votes for {protocol}: {exception}")
-            logger.info(f"Falling back to sample data for {protocol}")
+        if votes:
+            logger.info(f"Successfully fetched {len(votes)} votes from The Graph")
+            return votes
+        else:
+            logger.warning(f"No votes found for proposal {proposal_id}, using sample data")
             return self._generate_sample_vote_data(protocol, proposal_id)
 
     def _make_request(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Make a request to the Etherscan API.
+        """Make a request to the Etherscan API, serving it from the response cache when possible.
 
         Args:
             params (Dict[str, Any]): Parameters for the API request.
@@ -982,15 +1365,36 @@ class APIClient:
 
         Raises:
             requests.exceptions.RequestException: If the request fails.
+            OfflineCacheMissError: If offline and the response is not cached.
+            CircuitOpenError: If Etherscan is being skipped after repeated failures.
 
         """
+        # Look up the response cache; the API key is not part of the cache key
+        cache = get_http_cache()
+        if cache is not None:
+            key = cache.make_key("GET", ETHERSCAN_API_URL, params={k: v for k, v in params.items() if k != "apikey"})
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
         # Add API key to parameters
         params["apikey"] = self.etherscan_api_key
 
-        try:
-            # Make the request
-            response = requests.get(ETHERSCAN_API_URL, params=params)
+        def fetch() -> requests.Response:
+            # Make the request once the shared Etherscan quota allows it
+            response = self.transport.request(
+                self.session,
+                "etherscan",
+                "GET",
+                ETHERSCAN_API_URL,
+                throttle=self.rate_limiters["etherscan"].acquire,
+                params=params,
+            )
             response.raise_for_status()  # Raise exception for 4XX/5XX responses
+            return response
+
+        try:
+            response = self.circuit_breakers["etherscan"].call(fetch)
 
             # Parse response
             data = response.json()
@@ -1001,6 +1405,8 @@ class APIClient:
                 logger.error(f"API error: {error_message}")
                 return {"error": error_message}
 
+            if cache is not None:
+                cache.put(key, f"etherscan:{params.get('module')}.{params.get('action')}", data)
             return data
 
         except requests.exceptions.RequestException as exception:
@@ -1066,6 +1472,53 @@ class APIClient:
         simulated_data = self._generate_simulated_holders(token_address, page, offset)
         return simulated_data
 
+    def iter_etherscan_token_holders(
+        self, token_address: str, page: int = 1, offset: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield one page of Etherscan token holders as each entry is decoded.
+
+        The response body is read incrementally instead of being parsed as a whole,
+        and the response cache is bypassed. Unlike get_etherscan_token_holders there
+        is no simulated fallback: failures are raised to the caller.
+
+        Args:
+            token_address (str): The Ethereum address of the token.
+            page (int, optional): Page number for pagination. Defaults to 1.
+            offset (int, optional): Number of results per page. Defaults to 100.
+
+        Yields:
+            Dict[str, Any]: Raw token holder entries.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+            CircuitOpenError: If Etherscan is being skipped after repeated failures.
+            DataAccessError: If Etherscan reports an error instead of a holder list.
+
+        """
+        params = {
+            "module": "token",
+            "action": "tokenholderlist",
+            "contractaddress": token_address,
+            "page": page,
+            "offset": offset,
+            "apikey": self.etherscan_api_key,
+        }
+
+        def fetch() -> requests.Response:
+            response = self.transport.request(
+                self.session,
+                "etherscan",
+                "GET",
+                ETHERSCAN_API_URL,
+                throttle=self.rate_limiters["etherscan"].acquire,
+                params=params,
+                stream=True,
+            )
+            response.raise_for_status()
+            return response
+
+        yield from iter_response_array(self.circuit_breakers["etherscan"].call(fetch), ("result",))
+
     def _generate_simulated_holders(self, token_address: str, page: int, offset: int) -> Dict[str, Any]:
         """Generate simulated token holder data for testing purposes.
 
@@ -1335,10 +1788,28 @@ class APIClient:
                 "order": "DESC",
             }
 
-            response = requests.get(url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
+            cache = get_http_cache()
+            key = cache.make_key("GET", url, params=params) if cache is not None else None
+            data = cache.get(key) if cache is not None else None
+
+            if data is None:
+
+                def fetch() -> requests.Response:
+                    response = self.transport.request(
+                        self.session,
+                        "moralis",
+                        "GET",
+                        url,
+                        throttle=self.rate_limiters["moralis"].acquire,
+                        headers=headers,
+                        params=params,
+                    )
+                    response.raise_for_status()
+                    return response
 
-            data = response.json()
+                data = self.circuit_breakers["moralis"].call(fetch).json()
+                if cache is not None and data.get("result"):
+                    cache.put(key, "moralis", data)
 
             if "result" in data and data["result"]:
                 holders = []
@@ -1386,57 +1857,501 @@ class TheGraphAPI:
 
         """
         self.subgraph_url = subgraph_url
-        self.session = requests.Session()
-
-        # Set up request headers
-        self.session.headers.update({"Content-Type": "application/json", "User-Agent": "gova/1.0.0"})
-
-    def execute_query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        self.transport = get_transport()
+        self.session = self.transport.create_session({"Content-Type": "application/json", "User-Agent": "gova/1.0.0"})
+        self.rate_limiter = get_rate_limiter("graph")
+        self.circuit_breaker = get_circuit_breaker("graph")
+
+    def execute_query(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        cache_endpoint: str = "graph",
+        cache_ttl: Optional[float] = None,
+    ) -> Dict[str, Any]:
         """Execute a GraphQL query against the subgraph.
 
+        Successful responses are kept in the shared HTTP response cache, so repeating a
+        query within its TTL does not touch the network.
+
         Args:
             query (str): GraphQL query.
             variables (Dict[str, Any], optional): Variables for the query.
+            cache_endpoint (str): Endpoint name that selects the cache TTL, e.g. 'graph:votes'.
+            cache_ttl (float, optional): Seconds to cache the response, overriding the endpoint TTL.
 
         Returns:
             Dict[str, Any]: Query results.
 
         Raises:
             requests.exceptions.RequestException: If the request fails.
+            OfflineCacheMissError: If offline and the response is not cached.
+            CircuitOpenError: If The Graph is being skipped after repeated failures.
 
         """
+        payload = self._build_payload(query, variables)
+        cache, key, cached = self._lookup_cached(payload)
+        if cached is not None:
+            return cached
+
+        result = self.circuit_breaker.call(self._execute_query, payload)
+        self._store_cached(cache, key, result, cache_endpoint, cache_ttl)
+        return result
+
+    @staticmethod
+    def _build_payload(query: str, variables: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the JSON body of a GraphQL request."""
         payload = {"query": query}
         if variables:
             payload["variables"] = variables
+        return payload
 
-        try:
-            # Add retry logic for reliability
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    response = self.session.post(self.subgraph_url, json=payload, timeout=30)
-                    response.raise_for_status()
+    def _lookup_cached(self, payload: Dict[str, Any]) -> Tuple[Optional[HTTPResponseCache], Optional[str], Any]:
+        """Look up a GraphQL request in the shared response cache.
 
-                    result = response.json()
+        Returns:
+            Tuple of the cache (None if disabled), the request's cache key and the cached response or None
 
-                    # Check for GraphQL errors
-                    if "errors" in result:
-                        logger.warning(f"GraphQL errors in response: {result['errors']}")
+        """
+        cache = get_http_cache()
+        if cache is None:
+            return None, None, None
+        key = cache.make_key("POST", self.subgraph_url, body=payload)
+        return cache, key, cache.get(key)
 
-                    return result
+    @staticmethod
+    def _store_cached(
+        cache: Optional[HTTPResponseCache],
+        key: Optional[str],
+        result: Dict[str, Any],
+        endpoint: str,
+        ttl: Optional[float],
+    ) -> None:
+        """Cache a GraphQL response unless it reports errors."""
+        if cache is not None and "errors" not in result:
+            cache.put(key, endpoint, result, ttl)
+
+    def _execute_query(self, payload: Dict[str, Any], prepaid: bool = False) -> Dict[str, Any]:
+        """Execute a GraphQL query with retries, taking a rate limit token per attempt.
 
-                except (
-                    requests.exceptions.Timeout,
-                    requests.exceptions.ConnectionError,
-                ) as exception:
-                    if attempt < max_retries - 1:
-                        wait_time = 2**attempt  # Exponential backoff
-                        logger.warning(f"Request failed (attempt {attempt + 1}), retrying in {wait_time}s: {exception}")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        raise
+        Args:
+            payload (Dict[str, Any]): GraphQL request body.
+            prepaid (bool): Whether the caller already took the token for the first attempt.
+
+        Returns:
+            Dict[str, Any]: Query results.
+
+        """
+        result = self._post(payload, prepaid=prepaid).json()
+
+        # Check for GraphQL errors
+        if "errors" in result:
+            logger.warning(f"GraphQL errors in response: {result['errors']}")
+
+        return result
+
+    def _post(self, payload: Dict[str, Any], prepaid: bool = False, stream: bool = False) -> requests.Response:
+        """POST a GraphQL request through the shared transport, taking a rate limit token per attempt.
+
+        Args:
+            payload (Dict[str, Any]): GraphQL request body.
+            prepaid (bool): Whether the caller already took the token for the first attempt.
+            stream (bool): Whether to leave the body unread so it can be decoded incrementally.
+
+        Returns:
+            requests.Response: Successful response.
+
+        """
+        try:
+            response = self.transport.request(
+                self.session,
+                "graph",
+                "POST",
+                self.subgraph_url,
+                throttle=self.rate_limiter.acquire,
+                prepaid=prepaid,
+                json=payload,
+                stream=stream,
+            )
+            response.raise_for_status()
+            return response
 
         except requests.exceptions.RequestException as exception:
-            logger.error(f"GraphQL query failed after {max_retries} attempts: {str(exception)}")
+            logger.error(f"GraphQL query failed: {str(exception)}")
             raise
+
+    def iter_pages(
+        self,
+        query: str,
+        entity: str,
+        variables: Optional[Dict[str, Any]] = None,
+        page_size: int = GRAPH_PAGE_SIZE,
+        cache_endpoint: str = "graph",
+        cache_ttl: Optional[float] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield the pages of a query that is cursor-paged by entity id.
+
+        The query must take ``$first`` and ``$lastId`` variables, filter on
+        ``id_gt: $lastId`` and order by id ascending.
+
+        Args:
+            query (str): GraphQL query.
+            entity (str): Top-level field of the response holding the records, e.g. 'votes'.
+            variables (Dict[str, Any], optional): Further variables for the query.
+            page_size (int): Number of records requested per page.
+            cache_endpoint (str): Endpoint name that selects the cache TTL.
+            cache_ttl (float, optional): Seconds to cache each page, overriding the endpoint TTL.
+
+        Yields:
+            List[Dict[str, Any]]: Raw records of one page.
+
+        Raises:
+            DataAccessError: If the response reports GraphQL errors.
+
+        """
+        last_id = ""
+        while True:
+            page_variables = {**(variables or {}), "first": page_size, "lastId": last_id}
+            response = self.execute_query(query, page_variables, cache_endpoint=cache_endpoint, cache_ttl=cache_ttl)
+            page = self.page_records(response, entity)
+            if page:
+                yield page
+            if len(page) < page_size:
+                return
+            last_id = page[-1]["id"]
+
+    def iter_records(
+        self,
+        query: str,
+        entity: str,
+        variables: Optional[Dict[str, Any]] = None,
+        page_size: int = GRAPH_PAGE_SIZE,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield the records of a query that is cursor-paged by entity id, one at a time.
+
+        Unlike iter_pages, no page is held in memory: each response body is decoded as
+        it arrives and its records are handed out as soon as they are complete. The
+        response cache is bypassed, since there is no whole response to store.
+
+        Args:
+            query (str): GraphQL query taking ``$first`` and ``$lastId``, as for iter_pages.
+            entity (str): Top-level field of the response holding the records, e.g. 'votes'.
+            variables (Dict[str, Any], optional): Further variables for the query.
+            page_size (int): Number of records requested per page.
+
+        Yields:
+            Dict[str, Any]: Raw records.
+
+        Raises:
+            requests.exceptions.RequestException: If a request fails.
+            CircuitOpenError: If The Graph is being skipped after repeated failures.
+            DataAccessError: If a response reports GraphQL errors or is malformed.
+
+        """
+        last_id = ""
+        while True:
+            payload = self._build_payload(query, {**(variables or {}), "first": page_size, "lastId": last_id})
+            response = self.circuit_breaker.call(self._post, payload, stream=True)
+            count = 0
+            for record in iter_response_array(response, ("data", entity), error_key="errors"):
+                count += 1
+                last_id = record["id"]
+                yield record
+            if count < page_size:
+                return
+
+    @staticmethod
+    def page_records(response: Dict[str, Any], entity: str) -> List[Dict[str, Any]]:
+        """Extract the records of one page from a GraphQL response.
+
+        Args:
+            response (Dict[str, Any]): GraphQL response.
+            entity (str): Top-level field holding the records.
+
+        Returns:
+            List[Dict[str, Any]]: Records of the page, possibly empty.
+
+        Raises:
+            DataAccessError: If the response reports GraphQL errors.
+
+        """
+        if "errors" in response:
+            raise DataAccessError(f"GraphQL errors for {entity}: {response['errors']}")
+        return (response.get("data") or {}).get(entity) or []
+
+    async def execute_query_async(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        executor: Optional[Executor] = None,
+        cache_endpoint: str = "graph",
+        cache_ttl: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Execute a GraphQL query without blocking the event loop.
+
+        Cached responses are returned without taking a rate limit token. Otherwise the
+        first token is awaited on the event loop; the blocking request, including its
+        retries, then runs on a worker thread, so many queries can be in flight at once
+        while sharing this client's session.
+
+        Args:
+            query (str): GraphQL query.
+            variables (Dict[str, Any], optional): Variables for the query.
+            executor (Executor, optional): Thread pool to run the request on.
+                If None, the event loop's default executor is used.
+            cache_endpoint (str): Endpoint name that selects the cache TTL, e.g. 'graph:votes'.
+            cache_ttl (float, optional): Seconds to cache the response, overriding the endpoint TTL.
+
+        Returns:
+            Dict[str, Any]: Query results.
+
+        Raises:
+            requests.exceptions.RequestException: If the request fails.
+            OfflineCacheMissError: If offline and the response is not cached.
+            CircuitOpenError: If The Graph is being skipped after repeated failures.
+
+        """
+        payload = self._build_payload(query, variables)
+        cache, key, cached = self._lookup_cached(payload)
+        if cached is not None:
+            return cached
+
+        # Do not spend a rate limit token on a provider that is being skipped
+        if self.circuit_breaker.is_open():
+            raise CircuitOpenError(f"Circuit for {self.circuit_breaker.name} is open; skipping the request")
+
+        await self.rate_limiter.acquire_async()
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            executor, functools.partial(self.circuit_breaker.call, self._execute_query, payload, prepaid=True)
+        )
+        self._store_cached(cache, key, result, cache_endpoint, cache_ttl)
+        return result
+
+
+def run_sync(coroutine: Awaitable[T]) -> T:
+    """Run a coroutine to completion from synchronous code.
+
+    If the caller is already inside a running event loop (for example a notebook),
+    the coroutine runs on a fresh loop in a helper thread instead.
+
+    Args:
+        coroutine: Coroutine to run
+
+    Returns:
+        The coroutine's result
+
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coroutine)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
+
+
+class AsyncAPIClient:
+    """Asynchronous front end for APIClient that fetches many proposals concurrently.
+
+    Requests are issued through the wrapped APIClient's Graph clients on a bounded
+    thread pool, and an asyncio semaphore caps how many are in flight at once.
+    Votes of several proposals are packed into one aliased GraphQL request.
+    Parsing and the sample-data fallbacks are shared with the synchronous client.
+    """
+
+    def __init__(
+        self,
+        api_client: Optional[APIClient] = None,
+        max_concurrency: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ):
+        """Initialize the asynchronous client.
+
+        Args:
+            api_client: Client whose Graph clients and fallbacks are used. If None, a new one is created.
+            max_concurrency: Maximum number of requests in flight. If None, the configured
+                ``max_concurrent_requests`` is used.
+            batch_size: Proposals per batched vote request; 1 sends one request per proposal.
+                If None, the configured ``graph_batch_size`` is used.
+
+        Raises:
+            ValueError: If max_concurrency or batch_size is smaller than 1
+
+        """
+        config = Config()
+        if max_concurrency is None:
+            max_concurrency = config.max_concurrent_requests
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1, got: {max_concurrency}")
+        if batch_size is None:
+            batch_size = config.graph_batch_size
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got: {batch_size}")
+
+        self.api_client = api_client if api_client is not None else APIClient()
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+
+    async def get_governance_votes(
+        self,
+        protocol: str,
+        proposal_id: int,
+        use_real_data: bool = False,
+        executor: Optional[Executor] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get votes for a single governance proposal without blocking the event loop.
+
+        Args:
+            protocol: Protocol name (compound, uniswap, aave)
+            proposal_id: ID of the proposal
+            use_real_data: Whether to use real data from APIs (vs. sample data)
+            executor: Thread pool for the blocking request, or None for the loop default
+
+        Returns:
+            List of vote dictionaries
+
+        """
+        client = self.api_client
+        graph_client = client.graph_clients.get(protocol)
+        query = VOTE_QUERIES.get(protocol)
+
+        if not use_real_data or graph_client is None or query is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                executor, functools.partial(client.get_governance_votes, protocol, proposal_id, use_real_data)
+            )
+
+        try:
+            logger.info(f"Fetching votes for proposal {proposal_id} from The Graph")
+            votes_data = []
+            last_id = ""
+            while True:
+                variables = {"proposalId": str(proposal_id), "first": GRAPH_PAGE_SIZE, "lastId": last_id}
+                response = await graph_client.execute_query_async(
+                    query,
+                    variables,
+                    executor,
+                    cache_endpoint="graph:votes",
+                    cache_ttl=client._vote_cache_ttl(protocol, proposal_id),
+                )
+                page = TheGraphAPI.page_records(response, "votes")
+                votes_data.extend(page)
+                if len(page) < GRAPH_PAGE_SIZE:
+                    break
+                last_id = page[-1]["id"]
+            return client._parse_governance_votes(protocol, proposal_id, votes_data)
+        except Exception as exception:
+            logger.error(f"Error fetching governance votes for {protocol}: {exception}")
+            logger.info(f"Falling back to sample data for {protocol}")
+            return client._generate_sample_vote_data(protocol, proposal_id)
+
+    async def get_votes_batch(
+        self, protocol: str, proposal_ids: List[int], executor: Optional[Executor] = None
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """Get the votes of several proposals from The Graph with one aliased query per page round.
+
+        Each round requests the next page of every proposal that still has votes left,
+        and the response is split back into per-proposal vote lists by alias. If the
+        subgraph rejects the batched query, the proposals are fetched one by one.
+
+        Args:
+            protocol: Protocol name (compound, uniswap, aave)
+            proposal_ids: IDs of the proposals in the batch
+            executor: Thread pool for the blocking requests, or None for the loop default
+
+        Returns:
+            Dictionary mapping each proposal ID to its votes, in the order of proposal_ids
+
+        """
+        client = self.api_client
+        graph_client = client.graph_clients[protocol]
+        votes_data: Dict[int, List[Dict[str, Any]]] = {proposal_id: [] for proposal_id in proposal_ids}
+        cursors = dict.fromkeys(proposal_ids, "")
+
+        try:
+            logger.info(f"Fetching votes for {len(proposal_ids)} proposals from The Graph in one batch")
+            while cursors:
+                pending = list(cursors)
+                variables: Dict[str, Any] = {"first": GRAPH_PAGE_SIZE}
+                for i, proposal_id in enumerate(pending):
+                    variables[f"proposal{i}"] = str(proposal_id)
+                    variables[f"lastId{i}"] = cursors[proposal_id]
+
+                closed = all(client._vote_cache_ttl(protocol, proposal_id) is not None for proposal_id in pending)
+                response = await graph_client.execute_query_async(
+                    build_vote_batch_query(len(pending)),
+                    variables,
+                    executor,
+                    cache_endpoint="graph:votes",
+                    cache_ttl=NEVER_EXPIRES if closed else None,
+                )
+
+                for i, proposal_id in enumerate(pending):
+                    page = TheGraphAPI.page_records(response, f"p{i}")
+                    votes_data[proposal_id].extend(page)
+                    if len(page) < GRAPH_PAGE_SIZE:
+                        del cursors[proposal_id]
+                    else:
+                        cursors[proposal_id] = page[-1]["id"]
+        except Exception as exception:
+            logger.warning(f"Batched vote query failed for {protocol}, fetching proposals one by one: {exception}")
+            results = await asyncio.gather(
+                *(self.get_governance_votes(protocol, proposal_id, True, executor) for proposal_id in proposal_ids)
+            )
+            return dict(zip(proposal_ids, results))
+
+        return {
+            proposal_id: client._parse_governance_votes(protocol, proposal_id, votes)
+            for proposal_id, votes in votes_data.items()
+        }
+
+    async def get_votes_for_proposals(
+        self, protocol: str, proposal_ids: List[int], use_real_data: bool = False
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """Get votes for many proposals concurrently.
+
+        With real data and a batch size above one, proposals are packed into batched
+        GraphQL requests, which cuts the request count by about the batch size.
+
+        Args:
+            protocol: Protocol name (compound, uniswap, aave)
+            proposal_ids: IDs of the proposals
+            use_real_data: Whether to use real data from APIs (vs. sample data)
+
+        Returns:
+            Dictionary mapping each proposal ID to its votes, in the order of proposal_ids
+
+        Raises:
+            ValueError: If the protocol is not supported
+
+        """
+        if protocol not in GRAPHQL_ENDPOINTS:
+            raise ValueError(f"Unsupported protocol: {protocol}")
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        batched = use_real_data and self.batch_size > 1 and protocol in self.api_client.graph_clients
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            if batched:
+
+                async def fetch_batch(batch: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+                    async with semaphore:
+                        return await self.get_votes_batch(protocol, batch, executor)
+
+                batches = [
+                    proposal_ids[start : start + self.batch_size]
+                    for start in range(0, len(proposal_ids), self.batch_size)
+                ]
+                merged: Dict[int, List[Dict[str, Any]]] = {}
+                for batch_votes in await asyncio.gather(*(fetch_batch(batch) for batch in batches)):
+                    merged.update(batch_votes)
+                return {proposal_id: merged[proposal_id] for proposal_id in proposal_ids}
+
+            async def fetch(proposal_id: int) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    return await self.get_governance_votes(protocol, proposal_id, use_real_data, executor)
+
+            results = await asyncio.gather(*(fetch(proposal_id) for proposal_id in proposal_ids))
+
+        return dict(zip(proposal_ids, results))
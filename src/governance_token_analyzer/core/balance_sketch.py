@@ -0,0 +1,304 @@
+"""Mergeable Balance Sketch for Approximate Concentration Metrics.
+
+This module provides a fixed-size, mergeable weight sketch that answers the
+rank-based concentration questions ("share held by the top p% of holders",
+"holders needed to reach X% of supply") without keeping or sorting the full
+list of balances.
+
+Balances are assigned to logarithmic buckets in the style of DDSketch: bucket
+``k`` covers the interval (gamma^(k-1), gamma^k] with
+gamma = (1 + relative_accuracy) / (1 - relative_accuracy). Each bucket stores
+the exact number of holders and the exact sum of their balances, so the total
+supply and holder count are exact and only the split of a single boundary
+bucket has to be estimated.
+
+Error bounds (while the sketch has not collapsed buckets):
+    * top_sum / bottom_sum and the derived shares have a relative error of at
+      most ``gamma - 1`` (about 2 * relative_accuracy).
+    * holders_for_share (Nakamoto) is within ``(gamma - 1) * N + 1`` holders
+      of the exact count N.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 4096
+
+
+class BalanceSketch:
+    """Log-bucketed sketch of balance counts and sums."""
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, max_buckets: int = DEFAULT_MAX_BUCKETS):
+        """Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Relative width of each bucket (0 < relative_accuracy < 1)
+            max_buckets: Maximum number of buckets kept before the lowest ones are collapsed
+
+        Raises:
+            ValueError: If the parameters are out of range
+
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be between 0 and 1, got: {relative_accuracy}")
+        if max_buckets < 2:
+            raise ValueError(f"max_buckets must be at least 2, got: {max_buckets}")
+
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+
+        self.counts: Dict[int, int] = {}
+        self.sums: Dict[int, float] = {}
+        self.zero_count = 0
+        self.collapsed = False
+
+    @classmethod
+    def from_balances(
+        cls, balances: Union["BalanceSketch", Sequence[float], np.ndarray], **kwargs: Any
+    ) -> "BalanceSketch":
+        """Return a sketch for the given balances, reusing it if one was passed in.
+
+        Args:
+            balances: Array-like of token balances or an existing BalanceSketch
+            **kwargs: Parameters forwarded to the constructor for new sketches
+
+        Returns:
+            BalanceSketch instance
+
+        """
+        if isinstance(balances, cls):
+            return balances
+        return cls(**kwargs).update(balances)
+
+    @property
+    def count(self) -> int:
+        """Number of non-negative balances added to the sketch."""
+        return self.zero_count + sum(self.counts.values())
+
+    @property
+    def total(self) -> float:
+        """Exact sum of all balances added to the sketch."""
+        return float(sum(self.sums.values()))
+
+    @property
+    def relative_error(self) -> float:
+        """Upper bound on the relative error of top/bottom share estimates."""
+        return self.gamma - 1
+
+    def __len__(self) -> int:
+        """Return the number of occupied buckets."""
+        return len(self.counts)
+
+    def update(self, batch: Union[Sequence[float], np.ndarray]) -> "BalanceSketch":
+        """Add a batch of balances to the sketch.
+
+        Args:
+            batch: Array-like of token balances. Negative balances are ignored.
+
+        Returns:
+            The sketch itself, to allow chaining
+
+        """
+        values = np.asarray(batch, dtype=np.float64).ravel()
+        self.zero_count += int(np.count_nonzero(values == 0))
+        positive = values[values > 0]
+        if positive.size == 0:
+            return self
+
+        keys = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        bucket_counts = np.bincount(inverse)
+        bucket_sums = np.bincount(inverse, weights=positive)
+
+        for key, bucket_count, bucket_sum in zip(unique_keys.tolist(), bucket_counts.tolist(), bucket_sums.tolist()):
+            self.counts[key] = self.counts.get(key, 0) + bucket_count
+            self.sums[key] = self.sums.get(key, 0.0) + bucket_sum
+
+        self._collapse()
+        return self
+
+    def merge(self, other: "BalanceSketch") -> "BalanceSketch":
+        """Combine another sketch built with the same accuracy into this one.
+
+        Args:
+            other: Sketch computed on a different shard of holders
+
+        Returns:
+            The sketch itself, to allow chaining
+
+        Raises:
+            ValueError: If the sketches use different bucket widths
+
+        """
+        if not math.isclose(self.gamma, other.gamma):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+
+        for key, bucket_count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + bucket_count
+            self.sums[key] = self.sums.get(key, 0.0) + other.sums[key]
+        self.zero_count += other.zero_count
+        self.collapsed = self.collapsed or other.collapsed
+
+        self._collapse()
+        return self
+
+    def _collapse(self) -> None:
+        """Fold the lowest buckets together so at most max_buckets remain."""
+        if len(self.counts) <= self.max_buckets:
+            return
+
+        keys = sorted(self.counts)
+        excess = keys[: len(keys) - self.max_buckets + 1]
+        target = excess[-1]
+        for key in excess[:-1]:
+            self.counts[target] += self.counts.pop(key)
+            self.sums[target] += self.sums.pop(key)
+        self.collapsed = True
+
+    def _descending_arrays(self):
+        """Bucket counts and sums ordered from the largest balances down, with their prefix sums."""
+        keys = sorted(self.counts, reverse=True)
+        counts = np.array([self.counts[key] for key in keys], dtype=np.float64)
+        sums = np.array([self.sums[key] for key in keys], dtype=np.float64)
+        return counts, sums, np.cumsum(counts), np.cumsum(sums)
+
+    def top_sum(self, holder_count: int) -> float:
+        """Estimate the balance held by the ``holder_count`` largest holders.
+
+        Args:
+            holder_count: Number of top holders
+
+        Returns:
+            Estimated sum of their balances
+
+        """
+        if holder_count <= 0 or not self.counts:
+            return 0.0
+
+        counts, sums, cumulative_counts, cumulative_sums = self._descending_arrays()
+        if holder_count >= cumulative_counts[-1]:
+            return float(cumulative_sums[-1])
+
+        # Whole buckets above the boundary are exact; the boundary bucket is split evenly
+        j = int(np.searchsorted(cumulative_counts, holder_count, side="left"))
+        previous_count = cumulative_counts[j - 1] if j > 0 else 0.0
+        previous_sum = cumulative_sums[j - 1] if j > 0 else 0.0
+        return float(previous_sum + (holder_count - previous_count) * sums[j] / counts[j])
+
+    def bottom_sum(self, holder_count: int) -> float:
+        """Estimate the balance held by the ``holder_count`` smallest holders.
+
+        Args:
+            holder_count: Number of bottom holders (zero balances count as holders)
+
+        Returns:
+            Estimated sum of their balances
+
+        """
+        holder_count = min(max(holder_count, 0), self.count)
+        return max(0.0, self.total - self.top_sum(self.count - holder_count))
+
+    def holders_for_share(self, threshold: float = 51.0) -> int:
+        """Estimate the minimum number of holders controlling ``threshold`` percent of supply.
+
+        Args:
+            threshold: Control threshold percentage
+
+        Returns:
+            Estimated Nakamoto coefficient
+
+        """
+        total = self.total
+        if self.count == 0 or total == 0:
+            return 0
+
+        counts, sums, cumulative_counts, cumulative_sums = self._descending_arrays()
+        target = total * threshold / 100
+        j = int(np.searchsorted(cumulative_sums, target, side="left"))
+        if j >= len(counts):
+            return self.count
+
+        previous_count = cumulative_counts[j - 1] if j > 0 else 0.0
+        previous_sum = cumulative_sums[j - 1] if j > 0 else 0.0
+        needed = math.ceil((target - previous_sum) / (sums[j] / counts[j]))
+        needed = min(max(needed, 1), int(counts[j]))
+        return int(previous_count) + needed
+
+    def nakamoto_coefficient(self, threshold: float = 51.0) -> int:
+        """Approximate Nakamoto coefficient (alias of holders_for_share)."""
+        return self.holders_for_share(threshold)
+
+    def top_percentiles(self, percentiles: Optional[List[int]] = None) -> Dict[str, float]:
+        """Estimate the percentage of tokens held by the top X% of holders.
+
+        Args:
+            percentiles: List of percentiles to calculate
+
+        Returns:
+            Dictionary mapping percentiles to concentration percentages
+
+        """
+        if percentiles is None:
+            percentiles = [1, 5, 10, 20, 50]
+
+        total = self.total
+        if self.count == 0 or total == 0:
+            return {str(p): 0.0 for p in percentiles}
+
+        return {str(p): self.top_sum(max(1, int(self.count * p / 100))) / total * 100 for p in percentiles}
+
+    def palma_ratio(self) -> float:
+        """Estimate the Palma ratio (top 10% share divided by bottom 40% share).
+
+        Returns:
+            Palma ratio as a float, or float("inf") if the bottom 40% holds nothing
+
+        """
+        total = self.total
+        if self.count == 0 or total == 0:
+            return 0.0
+
+        top_10_share = self.top_sum(max(1, int(self.count * 0.1))) / total
+        bottom_40_share = self.bottom_sum(max(1, int(self.count * 0.4))) / total
+
+        if bottom_40_share == 0:
+            return float("inf")
+
+        return top_10_share / bottom_40_share
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the sketch to a JSON-compatible dictionary."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "zero_count": self.zero_count,
+            "collapsed": self.collapsed,
+            "buckets": [[key, self.counts[key], self.sums[key]] for key in sorted(self.counts)],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "BalanceSketch":
+        """Rebuild a sketch serialized with to_dict.
+
+        Args:
+            data: Dictionary produced by to_dict
+
+        Returns:
+            BalanceSketch instance
+
+        """
+        sketch = cls(
+            relative_accuracy=data.get("relative_accuracy", DEFAULT_RELATIVE_ACCURACY),
+            max_buckets=data.get("max_buckets", DEFAULT_MAX_BUCKETS),
+        )
+        sketch.zero_count = int(data.get("zero_count", 0))
+        sketch.collapsed = bool(data.get("collapsed", False))
+        for key, bucket_count, bucket_sum in data.get("buckets", []):
+            sketch.counts[int(key)] = int(bucket_count)
+            sketch.sums[int(key)] = float(bucket_sum)
+        return sketch
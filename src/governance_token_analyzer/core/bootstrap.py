@@ -0,0 +1,122 @@
+"""Bootstrap Confidence Intervals for Concentration Metrics.
+
+A holder list fetched from an API is a sample of the full distribution, so point
+estimates such as the Gini coefficient carry sampling uncertainty. This module
+resamples holders with replacement and reports percentile confidence intervals.
+
+Each block of resamples is drawn as a (resamples x holders) index matrix and all of
+its rows are scored in one ``calculate_batch_metrics`` call, so there is no Python
+loop per resample. Large jobs are split into fixed blocks with independent seeds and
+spread over a process pool; the blocks are seeded the same way either way, so the
+result does not depend on the number of workers.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from .concentration_engine import calculate_batch_metrics
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESAMPLES = 1000
+BOOTSTRAP_METRICS = ("gini_coefficient", "nakamoto_coefficient", "herfindahl_index")
+
+# Balances scored per block; bounds the memory of one index matrix
+_BLOCK_ELEMENTS = 1 << 21
+# Below this many resampled balances in total, a process pool costs more than it saves
+_PARALLEL_MIN_ELEMENTS = 1 << 23
+
+
+def _resample_block(
+    values: np.ndarray, resamples: int, seed: np.random.SeedSequence, threshold: float
+) -> Dict[str, np.ndarray]:
+    """Score one block of bootstrap resamples.
+
+    Args:
+        values: Positive balances to resample from
+        resamples: Number of resamples in this block
+        seed: Seed for this block's generator
+        threshold: Nakamoto control threshold percentage
+
+    Returns:
+        Dictionary mapping each metric in BOOTSTRAP_METRICS to one value per resample
+
+    """
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, values.size, size=(resamples, values.size))
+    batch = calculate_batch_metrics(values[indices], threshold=threshold)
+    return {metric: batch[metric] for metric in BOOTSTRAP_METRICS}
+
+
+def bootstrap_confidence_intervals(
+    balances: Union[List[float], np.ndarray],
+    confidence: float = 0.95,
+    resamples: int = DEFAULT_RESAMPLES,
+    threshold: float = 51.0,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Estimate percentile bootstrap confidence intervals for concentration metrics.
+
+    Args:
+        balances: Token balances (list, array or FixedPointBalances); non-positive values are ignored
+        confidence: Confidence level between 0 and 1, e.g. 0.95
+        resamples: Number of bootstrap resamples
+        threshold: Nakamoto control threshold percentage
+        seed: Seed for reproducible resampling
+        workers: Maximum worker processes; None uses the CPU count, 1 disables the pool
+
+    Returns:
+        Dictionary with 'confidence', 'resamples' and 'intervals', which maps each
+        metric to its 'estimate', 'lower', 'upper' and 'std_error'
+
+    Raises:
+        ValueError: If confidence is not in (0, 1), resamples is not positive, or
+            there are no positive balances
+
+    """
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1, got {confidence}")
+    if resamples < 1:
+        raise ValueError(f"resamples must be positive, got {resamples}")
+
+    values = np.asarray(balances, dtype=np.float64).ravel()
+    values = values[values > 0]
+    if not values.size:
+        raise ValueError("No positive balances to resample")
+
+    block_rows = max(1, _BLOCK_ELEMENTS // values.size)
+    sizes = [min(block_rows, resamples - start) for start in range(0, resamples, block_rows)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    max_workers = min(workers or os.cpu_count() or 1, len(sizes))
+    if max_workers > 1 and resamples * values.size >= _PARALLEL_MIN_ELEMENTS:
+        logger.debug(f"Bootstrapping {resamples} resamples in {len(sizes)} blocks on {max_workers} processes")
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_resample_block, values, size, block_seed, threshold)
+                for size, block_seed in zip(sizes, seeds)
+            ]
+            blocks = [future.result() for future in futures]
+    else:
+        blocks = [_resample_block(values, size, block_seed, threshold) for size, block_seed in zip(sizes, seeds)]
+
+    estimates = calculate_batch_metrics(values[np.newaxis, :], threshold=threshold)
+    alpha = (1 - confidence) / 2
+    intervals = {}
+    for metric in BOOTSTRAP_METRICS:
+        samples = np.concatenate([block[metric] for block in blocks]).astype(np.float64)
+        lower, upper = np.quantile(samples, [alpha, 1 - alpha])
+        intervals[metric] = {
+            "estimate": float(estimates[metric][0]),
+            "lower": float(lower),
+            "upper": float(upper),
+            "std_error": float(samples.std(ddof=1)) if samples.size > 1 else 0.0,
+        }
+
+    return {"confidence": confidence, "resamples": resamples, "intervals": intervals}
@@ -0,0 +1,247 @@
+"""Per-Provider Circuit Breakers.
+
+When a provider is down, every call would otherwise wait out the full request timeout
+before falling back. Each provider gets one process-wide circuit breaker shared by all
+client instances:
+
+- closed: requests pass; consecutive provider failures are counted
+- open: after ``failure_threshold`` consecutive failures, requests are rejected at once
+  with CircuitOpenError until ``cooldown`` seconds have passed
+- half-open: after the cooldown a single probe request is let through; its success
+  closes the circuit and its failure opens it for another cooldown
+
+Only failures that indicate an unhealthy provider (timeouts, connection errors, HTTP 429
+and 5xx responses) trip the breaker; a bad request does not.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import requests
+
+from .config import Config
+from .exceptions import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Providers shown in health reports even before they have been used
+KNOWN_PROVIDERS = ("alchemy", "graph", "moralis", "etherscan")
+
+
+def is_provider_failure(exception: BaseException) -> bool:
+    """Whether an exception means the provider itself is unhealthy.
+
+    Args:
+        exception: Exception raised by a provider request
+
+    Returns:
+        True for timeouts, connection errors and HTTP 429 or 5xx responses
+
+    """
+    if isinstance(exception, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    if isinstance(exception, requests.exceptions.HTTPError) and exception.response is not None:
+        return exception.response.status_code == 429 or exception.response.status_code >= 500
+    return False
+
+
+class CircuitBreaker:
+    """Thread-safe circuit breaker guarding one provider."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        cooldown: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a closed circuit.
+
+        Args:
+            name: Provider name, used in errors and logs
+            failure_threshold: Consecutive failures that open the circuit
+            cooldown: Seconds the circuit stays open before a probe is allowed
+            clock: Monotonic time source in seconds
+
+        Raises:
+            ValueError: If the threshold is smaller than 1 or the cooldown is negative
+
+        """
+        if failure_threshold < 1:
+            raise ValueError(f"failure_threshold must be at least 1, got: {failure_threshold}")
+        if cooldown < 0:
+            raise ValueError(f"cooldown must not be negative, got: {cooldown}")
+
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current state: 'closed', 'open' or 'half_open' (once the cooldown has passed)."""
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.cooldown:
+                return HALF_OPEN
+            return self._state
+
+    def is_open(self) -> bool:
+        """Whether requests are currently rejected without a probe being due."""
+        return self.state == OPEN
+
+    def allow_request(self) -> bool:
+        """Decide whether a request may go to the provider, claiming the probe if one is due.
+
+        Returns:
+            True if the request may proceed
+
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return True
+            if self._state == OPEN:
+                if self._clock() - self._opened_at < self.cooldown:
+                    return False
+                self._state = HALF_OPEN
+                self._probe_in_flight = False
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+            logger.info(f"Circuit for {self.name} is half-open, probing the provider")
+            return True
+
+    def record_success(self) -> None:
+        """Close the circuit and reset the failure count."""
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"Circuit for {self.name} closed, provider recovered")
+            self._state = CLOSED
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold or after a failed probe."""
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    logger.warning(
+                        f"Circuit for {self.name} opened after {self._failures} consecutive failures; "
+                        f"skipping it for {self.cooldown:.0f}s"
+                    )
+                self._state = OPEN
+                self._opened_at = self._clock()
+                self._probe_in_flight = False
+
+    def call(
+        self,
+        function: Callable[..., T],
+        *args: Any,
+        is_failure: Callable[[BaseException], bool] = is_provider_failure,
+        **kwargs: Any,
+    ) -> T:
+        """Call a function that talks to the provider, guarded by the circuit.
+
+        Args:
+            function: Function performing the request
+            *args: Positional arguments for the function
+            is_failure: Predicate deciding which exceptions count against the provider
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            The function's result
+
+        Raises:
+            CircuitOpenError: If the circuit is open
+            Exception: Whatever the function raises
+
+        """
+        if not self.allow_request():
+            raise CircuitOpenError(f"Circuit for {self.name} is open; skipping the request")
+
+        try:
+            result = function(*args, **kwargs)
+        except Exception as exception:
+            if is_failure(exception):
+                self.record_failure()
+            else:
+                # The provider answered, so a pending probe has done its job
+                self.record_success()
+            raise
+        except BaseException:
+            # An interrupted call (e.g. KeyboardInterrupt) says nothing about the
+            # provider; hand the probe back so the next request can claim it
+            self._release_probe()
+            raise
+
+        self.record_success()
+        return result
+
+    def _release_probe(self) -> None:
+        """Let another request probe a half-open circuit."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State, consecutive failure count and seconds until the next probe."""
+        with self._lock:
+            retry_in = 0.0
+            state = self._state
+            if state == OPEN:
+                retry_in = max(0.0, self.cooldown - (self._clock() - self._opened_at))
+                if retry_in == 0:
+                    state = HALF_OPEN
+            return {"state": state, "consecutive_failures": self._failures, "retry_in": retry_in}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for a provider, creating it from Config on first use.
+
+    Args:
+        provider: Provider name, e.g. 'etherscan', 'graph', 'moralis' or 'alchemy'
+
+    Returns:
+        CircuitBreaker shared by every client for this provider
+
+    """
+    provider = provider.lower()
+    with _breakers_lock:
+        breaker = _breakers.get(provider)
+        if breaker is None:
+            config = Config()
+            breaker = CircuitBreaker(
+                provider, failure_threshold=config.circuit_failure_threshold, cooldown=config.circuit_cooldown
+            )
+            _breakers[provider] = breaker
+        return breaker
+
+
+def circuit_breaker_states() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every provider's circuit, including providers not used yet."""
+    with _breakers_lock:
+        providers = sorted(set(KNOWN_PROVIDERS) | set(_breakers))
+    return {provider: get_circuit_breaker(provider).snapshot() for provider in providers}
+
+
+def reset_circuit_breakers() -> None:
+    """Drop every circuit breaker so the next use starts closed and re-reads Config."""
+    with _breakers_lock:
+        _breakers.clear()
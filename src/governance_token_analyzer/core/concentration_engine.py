@@ -0,0 +1,558 @@
+"""Vectorized Concentration Engine for Token Distribution Analysis.
+
+This module provides a single-pass engine that computes every distribution
+concentration metric (Gini, Herfindahl, Palma, Hoover, Theil, Nakamoto,
+Shannon entropy, Lorenz curve and top-percentile shares) from one sorted
+float64 array, one cumulative sum and one share vector, instead of re-sorting
+and re-summing the balances once per metric. Batched and grouped variants compute the same
+metrics for many snapshots or holder-size groups with segment-wise reductions.
+"""
+
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+DEFAULT_PERCENTILES = [1, 5, 10, 20, 50]
+DEFAULT_LORENZ_RESOLUTION = 1000
+DEFAULT_CONCENTRATION_CURVE_RESOLUTION = 101
+
+# Holder size buckets by share of total supply: below 0.01%, 0.01-0.1%, 0.1-1%, 1% and above
+HOLDER_SIZE_THRESHOLDS = (0.0001, 0.001, 0.01)
+HOLDER_SIZE_LABELS = ("small", "medium", "large", "whale")
+
+
+class ConcentrationEngine:
+    """Computes concentration metrics from shared sorted and cumulative arrays.
+
+    The balances are converted to a float64 ndarray once. Intermediates are built
+    lazily and cached, so each is computed at most once and only if a metric needs it:
+    the ascending sort, a prefix sum with a leading zero over the sorted array (which
+    makes the sum of any bottom-k or top-k slice a constant-time lookup), and the
+    holder shares and their logarithms for the sort-free metrics.
+    """
+
+    def __init__(self, balances: Union[Sequence[float], np.ndarray], drop_negative: bool = False):
+        """Initialize the engine from raw balances.
+
+        Args:
+            balances: Array-like of token balances
+            drop_negative: Whether to discard negative balances before sorting
+
+        """
+        values = np.asarray(balances, dtype=np.float64).ravel()
+        if drop_negative:
+            values = values[values >= 0]
+
+        self.balances = values
+        self.n = int(values.size)
+        self.total = float(values.sum())
+
+    @classmethod
+    def from_balances(
+        cls, balances: Union["ConcentrationEngine", Sequence[float], np.ndarray], drop_negative: bool = False
+    ) -> "ConcentrationEngine":
+        """Return an engine for the given balances, reusing it if one was passed in.
+
+        Args:
+            balances: Array-like of token balances or an existing ConcentrationEngine
+            drop_negative: Whether to discard negative balances when building a new engine
+
+        Returns:
+            ConcentrationEngine instance
+
+        """
+        if isinstance(balances, cls):
+            return balances
+        return cls(balances, drop_negative=drop_negative)
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether there is no balance mass to analyze."""
+        return self.n == 0 or self.total == 0
+
+    @cached_property
+    def sorted_balances(self) -> np.ndarray:
+        """Balances in ascending order."""
+        return np.sort(self.balances)
+
+    @cached_property
+    def sorted_descending(self) -> np.ndarray:
+        """Balances in descending order, as a view of the ascending sort."""
+        return self.sorted_balances[::-1]
+
+    @cached_property
+    def cumulative(self) -> np.ndarray:
+        """Prefix sums of the ascending balances with a leading zero."""
+        return np.concatenate(([0.0], np.cumsum(self.sorted_balances)))
+
+    @cached_property
+    def shares(self) -> np.ndarray:
+        """Each balance as a fraction of the total, in input order."""
+        if self.total == 0:
+            return np.zeros_like(self.balances)
+        return self.balances / self.total
+
+    @cached_property
+    def log_shares(self) -> np.ndarray:
+        """Natural log of each positive share, and zero for the others."""
+        log_values = np.zeros_like(self.shares)
+        positive = self.shares > 0
+        log_values[positive] = np.log(self.shares[positive])
+        return log_values
+
+    @property
+    def _sorted_total(self) -> float:
+        """Total as the last prefix sum, consistent with every top-k and bottom-k sum."""
+        return float(self.cumulative[-1])
+
+    def bottom_sum(self, count: int) -> float:
+        """Sum of the ``count`` smallest balances."""
+        count = min(max(count, 0), self.n)
+        return float(self.cumulative[count])
+
+    def top_sum(self, count: int) -> float:
+        """Sum of the ``count`` largest balances."""
+        count = min(max(count, 0), self.n)
+        return float(self.cumulative[-1] - self.cumulative[self.n - count])
+
+    def top_cumulative(self) -> np.ndarray:
+        """Cumulative balance held by the top-k holders for k = 0..n."""
+        return self._sorted_total - self.cumulative[::-1]
+
+    def gini_coefficient(self) -> float:
+        """Calculate the Gini coefficient (0 = perfect equality, 1 = maximum inequality).
+
+        Returns:
+            Gini coefficient as a float between 0 and 1
+
+        """
+        if self.is_empty:
+            return 0.0
+
+        # G = (2 * sum(i * x_i)) / (n * sum(x_i)) - (n + 1) / n over ascending x
+        ranks = np.arange(1, self.n + 1, dtype=np.float64)
+        weighted_sum = float(np.dot(ranks, self.sorted_balances))
+        gini = (2 * weighted_sum) / (self.n * self.total) - (self.n + 1) / self.n
+
+        return max(0.0, min(1.0, gini))
+
+    def herfindahl_index(self, total_supply: Optional[float] = None) -> float:
+        """Calculate the Herfindahl-Hirschman Index scaled to the 0-10000 range.
+
+        Args:
+            total_supply: Denominator for market shares. If None, the sum of balances is used.
+
+        Returns:
+            Herfindahl index as a float
+
+        """
+        denominator = total_supply if total_supply is not None and total_supply > 0 else self.total
+        if self.n == 0 or denominator <= 0:
+            return 0.0
+
+        shares = self.shares if denominator == self.total else self.balances / denominator
+        return float(np.dot(shares, shares)) * 10000
+
+    def palma_ratio(self) -> float:
+        """Calculate the Palma ratio (top 10% share divided by bottom 40% share).
+
+        Returns:
+            Palma ratio as a float, or float("inf") if the bottom 40% holds nothing
+
+        """
+        if self.is_empty:
+            return 0.0
+
+        top_10_share = self.top_sum(max(1, int(self.n * 0.1))) / self._sorted_total
+        bottom_40_share = self.bottom_sum(max(1, int(self.n * 0.4))) / self._sorted_total
+
+        if bottom_40_share == 0:
+            return float("inf")
+
+        return top_10_share / bottom_40_share
+
+    def hoover_index(self) -> float:
+        """Calculate the Hoover (Robin Hood) index.
+
+        Returns:
+            Hoover index as a float between 0 and 1
+
+        """
+        if self.is_empty:
+            return 0.0
+
+        # Half the total absolute deviation of the shares from an equal share
+        return float(np.abs(self.shares - 1.0 / self.n).sum()) / 2
+
+    def theil_index(self) -> float:
+        """Calculate the Theil T index, skipping zero and negative balances.
+
+        Returns:
+            Theil index as a float (0 = perfect equality)
+
+        """
+        if self.is_empty:
+            return 0.0
+
+        # (1/n) * sum(r * ln r) with r = n * share, over positive shares
+        positive = self.shares > 0
+        return float(np.dot(self.shares[positive], self.log_shares[positive] + np.log(self.n)))
+
+    def shannon_entropy(self) -> float:
+        """Calculate the Shannon entropy (base 2) of the holder shares.
+
+        Returns:
+            Shannon entropy as a float
+
+        """
+        if self.is_empty:
+            return 0.0
+
+        return float(-np.dot(self.shares, self.log_shares)) / np.log(2)
+
+    def nakamoto_coefficient(self, threshold: float = 51.0, strict: bool = False) -> int:
+        """Calculate the minimum number of holders controlling ``threshold`` percent.
+
+        Args:
+            threshold: Control threshold percentage (default: 51%)
+            strict: Require the share to exceed the threshold rather than reach it
+
+        Returns:
+            Nakamoto coefficient as an integer
+
+        """
+        return int(self.nakamoto_coefficients([threshold], strict=strict)[0])
+
+    def nakamoto_coefficients(
+        self, thresholds: Union[Sequence[float], np.ndarray], strict: bool = False
+    ) -> np.ndarray:
+        """Calculate the Nakamoto coefficient for many thresholds with one binary search.
+
+        Args:
+            thresholds: Control threshold percentages, in any order
+            strict: Require the share to exceed each threshold rather than reach it
+
+        Returns:
+            Integer array with the number of holders needed for each threshold
+
+        """
+        targets = np.asarray(thresholds, dtype=np.float64).ravel()
+        if self.is_empty:
+            return np.zeros(targets.size, dtype=np.int64)
+
+        side = "right" if strict else "left"
+        counts = np.searchsorted(self.top_cumulative(), self._sorted_total * targets / 100, side=side)
+
+        # If a threshold cannot be reached every holder is needed
+        return np.clip(counts, 1, self.n).astype(np.int64)
+
+    def concentration_curve(self, resolution: int = DEFAULT_CONCENTRATION_CURVE_RESOLUTION) -> Dict[str, List[float]]:
+        """Calculate how many of the largest holders are needed to reach each supply share.
+
+        Args:
+            resolution: Number of evenly spaced share levels from 0% to 100%
+
+        Returns:
+            Dictionary with 'share' (control threshold percentage) and 'holders'
+            (minimum number of holders reaching that share)
+
+        Raises:
+            ValueError: If the resolution is smaller than 2
+
+        """
+        if resolution < 2:
+            raise ValueError(f"Concentration curve resolution must be at least 2, got: {resolution}")
+
+        shares = np.linspace(0.0, 100.0, resolution)
+        holders = self.nakamoto_coefficients(shares)
+        if not self.is_empty:
+            # Controlling nothing takes nobody
+            holders[0] = 0
+
+        return {"share": shares.tolist(), "holders": holders.tolist()}
+
+    def lorenz_curve(self, resolution: Optional[int] = None) -> Dict[str, List[float]]:
+        """Calculate the Lorenz curve coordinates.
+
+        With a resolution, the curve is resampled at that many evenly spaced holder
+        shares by interpolating the prefix sums. The endpoints stay exact, and the
+        interior points are scaled so that the trapezoidal area, and therefore the
+        Gini coefficient derived from the curve, matches the full curve whenever the
+        grid can represent it.
+
+        Args:
+            resolution: Number of points to return, or None for all n + 1 points
+
+        Returns:
+            Dictionary with 'x' (cumulative holder share) and 'y' (cumulative token share)
+
+        Raises:
+            ValueError: If the resolution is smaller than 2
+
+        """
+        if resolution is not None and resolution < 2:
+            raise ValueError(f"Lorenz curve resolution must be at least 2, got: {resolution}")
+
+        if self.is_empty:
+            return {"x": [0, 1], "y": [0, 1]}
+
+        y_full = self.cumulative / self._sorted_total
+        if resolution is None or resolution >= self.n + 1:
+            x_values = np.arange(self.n + 1, dtype=np.float64) / self.n
+            return {"x": x_values.tolist(), "y": y_full.tolist()}
+
+        # Holder share x corresponds to prefix-sum index x * n
+        x_values = np.linspace(0.0, 1.0, resolution)
+        y_values = np.interp(x_values * self.n, np.arange(self.n + 1), y_full)
+
+        # Chords of the convex curve overestimate its area; pull the interior down to compensate
+        step = 1.0 / (resolution - 1)
+        full_area = (y_full.sum() - 0.5) / self.n
+        sampled_area = (y_values.sum() - 0.5) * step
+        interior = y_values[1:-1].sum()
+        if interior > 0 and sampled_area > full_area:
+            y_values[1:-1] *= 1 - min((sampled_area - full_area) / (step * interior), 1.0)
+
+        y_values[0], y_values[-1] = 0.0, 1.0
+        return {"x": x_values.tolist(), "y": y_values.tolist()}
+
+    def top_percentiles(self, percentiles: Optional[List[int]] = None) -> Dict[str, float]:
+        """Calculate the percentage of tokens held by the top X% of holders.
+
+        Args:
+            percentiles: List of percentiles to calculate
+
+        Returns:
+            Dictionary mapping percentiles to concentration percentages
+
+        """
+        if percentiles is None:
+            percentiles = DEFAULT_PERCENTILES
+
+        if self.is_empty:
+            return {str(p): 0.0 for p in percentiles}
+
+        total = self._sorted_total
+        return {str(p): self.top_sum(max(1, int(self.n * p / 100))) / total * 100 for p in percentiles}
+
+    def calculate_all(self, lorenz_resolution: Optional[int] = DEFAULT_LORENZ_RESOLUTION) -> Dict[str, Any]:
+        """Calculate every concentration metric from the shared arrays.
+
+        Args:
+            lorenz_resolution: Number of Lorenz curve points, or None for one per holder
+
+        Returns:
+            Dictionary of concentration metrics
+
+        """
+        return {
+            "gini_coefficient": self.gini_coefficient(),
+            "herfindahl_index": self.herfindahl_index(),
+            "palma_ratio": self.palma_ratio(),
+            "hoover_index": self.hoover_index(),
+            "theil_index": self.theil_index(),
+            "nakamoto_coefficient": self.nakamoto_coefficient(),
+            "top_percentile_concentration": self.top_percentiles(),
+            "lorenz_curve": self.lorenz_curve(lorenz_resolution),
+        }
+
+
+def _flatten_snapshots(
+    snapshots: Union[np.ndarray, Sequence[Sequence[float]]],
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Flatten a padded matrix or ragged list of snapshots into values and segment ids.
+
+    The result is ordered by (snapshot, ascending balance).
+    """
+    if isinstance(snapshots, np.ndarray) and snapshots.ndim == 2:
+        # Row-wise sorting is much cheaper than one global sort; NaN padding sorts last
+        num_snapshots, width = snapshots.shape
+        values = np.sort(snapshots.astype(np.float64, copy=False), axis=1).ravel()
+        segments = np.repeat(np.arange(num_snapshots), width)
+    else:
+        rows = [np.asarray(row, dtype=np.float64).ravel() for row in snapshots]
+        num_snapshots = len(rows)
+        lengths = np.array([row.size for row in rows], dtype=np.int64)
+        values = np.concatenate(rows) if rows else np.empty(0, dtype=np.float64)
+        segments = np.repeat(np.arange(num_snapshots), lengths)
+
+        # One sort for every snapshot: order by segment, then ascending balance
+        order = np.lexsort((values, segments))
+        values = values[order]
+        segments = segments[order]
+
+    # Padding (NaN/inf) and non-positive balances do not take part in the metrics
+    keep = np.isfinite(values) & (values > 0)
+    return values[keep], segments[keep], num_snapshots
+
+
+def calculate_batch_metrics(
+    snapshots: Union[np.ndarray, Sequence[Sequence[float]]],
+    threshold: Union[float, Sequence[float]] = 51.0,
+    strict: bool = False,
+    top_n: int = 10,
+) -> Dict[str, np.ndarray]:
+    """Calculate concentration metrics for many snapshots in one vectorized call.
+
+    All snapshots are flattened into one array ordered by (snapshot, balance).
+    Per-snapshot sums, ranks and cumulative sums are then derived segment-wise with
+    ``np.bincount`` and ``np.minimum.reduceat`` instead of a Python loop per snapshot.
+
+    Args:
+        snapshots: Either a padded (snapshots x holders) array where NaN marks padding,
+            or a ragged sequence of per-snapshot balance arrays. Non-positive balances are ignored.
+        threshold: Nakamoto control threshold percentage, scalar or one value per snapshot
+        strict: Require the Nakamoto share to exceed the threshold rather than reach it
+        top_n: Number of top holders for the top-N concentration column
+
+    Returns:
+        Dictionary mapping metric names to arrays with one entry per snapshot:
+        'gini_coefficient', 'nakamoto_coefficient', 'herfindahl_index',
+        'top_{top_n}_concentration', 'total_holders' and 'total_supply'
+
+    """
+    values, segments, num_snapshots = _flatten_snapshots(snapshots)
+
+    counts = np.bincount(segments, minlength=num_snapshots)
+    totals = np.bincount(segments, weights=values, minlength=num_snapshots)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.int64)
+    present = counts > 0
+
+    # 1-based ascending rank of each balance within its snapshot
+    ranks = np.arange(values.size) - starts[segments] + 1
+    seg_counts = counts[segments]
+    seg_totals = totals[segments]
+
+    gini = np.zeros(num_snapshots)
+    weighted = np.bincount(segments, weights=ranks * values, minlength=num_snapshots)
+    n = counts[present].astype(np.float64)
+    gini[present] = 2 * weighted[present] / (n * totals[present]) - (n + 1) / n
+    gini = np.clip(gini, 0.0, 1.0)
+
+    herfindahl = np.zeros(num_snapshots)
+    squares = np.bincount(segments, weights=values * values, minlength=num_snapshots)
+    herfindahl[present] = squares[present] / (totals[present] ** 2) * 10000
+
+    top_mask = ranks > seg_counts - top_n
+    top_sums = np.bincount(segments, weights=values * top_mask, minlength=num_snapshots)
+    top_concentration = np.zeros(num_snapshots)
+    top_concentration[present] = top_sums[present] / totals[present] * 100
+
+    # Balance held by this holder and everyone above them, and how many holders that is
+    prefix = np.concatenate(([0.0], np.cumsum(values)))
+    held_from_here = seg_totals - (prefix[:-1] - prefix[starts[segments]])
+    holders_from_here = seg_counts - ranks + 1
+
+    targets = totals * np.broadcast_to(np.asarray(threshold, dtype=np.float64), (num_snapshots,)) / 100
+    reached = held_from_here > targets[segments] if strict else held_from_here >= targets[segments]
+    candidates = np.where(reached, holders_from_here, seg_counts)
+
+    nakamoto = np.zeros(num_snapshots, dtype=np.int64)
+    if values.size:
+        nakamoto[present] = np.minimum.reduceat(candidates, starts[present])
+
+    return {
+        "gini_coefficient": gini,
+        "nakamoto_coefficient": nakamoto,
+        "herfindahl_index": herfindahl,
+        f"top_{top_n}_concentration": top_concentration,
+        "total_holders": counts,
+        "total_supply": totals,
+    }
+
+
+def calculate_grouped_metrics(
+    balances: Union[Sequence[float], np.ndarray],
+    thresholds: Sequence[float] = HOLDER_SIZE_THRESHOLDS,
+    labels: Sequence[str] = HOLDER_SIZE_LABELS,
+    group_values: Optional[Union[Sequence[float], np.ndarray]] = None,
+) -> Dict[str, Any]:
+    """Calculate per-group concentration metrics and the Theil decomposition in one pass.
+
+    Holders are assigned bucket codes with ``np.digitize`` and sorted once by
+    (group, balance); every per-group sum is then a single ``np.bincount``.
+    The Theil T index decomposes exactly into a within-group part (the share-weighted
+    Theil index of each group) and a between-group part (inequality of group means).
+
+    Args:
+        balances: Array-like of non-negative token balances
+        thresholds: Ascending lower bounds of every group after the first. A holder whose
+            group value is at least ``thresholds[i]`` (and below the next bound) is in group i + 1.
+        labels: One name per group, from the lowest to the highest bucket
+        group_values: Values compared against ``thresholds``. If None, each holder's
+            share of the total balance (a fraction between 0 and 1) is used.
+
+    Returns:
+        Dictionary with 'groups' (label -> holder_count, total_balance, share,
+        mean_balance, gini_coefficient, herfindahl_index), 'theil_index',
+        'theil_within', 'theil_between' and 'codes', the group index of each holder
+
+    Raises:
+        ValueError: If the number of labels does not match the number of thresholds
+
+    """
+    if len(labels) != len(thresholds) + 1:
+        raise ValueError(f"Expected {len(thresholds) + 1} labels for {len(thresholds)} thresholds, got {len(labels)}")
+
+    values = np.asarray(balances, dtype=np.float64).ravel()
+    total = float(values.sum())
+    num_groups = len(labels)
+
+    if group_values is None:
+        group_values = values / total if total > 0 else np.zeros_like(values)
+    codes = np.digitize(np.asarray(group_values, dtype=np.float64).ravel(), np.asarray(thresholds, dtype=np.float64))
+
+    # One sort for every group: order by group code, then ascending balance
+    order = np.lexsort((values, codes))
+    sorted_values = values[order]
+    sorted_codes = codes[order]
+
+    counts = np.bincount(sorted_codes, minlength=num_groups)
+    sums = np.bincount(sorted_codes, weights=sorted_values, minlength=num_groups)
+    squares = np.bincount(sorted_codes, weights=sorted_values * sorted_values, minlength=num_groups)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    ranks = np.arange(sorted_values.size) - starts[sorted_codes] + 1
+    weighted = np.bincount(sorted_codes, weights=ranks * sorted_values, minlength=num_groups)
+
+    held = sums > 0
+    n = counts.astype(np.float64)
+    means = np.divide(sums, n, out=np.zeros(num_groups), where=counts > 0)
+
+    gini = np.zeros(num_groups)
+    gini[held] = 2 * weighted[held] / (n[held] * sums[held]) - (n[held] + 1) / n[held]
+    gini = np.clip(gini, 0.0, 1.0)
+
+    herfindahl = np.zeros(num_groups)
+    herfindahl[held] = squares[held] / sums[held] ** 2 * 10000
+
+    # sum of x * ln(x / group mean) per group, skipping zero balances like ConcentrationEngine.theil_index
+    positive = sorted_values > 0
+    log_ratios = np.zeros_like(sorted_values)
+    log_ratios[positive] = np.log(sorted_values[positive] / means[sorted_codes[positive]])
+    within_sums = np.bincount(sorted_codes, weights=sorted_values * log_ratios, minlength=num_groups)
+
+    theil_within = theil_between = 0.0
+    if total > 0:
+        overall_mean = total / values.size
+        theil_within = float(within_sums.sum()) / total
+        theil_between = float(np.sum(sums[held] * np.log(means[held] / overall_mean))) / total
+
+    groups = {}
+    for index, label in enumerate(labels):
+        groups[label] = {
+            "holder_count": int(counts[index]),
+            "total_balance": float(sums[index]),
+            "share": float(sums[index] / total * 100) if total > 0 else 0.0,
+            "mean_balance": float(means[index]),
+            "gini_coefficient": float(gini[index]),
+            "herfindahl_index": float(herfindahl[index]),
+        }
+
+    return {
+        "groups": groups,
+        "theil_index": theil_within + theil_between,
+        "theil_within": theil_within,
+        "theil_between": theil_between,
+        "codes": codes,
+    }
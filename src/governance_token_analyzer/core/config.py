@@ -57,6 +57,77 @@ class Config:
             "data/sample_outputs",
         )
 
+        # Metric result cache (the on-disk tier is only used if a directory is set)
+        self.metric_cache_dir = os.getenv("METRIC_CACHE_DIR")
+        self.metric_cache_entries = int(os.getenv("METRIC_CACHE_ENTRIES", "256"))
+        self.metric_cache_max_bytes = int(os.getenv("METRIC_CACHE_MAX_MB", "64")) * 1024 * 1024
+
+        # Seed of the simulated holder and vote generators (unset: different data every run)
+        self.sample_data_seed = int(os.environ["SAMPLE_DATA_SEED"]) if os.getenv("SAMPLE_DATA_SEED") else None
+
+        # Upper bound on concurrent provider requests made by the asynchronous client
+        self.max_concurrent_requests = int(os.getenv("MAX_CONCURRENT_REQUESTS", "8"))
+        # Proposals whose votes are packed into one aliased GraphQL request (1 disables batching)
+        self.graph_batch_size = int(os.getenv("GRAPH_BATCH_SIZE", "25"))
+
+        # Provider request rates in requests per second, shared by every client in the process
+        self.rate_limits = {
+            "etherscan": float(os.getenv("ETHERSCAN_RATE_LIMIT", "5")),
+            "graph": float(os.getenv("GRAPH_RATE_LIMIT", "10")),
+            "moralis": float(os.getenv("MORALIS_RATE_LIMIT", "25")),
+            "alchemy": float(os.getenv("ALCHEMY_RATE_LIMIT", "25")),
+            "rpc": float(os.getenv("RPC_RATE_LIMIT", "25")),
+        }
+        self.default_rate_limit = float(os.getenv("DEFAULT_RATE_LIMIT", "5"))
+        # Optional burst sizes; a provider without one may burst one second of requests
+        self.rate_limit_bursts = {
+            provider: float(os.environ[f"{provider.upper()}_RATE_BURST"])
+            for provider in self.rate_limits
+            if os.getenv(f"{provider.upper()}_RATE_BURST")
+        }
+
+        # Circuit breakers: consecutive provider failures before a provider is skipped, and
+        # seconds before a skipped provider is probed again
+        self.circuit_failure_threshold = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "3"))
+        self.circuit_cooldown = float(os.getenv("CIRCUIT_COOLDOWN", "60"))
+
+        # Shared HTTP transport: pooled connections per provider host, request timeout in seconds
+        # and retries of timeouts, connection errors, 429 and 5xx with jittered exponential backoff
+        self.http_pool_size = int(os.getenv("HTTP_POOL_SIZE", str(max(self.max_concurrent_requests, 10))))
+        self.http_timeout = float(os.getenv("HTTP_TIMEOUT", "30"))
+        self.http_max_retries = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+        self.http_backoff = float(os.getenv("HTTP_RETRY_BACKOFF", "1.0"))
+        self.http_max_backoff = float(os.getenv("HTTP_RETRY_MAX_BACKOFF", "30"))
+
+        # Transfer log ingestion: blocks per initial eth_getLogs range (adapted to the node's result
+        # limit while running) and concurrent range requests
+        self.transfer_log_chunk_blocks = int(os.getenv("TRANSFER_LOG_CHUNK_BLOCKS", "2000"))
+        self.transfer_log_workers = int(os.getenv("TRANSFER_LOG_WORKERS", "4"))
+
+        # Hedged provider fallback: the next provider starts once the current one is slower than
+        # this percentile of its recent latencies, bounded by the minimum and maximum delay
+        self.hedge_percentile = float(os.getenv("HEDGE_PERCENTILE", "95"))
+        self.hedge_default_delay = float(os.getenv("HEDGE_DEFAULT_DELAY", "2.0"))
+        self.hedge_min_delay = float(os.getenv("HEDGE_MIN_DELAY", "0.1"))
+        self.hedge_max_delay = float(os.getenv("HEDGE_MAX_DELAY", "10.0"))
+
+        # Persistent HTTP response cache for provider calls
+        self.http_cache_enabled = os.getenv("HTTP_CACHE_ENABLED", "true").lower() not in ("0", "false", "no")
+        self.http_cache_path = os.getenv(
+            "HTTP_CACHE_PATH", os.path.join(os.path.expanduser("~"), ".cache", "gova", "http_cache.sqlite")
+        )
+        self.http_cache_max_bytes = int(os.getenv("HTTP_CACHE_MAX_MB", "256")) * 1024 * 1024
+        # Seconds to keep responses per endpoint; votes of closed proposals are kept indefinitely
+        self.http_cache_ttls = {
+            "etherscan": float(os.getenv("HTTP_CACHE_TTL_ETHERSCAN", "3600")),
+            "moralis": float(os.getenv("HTTP_CACHE_TTL_MORALIS", "3600")),
+            "graph": float(os.getenv("HTTP_CACHE_TTL_GRAPH", "900")),
+            "graph:proposals": float(os.getenv("HTTP_CACHE_TTL_PROPOSALS", "900")),
+            "graph:votes": float(os.getenv("HTTP_CACHE_TTL_VOTES", "900")),
+        }
+        # Serve provider responses only from the cache
+        self.offline = os.getenv("GOVA_OFFLINE", "false").lower() in ("1", "true", "yes")
+
     def get_api_key(self):
         """Get the Etherscan API key."""
         return self.etherscan_api_key
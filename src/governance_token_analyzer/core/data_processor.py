@@ -3,10 +3,17 @@ This module handles transformation of protocol-specific data structures
 into standard formats for cross-protocol analysis.
 """
 
+import logging
 from typing import Any, Dict, List, Union
 
+import numpy as np
 import pandas as pd
 
+from .balance_parsing import extract_balance_column, holder_balances, to_float_balances
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
 
 def standardize_holder_data(holder_data: List[Dict[str, Any]], protocol_name: str) -> pd.DataFrame:
     """Standardize token holder data from different protocols into a common DataFrame format.
@@ -37,50 +44,33 @@ def standardize_holder_data(holder_data: List[Dict[str, Any]], protocol_name: st
 
 def _standardize_compound_holders(holder_data: List[Dict[str, Any]]) -> pd.DataFrame:
     """Standardize Compound token holder data."""
-    # Extract required fields
-    standardized = []
-    for holder in holder_data:
-        standardized.append(
-            {
-                "address": holder.get("address", ""),
-                "balance": float(holder.get("balance", 0)),
-                "percentage": float(holder.get("percentage", 0)),
-            }
-        )
-
-    return pd.DataFrame(standardized)
+    return _standardize_holders(holder_data)
 
 
 def _standardize_uniswap_holders(holder_data: List[Dict[str, Any]]) -> pd.DataFrame:
     """Standardize Uniswap token holder data."""
-    # Extract required fields
-    standardized = []
-    for holder in holder_data:
-        standardized.append(
-            {
-                "address": holder.get("address", ""),
-                "balance": float(holder.get("balance", 0)),
-                "percentage": float(holder.get("percentage", 0)),
-            }
-        )
-
-    return pd.DataFrame(standardized)
+    return _standardize_holders(holder_data)
 
 
 def _standardize_aave_holders(holder_data: List[Dict[str, Any]]) -> pd.DataFrame:
     """Standardize Aave token holder data."""
-    # Extract required fields
-    standardized = []
-    for holder in holder_data:
-        standardized.append(
-            {
-                "address": holder.get("address", ""),
-                "balance": float(holder.get("balance", 0)),
-                "percentage": float(holder.get("percentage", 0)),
-            }
-        )
-
-    return pd.DataFrame(standardized)
+    return _standardize_holders(holder_data)
+
+
+def _standardize_holders(holder_data: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Build the standard address/balance/percentage frame with column-wise conversion."""
+    balances, rejected = holder_balances(holder_data)
+    if rejected:
+        logger.warning(f"Set {rejected} missing or unparseable balances to 0")
+    percentages, _ = to_float_balances(extract_balance_column(holder_data, ("percentage",)))
+
+    return pd.DataFrame(
+        {
+            "address": [holder.get("address", "") for holder in holder_data],
+            "balance": np.nan_to_num(balances),
+            "percentage": np.nan_to_num(percentages),
+        }
+    )
 
 
 def combine_protocol_data(protocol_dfs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
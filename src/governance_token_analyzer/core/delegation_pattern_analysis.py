@@ -10,6 +10,7 @@ from typing import Any, Dict, List
 import networkx as nx
 import numpy as np
 
+from .concentration_engine import HOLDER_SIZE_LABELS, HOLDER_SIZE_THRESHOLDS, calculate_grouped_metrics
 from .exceptions import AnalysisError, DataFormatError
 
 # Configure logging
@@ -441,32 +442,46 @@ class DelegationPatternAnalyzer:
             Dictionary with delegation pattern analysis
 
         """
-        # Create holder categories by balance
-        balance_categories = self._categorize_holders_by_balance(token_holders)
-
-        # Analyze delegation patterns by category
+        # Group holders by balance and compute per-group totals and metrics in one pass
+        balances = np.array([holder["balance"] for holder in token_holders], dtype=np.float64)
+        grouped = calculate_grouped_metrics(balances)
+        codes = grouped["codes"]
+        num_groups = len(HOLDER_SIZE_LABELS)
+
+        # Delegator/delegatee flags per holder and delegated amounts per delegator group
+        is_delegator = np.array([graph.out_degree(holder["address"]) > 0 for holder in token_holders], dtype=bool)
+        is_delegatee = np.array([graph.in_degree(holder["address"]) > 0 for holder in token_holders], dtype=bool)
+        delegator_counts = np.bincount(codes, weights=is_delegator, minlength=num_groups)
+        delegatee_counts = np.bincount(codes, weights=is_delegatee, minlength=num_groups)
+
+        code_by_address = {holder["address"]: code for holder, code in zip(token_holders, codes.tolist())}
+        edge_codes = []
+        edge_amounts = []
+        for u, _, data in graph.edges(data=True):
+            if u in code_by_address:
+                edge_codes.append(code_by_address[u])
+                edge_amounts.append(data["amount"])
+        delegated_amounts = np.bincount(
+            np.asarray(edge_codes, dtype=np.int64),
+            weights=np.asarray(edge_amounts, dtype=np.float64),
+            minlength=num_groups,
+        )
+
+        # Report categories from the largest holders down
         category_patterns = {}
-
-        for category, holders in balance_categories.items():
-            addresses = [holder["address"] for holder in holders]
-
-            # Calculate category metrics
-            delegators_in_category = [addr for addr in addresses if graph.out_degree(addr) > 0]
-            delegatees_in_category = [addr for addr in addresses if graph.in_degree(addr) > 0]
-
-            # Delegation rate for this category
-            total_balance = sum(holder["balance"] for holder in holders)
-            delegated_amount = sum(data["amount"] for u, v, data in graph.edges(data=True) if u in addresses)
-
-            delegation_rate = (delegated_amount / total_balance) * 100 if total_balance > 0 else 0
-
+        for code in reversed(range(num_groups)):
+            category = HOLDER_SIZE_LABELS[code]
+            group = grouped["groups"][category]
+            total_balance = group["total_balance"]
             category_patterns[category] = {
-                "holder_count": len(holders),
-                "delegator_count": len(delegators_in_category),
-                "delegatee_count": len(delegatees_in_category),
-                "delegation_rate": delegation_rate,
-                "avg_balance": total_balance / len(holders) if holders else 0,
+                "holder_count": group["holder_count"],
+                "delegator_count": int(delegator_counts[code]),
+                "delegatee_count": int(delegatee_counts[code]),
+                "delegation_rate": (delegated_amounts[code] / total_balance) * 100 if total_balance > 0 else 0,
+                "avg_balance": group["mean_balance"],
                 "total_balance": total_balance,
+                "supply_share": group["share"],
+                "gini_coefficient": group["gini_coefficient"],
             }
 
         # Detect circular delegations
@@ -477,6 +492,11 @@ class DelegationPatternAnalyzer:
 
         return {
             "category_patterns": category_patterns,
+            "theil_decomposition": {
+                "theil_index": grouped["theil_index"],
+                "within_categories": grouped["theil_within"],
+                "between_categories": grouped["theil_between"],
+            },
             "circular_delegations": circular_delegations,
             "whale_delegations": whale_delegations,
         }
@@ -491,37 +511,17 @@ class DelegationPatternAnalyzer:
             Dictionary mapping categories to lists of holders
 
         """
-        # Calculate total supply
-        total_supply = sum(holder["balance"] for holder in token_holders)
+        balances = np.array([holder["balance"] for holder in token_holders], dtype=np.float64)
+        total_supply = balances.sum()
+        shares = balances / total_supply if total_supply > 0 else np.zeros_like(balances)
+        codes = np.digitize(shares, HOLDER_SIZE_THRESHOLDS).tolist()
 
-        # Define categories
-        categories = {
-            "whale": {"min_pct": 0.01, "holders": []},
-            "large": {"min_pct": 0.001, "holders": []},
-            "medium": {"min_pct": 0.0001, "holders": []},
-            "small": {"min_pct": 0, "holders": []},
-        }
+        # Keep the whale-to-small order callers expect
+        categories = {label: [] for label in reversed(HOLDER_SIZE_LABELS)}
+        for holder, code in zip(token_holders, codes):
+            categories[HOLDER_SIZE_LABELS[code]].append(holder)
 
-        # Categorize holders
-        for holder in token_holders:
-            percentage = holder["balance"] / total_supply if total_supply > 0 else 0
-
-            if percentage >= categories["whale"]["min_pct"]:
-                categories["whale"]["holders"].append(holder)
-            elif percentage >= categories["large"]["min_pct"]:
-                categories["large"]["holders"].append(holder)
-            elif percentage >= categories["medium"]["min_pct"]:
-                categories["medium"]["holders"].append(holder)
-            else:
-                categories["small"]["holders"].append(holder)
-
-        # Return just the holders for each category
-        return {
-            "whale": categories["whale"]["holders"],
-            "large": categories["large"]["holders"],
-            "medium": categories["medium"]["holders"],
-            "small": categories["small"]["holders"],
-        }
+        return categories
 
     def _detect_circular_delegations(self, graph: nx.DiGraph) -> List[List[str]]:
         """Detect circular delegation patterns in the network.
@@ -17,6 +17,33 @@ class DataAccessError(GovernanceAnalyzerError):
     pass
 
 
+class OfflineCacheMissError(DataAccessError):
+    """Exception raised in offline mode when a response is not in the HTTP cache."""
+
+    pass
+
+
+class AllProvidersFailedError(DataAccessError):
+    """Exception raised when no data provider returned a usable response."""
+
+    pass
+
+
+class CircuitOpenError(DataAccessError):
+    """Exception raised when a provider is skipped because its circuit breaker is open."""
+
+    pass
+
+
+class JSONRPCError(DataAccessError):
+    """Exception raised when a JSON-RPC node answers a call with an error object."""
+
+    def __init__(self, message: str, code: int = None, data=None):
+        self.code = code
+        self.data = data
+        super().__init__(f"JSON-RPC error {code}: {message}" if code is not None else message)
+
+
 class DataStorageError(GovernanceAnalyzerError):
     """Exception raised when there are issues storing data."""
 
@@ -83,3 +110,4 @@ class NetworkAnalysisError(Exception):
     """Exception raised for errors during network analysis."""
 
     pass
+
@@ -0,0 +1,271 @@
+"""Fixed-Point Balance Columns for Exact Token Amounts.
+
+Token APIs report balances as decimal strings of up to 18 fractional digits
+(wei-denominated amounts routinely exceed 2^63). Converting those strings to
+Python floats on every hop loses precision and repeats the same parsing work.
+
+This module provides a canonical balance column: every amount is stored as an
+exact integer number of base units (10^-decimals tokens) split into two uint64
+decimal limbs, value = high * 10^18 + low. When no amount needs the high limb,
+the low limb doubles as a scaled int64 column. The parser converts a whole
+column of raw API values at once with NumPy string operations, and the column
+exposes ``__array__`` so every metric function that calls ``np.asarray`` on its
+input accepts it directly.
+"""
+
+import logging
+from decimal import Decimal, InvalidOperation, localcontext
+from typing import Any, List, Optional, Sequence, Union
+
+import numpy as np
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+LIMB_DIGITS = 18
+LIMB = 10**LIMB_DIGITS
+MAX_DIGITS = 2 * LIMB_DIGITS + 1  # high limb holds up to 19 digits and stays below 2^64
+MAX_DECIMALS = 18
+
+_POWERS = 10 ** np.arange(MAX_DIGITS - LIMB_DIGITS + 1, dtype=np.uint64)
+_CHUNK_ROWS = 1 << 16
+
+
+class FixedPointBalances:
+    """Column of non-negative token amounts stored as exact base-unit integers."""
+
+    def __init__(
+        self,
+        low: np.ndarray,
+        high: Optional[np.ndarray] = None,
+        decimals: int = 0,
+        rejected: int = 0,
+    ):
+        """Initialize the column from its limbs.
+
+        Args:
+            low: uint64 array with the low 18 decimal digits of every amount
+            high: Optional uint64 array with the remaining digits; None if all are zero
+            decimals: Number of fractional token digits kept in the base units
+            rejected: Number of input values that could not be parsed
+
+        """
+        self.low = np.asarray(low, dtype=np.uint64)
+        if high is not None:
+            high = np.asarray(high, dtype=np.uint64)
+            if not high.any():
+                high = None
+        self.high = high
+        self.decimals = decimals
+        self.rejected = rejected
+
+    def __len__(self) -> int:
+        """Return the number of amounts in the column."""
+        return int(self.low.size)
+
+    def __getitem__(self, index: Any) -> "FixedPointBalances":
+        """Select amounts by index array or boolean mask."""
+        high = self.high[index] if self.high is not None else None
+        return FixedPointBalances(self.low[index], high, decimals=self.decimals)
+
+    def __array__(self, dtype: Any = None, copy: Optional[bool] = None) -> np.ndarray:
+        """Convert to float64 token amounts, the only point where precision is given up."""
+        values = self.to_float()
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+    @property
+    def scaled(self) -> Optional[np.ndarray]:
+        """Scaled int64 view of the amounts, or None if any amount needs the high limb."""
+        if self.high is not None:
+            return None
+        return self.low.view(np.int64)
+
+    def to_float(self) -> np.ndarray:
+        """Float64 token amounts (base units divided by 10^decimals)."""
+        values = self.low.astype(np.float64)
+        if self.high is not None:
+            values += self.high.astype(np.float64) * float(LIMB)
+        if self.decimals:
+            values /= 10.0**self.decimals
+        return values
+
+    def tolist(self) -> List[float]:
+        """Float token amounts as a Python list."""
+        return self.to_float().tolist()
+
+    def to_ints(self) -> List[int]:
+        """Exact base-unit amounts as Python integers."""
+        if self.high is None:
+            return self.low.tolist()
+        return [high * LIMB + low for high, low in zip(self.high.tolist(), self.low.tolist())]
+
+    def to_strings(self) -> List[str]:
+        """Exact token amounts as canonical decimal strings without trailing zeros."""
+        if not self.decimals:
+            return [str(value) for value in self.to_ints()]
+
+        strings = []
+        for value in self.to_ints():
+            whole, fraction = divmod(value, 10**self.decimals)
+            fraction_digits = str(fraction).rjust(self.decimals, "0").rstrip("0")
+            strings.append(f"{whole}.{fraction_digits}" if fraction_digits else str(whole))
+        return strings
+
+    def exact_total(self) -> int:
+        """Exact sum of all amounts in base units."""
+        # Split the low limb in 32-bit halves so the uint64 partial sums cannot overflow
+        low_total = int(np.sum(self.low >> np.uint64(32), dtype=np.uint64)) << 32
+        low_total += int(np.sum(self.low & np.uint64(0xFFFFFFFF), dtype=np.uint64))
+        high_total = sum(self.high.tolist()) if self.high is not None else 0
+        return high_total * LIMB + low_total
+
+    def positive(self) -> "FixedPointBalances":
+        """Amounts strictly greater than zero, keeping the count of rejected inputs."""
+        mask = self.low > 0
+        if self.high is not None:
+            mask |= self.high > 0
+        selected = self[mask]
+        selected.rejected = self.rejected
+        return selected
+
+    def argsort(self, descending: bool = False) -> np.ndarray:
+        """Exact, stable ordering of the amounts."""
+        high = self.high if self.high is not None else np.zeros_like(self.low)
+        if descending:
+            # Bitwise inversion reverses the order of unsigned integers
+            return np.lexsort((np.arange(len(self)), ~self.low, ~high))
+        return np.lexsort((self.low, high))
+
+
+def _to_decimal(value: str) -> Optional[Decimal]:
+    """Parse a value as a finite, non-negative Decimal, or return None."""
+    try:
+        amount = Decimal(value.replace(",", "").replace("_", ""))
+    except InvalidOperation:
+        return None
+    if not amount.is_finite() or amount < 0:
+        return None
+    return amount
+
+
+def _parse_fallback(value: str, decimals: int) -> Optional[int]:
+    """Parse a value the vectorized path rejected (e.g. scientific notation) exactly.
+
+    Returns None if the value is invalid, negative, too large, or a positive amount
+    that would truncate to zero base units.
+    """
+    amount = _to_decimal(value)
+    if amount is None:
+        return None
+    # scaleb rounds to the context precision, so keep every digit of the input
+    with localcontext() as context:
+        context.prec = max(context.prec, len(amount.as_tuple().digits))
+        units = int(amount.scaleb(decimals))
+    if units == 0 and amount > 0:
+        return None
+    return units if units < LIMB * (1 << 64) else None
+
+
+def parse_balances(
+    values: Union[Sequence[Any], np.ndarray, FixedPointBalances], decimals: Optional[int] = None
+) -> FixedPointBalances:
+    """Parse raw API balances into an exact fixed-point column.
+
+    Accepts decimal strings, integers and floats, including scientific notation.
+    Negative, non-numeric and missing values, and positive values too small for the
+    kept fractional digits, become zero and are counted in ``rejected``.
+
+    Args:
+        values: Raw balances, or an existing FixedPointBalances which is returned unchanged
+        decimals: Fractional digits to keep. If None, the longest fraction in the input
+            (from the exponent for scientific notation) is kept, up to 18 digits and as
+            far as the largest amount leaves room for.
+
+    Returns:
+        FixedPointBalances column
+
+    """
+    if isinstance(values, FixedPointBalances):
+        return values
+
+    raw = np.char.strip(np.asarray(values, dtype=str).ravel())
+    if raw.size == 0:
+        return FixedPointBalances(np.zeros(0, dtype=np.uint64), decimals=decimals or 0)
+
+    lengths = np.char.str_len(raw)
+    points = np.char.find(raw, ".")
+    has_point = points >= 0
+    fraction_digits = np.where(has_point, lengths - points - 1, 0)
+
+    if decimals is None:
+        # Keep the longest fraction unless that would push the largest amount out of range
+        scientific = np.char.find(np.char.lower(raw), "e") >= 0
+        longest_fraction, widest_whole = 0, 0
+        if (has_point & ~scientific).any():
+            whole_digits = np.where(has_point, points, lengths) - (lengths - np.char.str_len(np.char.lstrip(raw, "0")))
+            longest_fraction = int(fraction_digits[~scientific].max())
+            widest_whole = int(whole_digits[~scientific].max())
+        # Scientific notation such as "5e-05" carries its scale in the exponent
+        for value in raw[scientific].tolist():
+            amount = _to_decimal(value)
+            if amount:
+                _, digits, exponent = amount.normalize().as_tuple()
+                longest_fraction = max(longest_fraction, -exponent)
+                widest_whole = max(widest_whole, len(digits) + exponent)
+        decimals = 0
+        if longest_fraction:
+            decimals = max(min(longest_fraction, MAX_DECIMALS, MAX_DIGITS - widest_whole), 0)
+
+    high = np.zeros(raw.size, dtype=np.uint64)
+    low = np.zeros(raw.size, dtype=np.uint64)
+    valid = np.zeros(raw.size, dtype=bool)
+    for start in range(0, raw.size, _CHUNK_ROWS):
+        rows = slice(start, start + _CHUNK_ROWS)
+        chunk = raw[rows]
+
+        # Drop the decimal point and right-align the digits in a fixed-width field
+        if has_point[rows].any():
+            chunk = np.char.replace(chunk, ".", "")
+        aligned = np.char.zfill(chunk, MAX_DIGITS)
+        aligned = aligned.astype(f"<U{max(MAX_DIGITS, aligned.dtype.itemsize // 4)}")
+        codes = aligned.view(np.uint32).reshape(len(chunk), -1)[:, :MAX_DIGITS]
+        digits = np.ascontiguousarray(codes.T) - np.uint32(ord("0"))
+
+        chunk_valid = (
+            (lengths[rows] > 0)
+            & (np.char.str_len(chunk) <= MAX_DIGITS)
+            & (np.char.rfind(raw[rows], ".") == points[rows])
+            & (fraction_digits[rows] <= decimals)
+            & (digits <= 9).all(axis=0)
+        )
+
+        # Carry-free Horner evaluation of the two 18/19-digit limbs
+        chunk_high = np.zeros(len(chunk), dtype=np.uint64)
+        for column in range(MAX_DIGITS - LIMB_DIGITS):
+            chunk_high = chunk_high * np.uint64(10) + digits[column]
+        chunk_low = np.zeros(len(chunk), dtype=np.uint64)
+        for column in range(MAX_DIGITS - LIMB_DIGITS, MAX_DIGITS):
+            chunk_low = chunk_low * np.uint64(10) + digits[column]
+
+        # Scale shorter fractions up to `decimals` digits, carrying from the low limb
+        padding = np.where(chunk_valid, decimals - fraction_digits[rows], 0)
+        scale = _POWERS[padding]
+        chunk_valid &= chunk_high < _POWERS[MAX_DIGITS - LIMB_DIGITS - padding]
+        split = np.uint64(LIMB) // scale
+        high[rows] = np.where(chunk_valid, chunk_high * scale + chunk_low // split, 0)
+        low[rows] = np.where(chunk_valid, (chunk_low % split) * scale, 0)
+        valid[rows] = chunk_valid
+
+    # Values such as "1.5e+21" need an exact slow path; everything else is rejected
+    rejected = 0
+    for index in np.flatnonzero(~valid).tolist():
+        units = _parse_fallback(str(raw[index]), decimals) if raw[index] else 0
+        if units is None:
+            rejected += 1
+            continue
+        high[index], low[index] = divmod(units, LIMB)
+
+    if rejected:
+        logger.debug(f"Rejected {rejected} of {raw.size} balances that could not be parsed")
+
+    return FixedPointBalances(low, high, decimals=decimals, rejected=rejected)
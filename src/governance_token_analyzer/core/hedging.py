@@ -0,0 +1,251 @@
+"""Hedged Requests Across Redundant Data Providers.
+
+Token holders can be fetched from several providers (Alchemy, The Graph, Moralis,
+Etherscan). Trying them strictly one after another means a hanging provider adds its
+full timeout before the next one starts. ``hedged_call`` instead starts the primary
+provider, launches the next one as soon as the primary is slower than usual (or fails),
+and returns the first valid result. Requests that lose the race are abandoned on daemon
+threads, so a provider that hangs never holds the interpreter open at exit.
+
+"Slower than usual" is a high percentile of each provider's recent latencies, tracked
+process-wide by ``LatencyTracker``, so the hedge delay tunes itself to each provider.
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from .config import Config
+from .exceptions import AllProvidersFailedError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_LATENCY_WINDOW = 200
+# Number of latency samples needed before a provider's own percentile is trusted
+MIN_LATENCY_SAMPLES = 5
+
+
+class LatencyTracker:
+    """Thread-safe record of recent response latencies per provider."""
+
+    def __init__(
+        self,
+        window: int = DEFAULT_LATENCY_WINDOW,
+        percentile: float = 95.0,
+        default_delay: float = 2.0,
+        min_delay: float = 0.1,
+        max_delay: float = 10.0,
+    ):
+        """Initialize an empty tracker.
+
+        Args:
+            window: Number of most recent latencies kept per provider
+            percentile: Latency percentile used as the hedge delay
+            default_delay: Hedge delay in seconds for providers with too few samples
+            min_delay: Lower bound on the hedge delay in seconds
+            max_delay: Upper bound on the hedge delay in seconds
+
+        Raises:
+            ValueError: If the window is not positive or the percentile is outside [0, 100]
+
+        """
+        if window < 1:
+            raise ValueError(f"window must be positive, got: {window}")
+        if not 0 <= percentile <= 100:
+            raise ValueError(f"percentile must be between 0 and 100, got: {percentile}")
+
+        self.window = window
+        self.percentile_target = percentile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider: str, seconds: float) -> None:
+        """Record the latency of one completed request."""
+        with self._lock:
+            samples = self._samples.get(provider)
+            if samples is None:
+                samples = self._samples[provider] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, provider: str, q: float) -> Optional[float]:
+        """Nearest-rank percentile of a provider's recent latencies.
+
+        Args:
+            provider: Provider name
+            q: Percentile between 0 and 100
+
+        Returns:
+            Latency in seconds, or None if nothing has been recorded
+
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(provider, ()))
+        if not samples:
+            return None
+        rank = max(1, math.ceil(q / 100 * len(samples)))
+        return samples[rank - 1]
+
+    def hedge_delay(self, provider: str) -> float:
+        """Seconds to wait for a provider before hedging with the next one.
+
+        Args:
+            provider: Provider name
+
+        Returns:
+            The configured percentile of the provider's latencies, or the default delay
+            while there are fewer than MIN_LATENCY_SAMPLES, clamped to [min_delay, max_delay]
+
+        """
+        with self._lock:
+            count = len(self._samples.get(provider, ()))
+        delay = self.percentile(provider, self.percentile_target) if count >= MIN_LATENCY_SAMPLES else None
+        if delay is None:
+            delay = self.default_delay
+        return min(self.max_delay, max(self.min_delay, delay))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Sample count and p50/p95/p99 latency of every provider."""
+        with self._lock:
+            counts = {provider: len(samples) for provider, samples in self._samples.items()}
+        return {
+            provider: {
+                "count": count,
+                "p50": self.percentile(provider, 50),
+                "p95": self.percentile(provider, 95),
+                "p99": self.percentile(provider, 99),
+            }
+            for provider, count in counts.items()
+        }
+
+
+_tracker: Optional[LatencyTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Return the process-wide latency tracker, creating it from Config on first use."""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            config = Config()
+            _tracker = LatencyTracker(
+                percentile=config.hedge_percentile,
+                default_delay=config.hedge_default_delay,
+                min_delay=config.hedge_min_delay,
+                max_delay=config.hedge_max_delay,
+            )
+        return _tracker
+
+
+def reset_latency_tracker() -> None:
+    """Drop all recorded latencies so the next use re-reads Config."""
+    global _tracker
+    with _tracker_lock:
+        _tracker = None
+
+
+def _start_attempt(name: str, call: Callable[[], T]) -> Future:
+    """Run ``call`` on a daemon thread and return a future for its outcome.
+
+    ``ThreadPoolExecutor`` workers are joined when the interpreter exits, so an
+    abandoned request stuck in a slow provider would delay exit until it times out.
+    Daemon threads are not joined.
+    """
+    future: Future = Future()
+    future.set_running_or_notify_cancel()
+
+    def run() -> None:
+        try:
+            result = call()
+        except BaseException as exception:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+    threading.Thread(target=run, name=f"hedge-{name}", daemon=True).start()
+    return future
+
+
+def hedged_call(
+    attempts: Sequence[Tuple[str, Callable[[], T]]],
+    is_valid: Callable[[Any], bool] = bool,
+    tracker: Optional[LatencyTracker] = None,
+    hedge_delay: Optional[float] = None,
+) -> Tuple[str, T]:
+    """Call providers in order of preference, hedging slow ones with the next provider.
+
+    The first provider starts immediately. The next one starts when the most recently
+    started provider has not answered within its hedge delay, or as soon as any
+    provider fails or returns an invalid result. The first valid result wins; requests
+    still running are abandoned on daemon threads and never delay interpreter exit.
+
+    Args:
+        attempts: (provider name, zero-argument callable) pairs in order of preference
+        is_valid: Predicate deciding whether a result is usable
+        tracker: Latency tracker to read hedge delays from and record latencies to.
+            Defaults to the process-wide tracker.
+        hedge_delay: Fixed hedge delay in seconds, overriding the tracked percentiles
+
+    Returns:
+        Tuple of the winning provider's name and its result
+
+    Raises:
+        ValueError: If no attempts are given
+        AllProvidersFailedError: If every provider failed or returned an invalid result
+
+    """
+    if not attempts:
+        raise ValueError("hedged_call needs at least one provider")
+
+    tracker = tracker if tracker is not None else get_latency_tracker()
+    remaining: List[Tuple[str, Callable[[], T]]] = list(attempts)
+    running: Dict[Future, Tuple[str, float]] = {}
+    failures: Dict[str, str] = {}
+
+    def launch() -> str:
+        name, call = remaining.pop(0)
+        logger.info(f"Trying {name} API")
+        running[_start_attempt(name, call)] = (name, time.monotonic())
+        return name
+
+    newest = launch()
+    while running:
+        timeout = None
+        if remaining:
+            timeout = hedge_delay if hedge_delay is not None else tracker.hedge_delay(newest)
+        done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+
+        if not done:
+            logger.info(f"⏱️  {newest} gave no response within {timeout:.2f}s, hedging with {remaining[0][0]}")
+            newest = launch()
+            continue
+
+        for future in done:
+            name, started = running.pop(future)
+            try:
+                result = future.result()
+            except Exception as exception:
+                failures[name] = str(exception)
+                logger.warning(f"❌ {name} API failed: {exception}")
+            else:
+                tracker.record(name, time.monotonic() - started)
+                if is_valid(result):
+                    return name, result
+                failures[name] = "no valid result"
+                logger.warning(f"⚠️  {name} returned no valid result")
+
+            # Fail over immediately instead of waiting out the hedge delay
+            if remaining:
+                newest = launch()
+
+    raise AllProvidersFailedError(f"All providers failed: {failures}")
@@ -7,11 +7,15 @@ import json
 import logging
 import os
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, Iterable, List, Optional, Set
 
 import numpy as np
 import pandas as pd
 
+from governance_token_analyzer.core.balance_parsing import clean_balances, extract_balance_column
+from governance_token_analyzer.core.balance_sketch import BalanceSketch
+from governance_token_analyzer.core.concentration_engine import calculate_batch_metrics
+from governance_token_analyzer.core.incremental_distribution import BalanceDelta, IncrementalDistribution
 from governance_token_analyzer.core.exceptions import (
     DataAccessError,
     DataFormatError,
@@ -42,6 +46,10 @@ class HistoricalDataManager:
 
         """
         self.data_dir = data_dir
+        # Latest distribution per protocol, so consecutive snapshots only apply balance deltas.
+        # Balances of a full holder list are only indexed once deltas or the distribution are needed.
+        self._distributions: Dict[str, IncrementalDistribution] = {}
+        self._pending_balances: Dict[str, Dict[str, float]] = {}
         try:
             self._ensure_data_dir_exists()
         except OSError as e:
@@ -73,13 +81,35 @@ class HistoricalDataManager:
             logger.warning(f"Unsupported protocol requested: {protocol}")
             raise ProtocolNotSupportedError(protocol, supported_protocols=list(self.SUPPORTED_PROTOCOLS))
 
-    def store_snapshot(self, protocol: str, data: Dict[str, Any], timestamp: Optional[datetime] = None) -> None:
+    def store_snapshot(
+        self,
+        protocol: str,
+        data: Dict[str, Any],
+        timestamp: Optional[datetime] = None,
+        sketch: Optional[BalanceSketch] = None,
+        deltas: Optional[Iterable[BalanceDelta]] = None,
+        record_metrics: Optional[bool] = None,
+    ) -> None:
         """Store a snapshot of token distribution data.
 
+        The protocol's distribution is tracked across snapshots: ``deltas`` update it
+        in O(log n) per changed balance, and a full 'token_holders' list is diffed
+        against it so only the changed balances are applied.
+
+        With ``record_metrics``, the Gini coefficient, Nakamoto coefficient, top-10
+        concentration, total holders and total supply of the tracked distribution are
+        written to the stored snapshot's 'metrics', without overriding metrics the
+        data already contains. It defaults to True for delta snapshots, which carry
+        no holders to measure later, and to False for full holder lists, which are
+        then stored unchanged.
+
         Args:
             protocol: Name of the protocol (e.g., 'compound', 'uniswap', 'aave')
             data: Token distribution data to store
             timestamp: Timestamp for the snapshot (defaults to current time)
+            sketch: Optional balance sketch stored alongside the data under 'balance_sketch'
+            deltas: Optional (address, old_balance, new_balance) changes since the previous snapshot
+            record_metrics: Whether to add the tracked concentration metrics to the stored data
 
         Raises:
             ProtocolNotSupportedError: If the protocol is not supported
@@ -109,6 +139,20 @@ class HistoricalDataManager:
         filename = f"{protocol}_snapshot_{timestamp_str}.json"
         filepath = os.path.join(self.data_dir, protocol, filename)
 
+        # Update the protocol distribution and fill in missing metrics without mutating the caller's data
+        tracked = self._update_distribution(protocol, data, deltas)
+        if record_metrics is None:
+            record_metrics = deltas is not None
+        if tracked and record_metrics:
+            metrics = dict(data["metrics"]) if isinstance(data.get("metrics"), dict) else {}
+            for name, value in self.get_distribution(protocol).metrics().items():
+                metrics.setdefault(name, value)
+            data = {**data, "metrics": metrics}
+
+        # Embed the balance sketch without mutating the caller's data
+        if sketch is not None:
+            data = {**data, "balance_sketch": sketch.to_dict()}
+
         # Add timestamp to data
         data_with_timestamp = {"timestamp": timestamp.isoformat(), "data": data}
 
@@ -121,6 +165,60 @@ class HistoricalDataManager:
             logger.error(f"Failed to store snapshot for {protocol}: {e}")
             raise DataStorageError(f"Failed to store snapshot for {protocol}: {e}") from e
 
+    def _update_distribution(
+        self, protocol: str, data: Dict[str, Any], deltas: Optional[Iterable[BalanceDelta]]
+    ) -> bool:
+        """Bring the tracked distribution of a protocol up to date with a new snapshot.
+
+        Args:
+            protocol: Name of the protocol
+            data: Snapshot data, possibly containing 'token_holders'
+            deltas: Optional balance changes since the previous snapshot
+
+        Returns:
+            True if the snapshot updated the distribution, False if it carries no balances
+
+        Raises:
+            DataFormatError: If the deltas do not match the tracked balances
+
+        """
+        holders = data.get("token_holders")
+        if deltas is None and (not isinstance(holders, list) or not holders):
+            return False
+
+        distribution = self._distributions.get(protocol)
+        if deltas is None and distribution is None:
+            # Nothing is indexed yet, so keep the balances until deltas or metrics need the tree
+            self._pending_balances[protocol] = IncrementalDistribution._holder_balances(holders)
+            return True
+
+        distribution = self.get_distribution(protocol) or IncrementalDistribution()
+        if deltas is None:
+            # Only the balances that changed since the previous full list are applied
+            deltas = distribution.diff(holders)
+        try:
+            distribution.apply_deltas(deltas)
+        except ValueError as e:
+            logger.error(f"Invalid balance deltas for {protocol}: {e}")
+            raise DataFormatError(f"Invalid balance deltas for {protocol}: {e}") from e
+        self._distributions[protocol] = distribution
+        return True
+
+    def get_distribution(self, protocol: str) -> Optional[IncrementalDistribution]:
+        """Return the incrementally maintained distribution of a protocol, if any.
+
+        Args:
+            protocol: Name of the protocol
+
+        Returns:
+            IncrementalDistribution for the most recently stored snapshot, or None
+
+        """
+        balances = self._pending_balances.pop(protocol, None)
+        if balances is not None:
+            self._distributions[protocol] = IncrementalDistribution(balances)
+        return self._distributions.get(protocol)
+
     def get_snapshots(
         self,
         protocol: str,
@@ -348,6 +446,31 @@ class HistoricalDataManager:
             logger.error(f"Failed to load snapshot for {protocol} at {timestamp}: {e}")
             raise DataAccessError(f"Failed to load snapshot for {protocol} at {timestamp}: {e}") from e
 
+    def load_sketch(self, protocol: str, timestamp: str) -> Optional[BalanceSketch]:
+        """Load the balance sketch stored with a specific snapshot.
+
+        Args:
+            protocol: Name of the protocol
+            timestamp: ISO format timestamp of the snapshot
+
+        Returns:
+            BalanceSketch or None if the snapshot has no stored sketch
+
+        Raises:
+            ProtocolNotSupportedError: If the protocol is not supported
+            DataAccessError: If there's an issue accessing the data
+
+        """
+        data = self.load_snapshot(protocol, timestamp)
+        if not data or "balance_sketch" not in data:
+            return None
+
+        try:
+            return BalanceSketch.from_dict(data["balance_sketch"])
+        except (TypeError, ValueError) as e:
+            logger.error(f"Invalid balance sketch in {protocol} snapshot at {timestamp}: {e}")
+            raise DataFormatError(f"Invalid balance sketch in {protocol} snapshot at {timestamp}: {e}") from e
+
     def get_snapshot_by_date(self, protocol: str, date_str: str) -> Optional[Dict[str, Any]]:
         """Retrieve a snapshot for a specific date.
 
@@ -539,6 +662,8 @@ def analyze_concentration_trends(snapshots: List[Dict[str, Any]], top_n_holders:
     try:
         # Extract timestamps and concentration metrics
         data = []
+        pending_rows = []
+        pending_balances = []
 
         for snapshot in snapshots:
             # Validate snapshot format
@@ -563,6 +688,15 @@ def analyze_concentration_trends(snapshots: List[Dict[str, Any]], top_n_holders:
             top_n_concentration = metrics.get(f"top_{top_n_holders}_concentration")
             gini = metrics.get("gini_coefficient")
 
+            # Queue snapshots without precomputed metrics for one batched calculation
+            holders = snapshot["data"].get("token_holders")
+            if (top_n_concentration is None or gini is None) and isinstance(holders, list) and holders:
+                pending_rows.append(len(data))
+                balances, rejected = clean_balances(extract_balance_column(holders, ("balance",)))
+                if rejected:
+                    logger.warning(f"Ignored {rejected} unparseable holder balances in snapshot {timestamp}")
+                pending_balances.append(balances)
+
             data.append(
                 {
                     "timestamp": timestamp,
@@ -571,6 +705,13 @@ def analyze_concentration_trends(snapshots: List[Dict[str, Any]], top_n_holders:
                 }
             )
 
+        if pending_rows:
+            batch = calculate_batch_metrics(pending_balances, top_n=top_n_holders)
+            for position, row in enumerate(pending_rows):
+                for column in (f"top_{top_n_holders}_concentration", "gini_coefficient"):
+                    if data[row][column] is None:
+                        data[row][column] = float(batch[column][position])
+
         # Convert to DataFrame
         df = pd.DataFrame(data)
 
@@ -714,76 +855,66 @@ def simulate_historical_data(
         end_date = datetime.now()
         start_date = end_date - timedelta(days=num_snapshots * interval_days)
 
+        # Simulate token holders (100 addresses with different balances)
+        num_holders = 100
+        addresses = [f"0x{j:040x}" for j in range(num_holders)]
+        total_supply = 10_000_000
+
+        # First pass: draw every snapshot into one (snapshots x holders) balance matrix
+        timestamps = []
+        time_factors = np.empty(num_snapshots)
+        balance_matrix = np.empty((num_snapshots, num_holders))
+        participation_rates = np.empty(num_snapshots)
+        proposal_counts = []
+
         for i in range(num_snapshots):
             # Calculate timestamp for this snapshot
-            timestamp = start_date + timedelta(days=i * interval_days)
-
-            # Simulate token holders (100 addresses with different balances)
-            num_holders = 100
-            addresses = [f"0x{j:040x}" for j in range(num_holders)]
+            timestamps.append(start_date + timedelta(days=i * interval_days))
 
             # Create power law distribution for token balances
             # Exponent between 1.5 and 2.5 (realistic for crypto)
             exponent = np.random.uniform(1.5, 2.5)
             raw_balances = np.random.pareto(exponent, num_holders)
 
-            # Normalize to a total supply of 10 million tokens
-            total_supply = 10_000_000
-            balances = raw_balances / raw_balances.sum() * total_supply
+            # Normalize to a total supply of 10 million tokens and add some
+            # time-based variation to make trends
+            time_factors[i] = 1.0 + 0.05 * np.sin(i / 3)  # Small sinusoidal variation
+            balance_matrix[i] = raw_balances / raw_balances.sum() * total_supply * time_factors[i]
+
+            # Governance participation (simulated)
+            participation_rates[i] = np.random.uniform(0.1, 0.5)  # 10-50% participation
+            proposal_counts.append(np.random.randint(1, 10))
 
-            # Add some time-based variation to make trends
-            time_factor = 1.0 + 0.05 * np.sin(i / 3)  # Small sinusoidal variation
-            balances = balances * time_factor
+        # Second pass: all concentration metrics in one batched call. Shares are
+        # reported against the nominal supply, so the 51% target is rescaled per
+        # snapshot by its time factor.
+        batch = calculate_batch_metrics(balance_matrix, threshold=51.0 / time_factors, strict=True, top_n=10)
+        top_10_concentrations = batch["top_10_concentration"] * time_factors
 
+        for i, timestamp in enumerate(timestamps):
             # Sort by balance (descending)
-            holder_data = sorted(zip(addresses, balances), key=lambda x: x[1], reverse=True)
-
-            # Create token holder list
-            token_holders = []
-            for address, balance in holder_data:
-                percentage = balance / total_supply * 100
-                token_holders.append(
-                    {
-                        "address": address,
-                        "balance": float(balance),
-                        "percentage": float(percentage),
-                    }
-                )
-
-            # Calculate metrics
-            # Gini coefficient (higher means more concentration)
-            balances_array = np.array([h["balance"] for h in token_holders])
-            balances_sorted = np.sort(balances_array)
-            indices = np.arange(1, len(balances_array) + 1)
-            n = len(balances_array)
-            gini = (2 * np.sum(indices * balances_sorted)) / (n * np.sum(balances_array)) - (n + 1) / n
-
-            # Top 10 concentration
-            top_10_concentration = sum(h["percentage"] for h in token_holders[:10])
-
-            # Nakamoto coefficient (number of addresses needed to reach 51%)
-            cum_percent = 0
-            nakamoto = 0
-            for holder in token_holders:
-                cum_percent += holder["percentage"]
-                nakamoto += 1
-                if cum_percent > 51:
-                    break
+            order = np.argsort(-balance_matrix[i], kind="stable")
+            percentages = balance_matrix[i] / total_supply * 100
 
-            # Governance participation (simulated)
-            participation_rate = np.random.uniform(0.1, 0.5)  # 10-50% participation
-            active_voter_count = int(num_holders * participation_rate)
+            token_holders = [
+                {
+                    "address": addresses[j],
+                    "balance": float(balance_matrix[i, j]),
+                    "percentage": float(percentages[j]),
+                }
+                for j in order
+            ]
 
             # Create snapshot data
             data = {
                 "token_holders": token_holders,
                 "metrics": {
-                    "gini_coefficient": float(gini),
-                    "top_10_concentration": float(top_10_concentration),
-                    "nakamoto_coefficient": nakamoto,
-                    "governance_participation_rate": float(participation_rate),
-                    "active_voter_count": active_voter_count,
-                    "active_proposal_count": np.random.randint(1, 10),
+                    "gini_coefficient": float(batch["gini_coefficient"][i]),
+                    "top_10_concentration": float(top_10_concentrations[i]),
+                    "nakamoto_coefficient": int(batch["nakamoto_coefficient"][i]),
+                    "governance_participation_rate": float(participation_rates[i]),
+                    "active_voter_count": int(num_holders * participation_rates[i]),
+                    "active_proposal_count": proposal_counts[i],
                 },
             }
 
@@ -0,0 +1,270 @@
+"""Persistent HTTP Response Cache for Provider Calls.
+
+Every ``gova`` run asks Etherscan, The Graph and Moralis for the same holders,
+proposals and votes. This module stores successful JSON responses in a local SQLite
+file keyed by a digest of the request (method, URL, query parameters or GraphQL query
+plus variables), so repeated runs are served locally.
+
+Each entry carries the TTL of its endpoint; entries without an expiry, such as the votes
+of closed proposals, never go stale. The file is bounded in size by evicting the least
+recently used entries. In offline mode stale entries are still served and a miss raises
+OfflineCacheMissError instead of touching the network.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .config import Config
+from .exceptions import OfflineCacheMissError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 3600.0
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# TTL meaning "never expires", e.g. for votes on proposals whose voting has closed
+NEVER_EXPIRES = math.inf
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    body TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+class HTTPResponseCache:
+    """SQLite-backed cache of decoded JSON responses with per-endpoint TTLs."""
+
+    def __init__(
+        self,
+        path: str,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        offline: bool = False,
+    ):
+        """Open or create the cache file.
+
+        Args:
+            path: SQLite file path, or ":memory:" for a throwaway cache
+            ttls: Seconds to keep responses per endpoint name, e.g. {"graph:votes": 3600}.
+                An endpoint "a:b" without its own TTL uses the TTL of "a".
+            default_ttl: Seconds to keep responses of endpoints without a TTL
+            max_bytes: Upper bound on the total size of stored response bodies
+            offline: Serve only from the cache, including stale entries
+
+        Raises:
+            ValueError: If max_bytes is not positive
+
+        """
+        if max_bytes < 1:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+
+        if path != ":memory:":
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.executescript(_SCHEMA)
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict[str, Any]] = None, body: Any = None) -> str:
+        """Build the cache key for a request.
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            params: Query string parameters
+            body: JSON request body, e.g. a GraphQL query with its variables
+
+        Returns:
+            Hex cache key
+
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(method.upper().encode())
+        digest.update(url.encode())
+        digest.update(json.dumps(params or {}, sort_keys=True, default=str).encode())
+        digest.update(json.dumps(body, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def ttl_for(self, endpoint: str) -> float:
+        """TTL in seconds for an endpoint, falling back from "a:b" to "a" to the default."""
+        if endpoint in self.ttls:
+            return self.ttls[endpoint]
+        family = endpoint.split(":", 1)[0]
+        return self.ttls.get(family, self.default_ttl)
+
+    def get(self, key: str) -> Any:
+        """Look up a response.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            The decoded response, or None on a miss or if it has expired (unless offline)
+
+        Raises:
+            OfflineCacheMissError: If offline and nothing is cached under the key
+
+        """
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute("SELECT body, expires FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and (self.offline or row[1] is None or row[1] > now):
+                self._connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+                self.hits += 1
+                return json.loads(row[0])
+            self.misses += 1
+
+        if self.offline:
+            raise OfflineCacheMissError(f"Offline mode: no cached response for request {key}")
+        return None
+
+    def put(self, key: str, endpoint: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a response, then evict the least recently used entries beyond the size bound.
+
+        Args:
+            key: Cache key from make_key
+            endpoint: Endpoint name used for TTL lookup and statistics
+            value: JSON-serializable response
+            ttl: Seconds to keep the response, NEVER_EXPIRES, or None for the endpoint TTL
+
+        """
+        ttl = self.ttl_for(endpoint) if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        try:
+            body = json.dumps(value)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Not caching unserializable response for {endpoint}: {e}")
+            return
+
+        now = time.time()
+        expires = None if math.isinf(ttl) else now + ttl
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, endpoint, body, len(body), now, expires, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete expired entries and then the least recently used ones until under max_bytes."""
+        if not self.offline:
+            self._connection.execute("DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?", (time.time(),))
+
+        total = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        victims = []
+        for key, size in self._connection.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._connection.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the statistics."""
+        with self._lock:
+            self._connection.execute("DELETE FROM responses")
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counts and the number and size of stored responses."""
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+        entries, size = row
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size, "offline": self.offline}
+
+
+_default_cache: Optional[HTTPResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def _cache_from_config(config: Config) -> HTTPResponseCache:
+    """Build a response cache from the configured path, TTLs, size bound and offline flag."""
+    return HTTPResponseCache(
+        config.http_cache_path,
+        ttls=config.http_cache_ttls,
+        max_bytes=config.http_cache_max_bytes,
+        offline=config.offline,
+    )
+
+
+def get_http_cache() -> Optional[HTTPResponseCache]:
+    """Shared process-wide response cache configured from Config.
+
+    Returns:
+        HTTPResponseCache, or None if response caching is disabled
+
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            config = Config()
+            if not config.http_cache_enabled and not config.offline:
+                return None
+            _default_cache = _cache_from_config(config)
+        return _default_cache
+
+
+def configure_http_cache(cache: Optional[HTTPResponseCache]) -> None:
+    """Replace the shared response cache, or pass None to re-read Config on next use.
+
+    Args:
+        cache: Cache to use for every client in the process
+
+    """
+    global _default_cache
+    with _default_cache_lock:
+        _default_cache = cache
+
+
+def set_offline_mode(offline: bool = True) -> Optional[HTTPResponseCache]:
+    """Switch the shared cache into or out of offline mode.
+
+    Offline mode works even if response caching is otherwise disabled.
+
+    Args:
+        offline: Whether to serve only from the cache
+
+    Returns:
+        The shared cache, or None if caching is disabled and offline is False
+
+    """
+    cache = get_http_cache()
+    if cache is None and offline:
+        cache = _cache_from_config(Config())
+        configure_http_cache(cache)
+    if cache is not None:
+        cache.offline = offline
+    return cache
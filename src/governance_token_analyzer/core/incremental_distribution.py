@@ -0,0 +1,537 @@
+"""Incremental Token Distribution for Delta-Based Metric Updates.
+
+This module maintains a token distribution under a stream of balance changes
+(address, old_balance, new_balance) so that Gini, top-N share and Nakamoto
+coefficient can be updated in O(log n) per change instead of re-sorting every
+balance for each snapshot.
+
+Distinct balances are kept in a treap, a binary search tree balanced by random
+node priorities, whose nodes also hold the holder count and balance sum of their
+subtree. A balance that has not been seen before is inserted in O(log n) like
+any other, and rank queries (holders and balance below a value, the k smallest
+balances, the Nakamoto split) descend the tree once. The rank-weighted sum used
+by the Gini formula is maintained directly: inserting a value v at rank r adds
+r * v plus the balance of every holder above it, removing it subtracts the same
+amount.
+
+The running sums are floating point, so they drift after many additions and
+removals, badly so when a large balance comes and goes next to small ones. Each
+update adds to a bound on the accumulated rounding error; once that bound exceeds
+RESYNC_TOLERANCE of the sums, or after as many updates as there are holders (at
+least MIN_RESYNC_INTERVAL), the tree and the sums are rebuilt exactly from the
+tracked balances.
+"""
+
+import logging
+import math
+import random
+import sys
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from governance_token_analyzer.core.concentration_engine import ConcentrationEngine
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+BalanceDelta = Tuple[str, float, float]
+
+# Fewest balance updates between two scheduled rebuilds of the running sums
+MIN_RESYNC_INTERVAL = 4096
+# Relative rounding error of the running sums that triggers an early rebuild
+RESYNC_TOLERANCE = 1e-9
+_EPSILON = sys.float_info.epsilon
+
+
+class _ValueTree:
+    """Treap of distinct positive balances with subtree holder counts and balance sums.
+
+    Nodes are indices into parallel lists; index 0 is the empty sentinel. The lists
+    avoid one Python object per node, which matters for millions of holders.
+    """
+
+    def __init__(self, values: np.ndarray, counts: np.ndarray, rng: random.Random):
+        """Build a balanced tree in O(n) from sorted distinct values and their holder counts.
+
+        Args:
+            values: Distinct balances in ascending order
+            counts: Number of holders with each balance
+            rng: Random source of the node priorities
+
+        """
+        size = int(values.size)
+        self._random = rng
+        left = np.zeros(size + 1, dtype=np.int64)
+        right = np.zeros(size + 1, dtype=np.int64)
+        subtree_low = np.zeros(size + 1, dtype=np.int64)
+        subtree_high = np.zeros(size + 1, dtype=np.int64)
+
+        # Lay the sorted values out as a perfectly balanced tree, one level at a time
+        levels = []
+        low, high = np.array([0] * bool(size), dtype=np.int64), np.array([size] * bool(size), dtype=np.int64)
+        while low.size:
+            middle = (low + high) // 2
+            levels.append(middle + 1)
+            subtree_low[middle + 1], subtree_high[middle + 1] = low, high
+            has_left, has_right = low < middle, middle + 1 < high
+            left[middle[has_left] + 1] = (low[has_left] + middle[has_left]) // 2 + 1
+            right[middle[has_right] + 1] = (middle[has_right] + 1 + high[has_right]) // 2 + 1
+            low = np.concatenate((low[has_left], middle[has_right] + 1))
+            high = np.concatenate((middle[has_left], high[has_right]))
+
+        # Priorities decrease level by level, so the balanced layout is a valid treap
+        priority = np.zeros(size + 1, dtype=np.float64)
+        if size:
+            priority[np.concatenate(levels)] = np.sort(np.random.default_rng(rng.getrandbits(64)).random(size))[::-1]
+
+        count_prefix = np.concatenate(([0], np.cumsum(counts)))
+        sum_prefix = np.concatenate(([0.0], np.cumsum(counts * values)))
+
+        self.root = (size // 2 + 1) if size else 0
+        self.key: List[float] = [0.0] + values.tolist()
+        self.count: List[int] = [0] + counts.tolist()
+        self.size: List[int] = (count_prefix[subtree_high] - count_prefix[subtree_low]).tolist()
+        self.total: List[float] = (sum_prefix[subtree_high] - sum_prefix[subtree_low]).tolist()
+        self.priority: List[float] = priority.tolist()
+        self.left: List[int] = left.tolist()
+        self.right: List[int] = right.tolist()
+        self._free: List[int] = []
+
+    def _pull(self, node: int) -> None:
+        """Recompute a node's subtree totals from its children."""
+        left, right = self.left[node], self.right[node]
+        count = self.count[node]
+        self.size[node] = self.size[left] + self.size[right] + count
+        self.total[node] = self.total[left] + self.total[right] + count * self.key[node]
+
+    def _new_node(self, value: float) -> int:
+        """Allocate a node holding one holder with the given balance."""
+        priority = self._random.random()
+        if self._free:
+            node = self._free.pop()
+            self.key[node], self.count[node], self.priority[node] = value, 1, priority
+            self.left[node] = self.right[node] = 0
+        else:
+            node = len(self.key)
+            for column, initial in (
+                (self.key, value),
+                (self.count, 1),
+                (self.size, 0),
+                (self.total, 0.0),
+                (self.priority, priority),
+                (self.left, 0),
+                (self.right, 0),
+            ):
+                column.append(initial)
+        self._pull(node)
+        return node
+
+    def _split(self, node: int, value: float) -> Tuple[int, int]:
+        """Split a subtree into the nodes below ``value`` and the nodes above it."""
+        if not node:
+            return 0, 0
+        if self.key[node] < value:
+            below, above = self._split(self.right[node], value)
+            self.right[node] = below
+            self._pull(node)
+            return node, above
+        below, above = self._split(self.left[node], value)
+        self.left[node] = above
+        self._pull(node)
+        return below, node
+
+    def _merge(self, low: int, high: int) -> int:
+        """Join two subtrees whose values are all smaller in ``low`` than in ``high``."""
+        if not low or not high:
+            return low or high
+        if self.priority[low] > self.priority[high]:
+            self.right[low] = self._merge(self.right[low], high)
+            self._pull(low)
+            return low
+        self.left[high] = self._merge(low, self.left[high])
+        self._pull(high)
+        return high
+
+    def _insert(self, node: int, new: int) -> int:
+        """Insert a new node below ``node`` and return the subtree's root."""
+        if not node:
+            return new
+        if self.priority[new] > self.priority[node]:
+            self.left[new], self.right[new] = self._split(node, self.key[new])
+            self._pull(new)
+            return new
+        if self.key[new] < self.key[node]:
+            self.left[node] = self._insert(self.left[node], new)
+        else:
+            self.right[node] = self._insert(self.right[node], new)
+        self._pull(node)
+        return node
+
+    def _erase(self, node: int, value: float) -> int:
+        """Remove the node holding ``value`` below ``node`` and return the subtree's root."""
+        if self.key[node] == value:
+            self._free.append(node)
+            return self._merge(self.left[node], self.right[node])
+        if value < self.key[node]:
+            self.left[node] = self._erase(self.left[node], value)
+        else:
+            self.right[node] = self._erase(self.right[node], value)
+        self._pull(node)
+        return node
+
+    def rank(self, value: float) -> Tuple[int, float, int]:
+        """Count the holders and balance at or below a value.
+
+        Args:
+            value: Balance to rank
+
+        Returns:
+            Tuple of the number of holders with a balance <= value, their balance sum,
+            and the node holding the value (0 if no holder has it)
+
+        """
+        node, holders, balance = self.root, 0, 0.0
+        while node:
+            key = self.key[node]
+            if value < key:
+                node = self.left[node]
+                continue
+            left = self.left[node]
+            holders += self.size[left] + self.count[node]
+            balance += self.total[left] + self.count[node] * key
+            if value == key:
+                return holders, balance, node
+            node = self.right[node]
+        return holders, balance, 0
+
+    def add(self, value: float, delta: int, node: int) -> None:
+        """Change the number of holders with a balance by one.
+
+        Args:
+            value: Positive balance
+            delta: +1 to add a holder, -1 to remove one
+            node: Node holding the value as returned by rank, or 0 if there is none
+
+        """
+        if not node:
+            self.root = self._insert(self.root, self._new_node(value))
+        elif self.count[node] + delta == 0:
+            self.count[node] = 0
+            self.root = self._erase(self.root, value)
+        else:
+            self.count[node] += delta
+            # Update the subtree totals on the path from the root down to the node
+            current = self.root
+            while True:
+                self.size[current] += delta
+                self.total[current] += delta * value
+                if current == node:
+                    break
+                current = self.left[current] if value < self.key[current] else self.right[current]
+
+    def bottom_sum(self, count: int) -> float:
+        """Sum the ``count`` smallest balances."""
+        node, balance = self.root, 0.0
+        while node and count > 0:
+            left = self.left[node]
+            if self.size[left] >= count:
+                node = left
+                continue
+            balance += self.total[left]
+            count -= self.size[left]
+            taken = min(count, self.count[node])
+            balance += taken * self.key[node]
+            count -= taken
+            node = self.right[node]
+        return balance
+
+    def holders_within(self, remainder: float, strict: bool) -> int:
+        """Count the most of the smallest balances that together stay within a remainder.
+
+        Args:
+            remainder: Balance the bottom holders may hold in total
+            strict: Require the bottom holders to stay strictly below the remainder
+
+        Returns:
+            Number of bottom holders
+
+        """
+
+        def fits(amount: float) -> bool:
+            return amount < remainder or (not strict and amount <= remainder)
+
+        node, holders, balance = self.root, 0, 0.0
+        while node:
+            left = self.left[node]
+            candidate = balance + self.total[left]
+            if not fits(candidate):
+                node = left
+                continue
+            holders += self.size[left]
+            balance = candidate
+
+            value, count = self.key[node], self.count[node]
+            if fits(balance + count * value):
+                holders += count
+                balance += count * value
+                node = self.right[node]
+                continue
+
+            # Part of this value's holders may still fit below the remainder
+            room = (remainder - balance) / value
+            extra = math.ceil(room) - 1 if strict else math.floor(room)
+            return holders + min(max(extra, 0), count)
+        return holders
+
+
+class IncrementalDistribution:
+    """Token distribution that supports O(log n) balance updates.
+
+    Only positive balances are part of the distribution; an address whose balance
+    drops to zero (or below) leaves it.
+    """
+
+    def __init__(self, balances: Optional[Mapping[str, float]] = None, seed: Optional[int] = None):
+        """Initialize the distribution.
+
+        Args:
+            balances: Optional mapping of address to balance
+            seed: Optional seed of the tree's random balancing, for reproducible layouts
+
+        """
+        self.balances: Dict[str, float] = {
+            address: float(balance) for address, balance in (balances or {}).items() if float(balance) > 0
+        }
+        self._random = random.Random(seed)
+        self.resync()
+
+    def resync(self) -> None:
+        """Rebuild the tree and the running sums exactly from the tracked balances in O(n)."""
+        current = np.fromiter(self.balances.values(), dtype=np.float64, count=len(self.balances))
+        values, counts = np.unique(current, return_counts=True)
+        self._tree = _ValueTree(values, counts, self._random)
+
+        ordered = np.repeat(values, counts)
+        self._n = int(ordered.size)
+        self._total = float(ordered.sum())
+        self._weighted = float(np.dot(np.arange(1, self._n + 1, dtype=np.float64), ordered))
+        self._updates_since_resync = 0
+        self._total_error = 0.0
+        self._weighted_error = 0.0
+
+    @classmethod
+    def from_holders(cls, holders: Sequence[Dict[str, Any]]) -> "IncrementalDistribution":
+        """Create a distribution from a list of token holder dictionaries.
+
+        Args:
+            holders: List of dictionaries with 'address' and 'balance' keys
+
+        Returns:
+            IncrementalDistribution instance
+
+        """
+        return cls(cls._holder_balances(holders))
+
+    @staticmethod
+    def _holder_balances(holders: Sequence[Dict[str, Any]]) -> Dict[str, float]:
+        """Map holder addresses to their balances."""
+        balances = {}
+        for holder in holders:
+            if not isinstance(holder, dict) or "address" not in holder:
+                continue
+            try:
+                balances[holder["address"]] = float(holder.get("balance", 0) or 0)
+            except (TypeError, ValueError):
+                continue
+        return balances
+
+    @property
+    def n(self) -> int:
+        """Number of holders with a positive balance."""
+        return self._n
+
+    @property
+    def total(self) -> float:
+        """Sum of all positive balances."""
+        return self._total
+
+    def _insert(self, value: float) -> None:
+        """Add one holder with the given positive balance."""
+        count_at_or_below, sum_at_or_below, node = self._tree.rank(value)
+        sum_above = self._total - sum_at_or_below
+
+        # The new holder is ranked after all equal balances, shifting everyone above by one
+        change = (count_at_or_below + 1) * value + sum_above
+        self._track_rounding(value, change)
+        self._weighted += change
+        self._tree.add(value, 1, node)
+        self._n += 1
+        self._total += value
+
+    def _remove(self, value: float) -> None:
+        """Remove one holder with the given positive balance."""
+        count_at_or_below, sum_at_or_below, node = self._tree.rank(value)
+        sum_above = self._total - sum_at_or_below
+
+        change = count_at_or_below * value + sum_above
+        self._track_rounding(value, change)
+        self._weighted -= change
+        self._tree.add(value, -1, node)
+        self._n -= 1
+        self._total -= value
+
+    def _track_rounding(self, value: float, change: float) -> None:
+        """Add the worst-case rounding error of one update to the error bounds."""
+        self._total_error += _EPSILON * (self._total + value)
+        self._weighted_error += _EPSILON * (abs(self._weighted) + change)
+
+    def apply_deltas(self, deltas: Iterable[BalanceDelta]) -> "IncrementalDistribution":
+        """Apply a batch of balance changes.
+
+        The whole batch is validated before any change is applied, so a rejected
+        batch leaves the distribution untouched.
+
+        Args:
+            deltas: Iterable of (address, old_balance, new_balance) tuples
+
+        Returns:
+            The distribution itself, to allow chaining
+
+        Raises:
+            ValueError: If an old balance does not match the tracked balance
+
+        """
+        changes = []
+        pending: Dict[str, float] = {}
+        for address, old_balance, new_balance in deltas:
+            old_balance = float(old_balance)
+            new_balance = float(new_balance)
+            tracked = pending.get(address, self.balances.get(address, 0.0))
+            if not math.isclose(tracked, max(old_balance, 0.0), rel_tol=1e-9, abs_tol=1e-12):
+                raise ValueError(f"Old balance {old_balance} for {address} does not match tracked balance {tracked}")
+            changes.append((address, tracked, new_balance))
+            pending[address] = max(new_balance, 0.0)
+
+        for address, old_balance, new_balance in changes:
+            if old_balance > 0:
+                self._remove(old_balance)
+            if new_balance > 0:
+                self._insert(new_balance)
+                self.balances[address] = new_balance
+            else:
+                self.balances.pop(address, None)
+
+        self._updates_since_resync += len(changes)
+        if (
+            self._updates_since_resync >= max(self._n, MIN_RESYNC_INTERVAL)
+            or self._total_error > RESYNC_TOLERANCE * self._total
+            or self._weighted_error > RESYNC_TOLERANCE * self._weighted
+        ):
+            self.resync()
+        return self
+
+    def update(self, address: str, new_balance: float) -> "IncrementalDistribution":
+        """Set the balance of a single address.
+
+        Args:
+            address: Holder address
+            new_balance: New balance of the address
+
+        Returns:
+            The distribution itself, to allow chaining
+
+        """
+        return self.apply_deltas([(address, self.balances.get(address, 0.0), new_balance)])
+
+    def diff(self, holders: Sequence[Dict[str, Any]]) -> List[BalanceDelta]:
+        """Compute the deltas that turn this distribution into the given holder list.
+
+        Args:
+            holders: List of dictionaries with 'address' and 'balance' keys
+
+        Returns:
+            List of (address, old_balance, new_balance) tuples for changed addresses
+
+        """
+        target = {address: balance for address, balance in self._holder_balances(holders).items() if balance > 0}
+        deltas = [
+            (address, self.balances.get(address, 0.0), balance)
+            for address, balance in target.items()
+            if self.balances.get(address) != balance
+        ]
+        deltas.extend((address, balance, 0.0) for address, balance in self.balances.items() if address not in target)
+        return deltas
+
+    def gini_coefficient(self) -> float:
+        """Calculate the Gini coefficient from the maintained rank-weighted sum.
+
+        Returns:
+            Gini coefficient as a float between 0 and 1
+
+        """
+        if self._n == 0 or self._total <= 0:
+            return 0.0
+
+        gini = (2 * self._weighted) / (self._n * self._total) - (self._n + 1) / self._n
+        return max(0.0, min(1.0, gini))
+
+    def bottom_sum(self, count: int) -> float:
+        """Sum the ``count`` smallest balances."""
+        return self._tree.bottom_sum(min(max(count, 0), self._n))
+
+    def top_sum(self, count: int) -> float:
+        """Sum the ``count`` largest balances."""
+        count = min(max(count, 0), self._n)
+        return self._total - self.bottom_sum(self._n - count)
+
+    def top_n_concentration(self, count: int = 10) -> float:
+        """Calculate the percentage of the supply held by the ``count`` largest holders."""
+        if self._n == 0 or self._total <= 0:
+            return 0.0
+        return self.top_sum(count) / self._total * 100
+
+    def nakamoto_coefficient(self, threshold: float = 51.0, strict: bool = False) -> int:
+        """Calculate the minimum number of holders controlling ``threshold`` percent.
+
+        Args:
+            threshold: Control threshold percentage (default: 51%)
+            strict: Require the share to exceed the threshold rather than reach it
+
+        Returns:
+            Nakamoto coefficient as an integer
+
+        """
+        if self._n == 0 or self._total <= 0:
+            return 0
+
+        # The top k reach the target exactly when the bottom n - k stay within the remainder
+        remainder = self._total - self._total * threshold / 100
+        holders = self._tree.holders_within(remainder, strict)
+        return min(max(self._n - holders, 1), self._n)
+
+    def to_engine(self) -> ConcentrationEngine:
+        """Materialize the distribution as a ConcentrationEngine for the remaining metrics."""
+        return ConcentrationEngine(np.fromiter(self.balances.values(), dtype=np.float64, count=len(self.balances)))
+
+    def lorenz_curve(self, resolution: Optional[int] = None) -> Dict[str, List[float]]:
+        """Calculate the Lorenz curve coordinates of the current distribution."""
+        return self.to_engine().lorenz_curve(resolution)
+
+    def metrics(self, top_n: int = 10) -> Dict[str, Any]:
+        """Return the incrementally maintained metrics.
+
+        Args:
+            top_n: Number of top holders for the top-N concentration
+
+        Returns:
+            Dictionary of metric names to values
+
+        """
+        return {
+            "gini_coefficient": self.gini_coefficient(),
+            "nakamoto_coefficient": self.nakamoto_coefficient(),
+            f"top_{top_n}_concentration": self.top_n_concentration(top_n),
+            "total_holders": self._n,
+            "total_supply": self._total,
+        }
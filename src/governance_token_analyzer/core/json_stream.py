@@ -0,0 +1,233 @@
+"""Incremental JSON Decoding of Provider Responses.
+
+``response.json()`` keeps the raw body, the decoded tree and whatever the caller
+builds from it in memory at the same time. For 1000-vote Graph pages with long
+``reason`` texts and for large holder lists, this module instead decodes a body
+chunk by chunk as ``response.iter_content`` delivers it and yields the elements of
+one array in the document, e.g. ``data.votes`` or ``result``, as soon as each is
+complete. Only the element being decoded and the unread part of the current chunk
+are held at once.
+
+Values are decoded with ``json.JSONDecoder.raw_decode``, so no streaming parser
+package is needed. Sibling members on the way to the array are decoded whole and
+discarded, which suits provider responses whose only large member is the array.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, Optional, Sequence, Union
+
+import requests
+
+from .exceptions import DataAccessError
+
+# Bytes requested from the socket per read
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+
+
+class _ChunkReader:
+    """Text buffer over a chunk iterator that decodes one JSON value or token at a time."""
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]]):
+        """Initialize an empty buffer.
+
+        Args:
+            chunks: Pieces of a JSON document, as bytes (UTF-8) or text
+
+        """
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping text already consumed.
+
+        Returns:
+            False if the input is exhausted
+
+        """
+        if self._eof:
+            return False
+        self._buffer = self._buffer[self._pos :]
+        self._pos = 0
+        for chunk in self._chunks:
+            text = self._utf8.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self._buffer += text
+                return True
+        self._buffer += self._utf8.decode(b"", final=True)
+        self._eof = True
+        return False
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it, or '' at the end of input."""
+        while True:
+            match = _NON_WHITESPACE.search(self._buffer, self._pos)
+            if match is not None:
+                self._pos = match.start()
+                return self._buffer[self._pos]
+            self._pos = len(self._buffer)
+            if not self._fill():
+                return ""
+
+    def skip(self) -> None:
+        """Consume the character returned by peek."""
+        self._pos += 1
+
+    def expect(self, char: str) -> None:
+        """Consume a structural character.
+
+        Raises:
+            DataAccessError: If the next character is a different one
+
+        """
+        found = self.peek()
+        if found != char:
+            raise DataAccessError(f"Malformed JSON response: expected {char!r}, found {found or 'end of input'!r}")
+        self.skip()
+
+    def decode(self) -> Any:
+        """Decode the next complete value, reading more chunks until it is available.
+
+        Raises:
+            DataAccessError: If the input ends or is not valid JSON
+
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as exception:
+                if self._fill():
+                    continue
+                raise DataAccessError(f"Malformed JSON response: {exception}") from exception
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and isinstance(value, (int, float)) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+
+def _seek_member(reader: _ChunkReader, key: Optional[str], error_key: Optional[str]) -> bool:
+    """Consume the members of an opened object up to the value of ``key``.
+
+    Args:
+        reader: Reader positioned inside the object
+        key: Member to stop at, or None to consume the whole object
+        error_key: Member that means the provider reported errors, or None
+
+    Returns:
+        True if positioned at the member's value, False if the object was closed first
+
+    Raises:
+        DataAccessError: If the error member is present or the input is malformed
+
+    """
+    while True:
+        char = reader.peek()
+        if char == "}":
+            reader.skip()
+            return False
+        if char == ",":
+            reader.skip()
+            continue
+        name = reader.decode()
+        reader.expect(":")
+        if name == key:
+            return True
+        value = reader.decode()
+        if error_key is not None and name == error_key:
+            raise DataAccessError(f"Provider reported errors: {value}")
+
+
+def iter_json_array(
+    chunks: Iterable[Union[bytes, str]], path: Sequence[str], error_key: Optional[str] = None
+) -> Iterator[Any]:
+    """Yield the elements of the array at ``path`` of a JSON document as they are decoded.
+
+    Args:
+        chunks: Pieces of the document, as bytes (UTF-8) or text
+        path: Object keys leading to the array, e.g. ('data', 'votes')
+        error_key: Top-level member that means the provider reported errors, e.g. 'errors'
+
+    Yields:
+        Decoded array elements, in order. Nothing if the path is missing or null.
+
+    Raises:
+        DataAccessError: If the document reports errors, holds something other than an
+            array at ``path`` or is malformed. Errors reported after the array are raised
+            once its elements have been yielded.
+
+    """
+    reader = _ChunkReader(chunks)
+    depth = 0
+    found = True
+    for key in path:
+        if reader.peek() != "{":
+            reader.decode()
+            found = False
+            break
+        reader.skip()
+        depth += 1
+        if not _seek_member(reader, key, error_key if depth == 1 else None):
+            depth -= 1
+            found = False
+            break
+
+    if found:
+        if reader.peek() == "[":
+            reader.skip()
+            while True:
+                char = reader.peek()
+                if char == "]":
+                    reader.skip()
+                    break
+                if char == ",":
+                    reader.skip()
+                    continue
+                yield reader.decode()
+        else:
+            value = reader.decode()
+            if value is not None:
+                raise DataAccessError(f"Expected an array at '{'.'.join(path)}', got: {value!r}")
+
+    # Read the rest of the enclosing objects so errors listed after the array are not missed
+    while depth:
+        _seek_member(reader, None, error_key if depth == 1 else None)
+        depth -= 1
+
+
+def iter_response_array(
+    response: requests.Response,
+    path: Sequence[str],
+    error_key: Optional[str] = None,
+    chunk_size: int = STREAM_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """Yield the elements of the array at ``path`` of a streamed response body.
+
+    The response should have been requested with ``stream=True``; it is closed once
+    the generator finishes or is discarded.
+
+    Args:
+        response: Response whose body has not been read yet
+        path: Object keys leading to the array, e.g. ('data', 'votes')
+        error_key: Top-level member that means the provider reported errors, e.g. 'errors'
+        chunk_size: Bytes to read from the connection at a time
+
+    Yields:
+        Decoded array elements, in order
+
+    Raises:
+        DataAccessError: If the body reports errors, has no array at ``path`` or is malformed
+
+    """
+    try:
+        yield from iter_json_array(response.iter_content(chunk_size), path, error_key)
+    finally:
+        response.close()
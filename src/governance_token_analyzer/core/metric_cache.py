@@ -0,0 +1,289 @@
+"""Content-Addressed Cache for Metric Results.
+
+Protocol comparisons, reports and dashboard pages compute the same concentration
+metrics over the same holder sets again and again. This module memoizes metric
+results under a key derived from the balance data itself: a BLAKE2 digest of the
+balance array bytes combined with the metric name and its parameters. An unchanged
+snapshot therefore hits the cache no matter which command or process loaded it.
+
+Keys also include ``METRIC_CACHE_VERSION`` and the package version, so results
+persisted by an older release, or before a metric formula changed, are never
+served again; their files age out of the disk tier.
+
+Results live in an in-process LRU tier and, if a cache directory is configured, in
+an on-disk tier of JSON files whose total size is bounded by evicting the least
+recently used entries.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .. import __version__
+from .config import Config
+from .fixed_point import FixedPointBalances
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_DISK_BYTES = 64 * 1024 * 1024
+# Bump whenever a cached metric's formula or result format changes
+METRIC_CACHE_VERSION = 1
+
+
+def _json_default(value: Any) -> Any:
+    """Convert NumPy scalars and arrays for JSON serialization."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class MetricCache:
+    """Two-tier memoization of metric results keyed by balance content."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        cache_dir: Optional[str] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of results kept in memory
+            cache_dir: Directory for the on-disk tier, or None to keep results in memory only
+            max_disk_bytes: Size bound of the on-disk tier in bytes
+
+        Raises:
+            ValueError: If max_entries or max_disk_bytes is not positive
+
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be positive, got {max_entries}")
+        if max_disk_bytes < 1:
+            raise ValueError(f"max_disk_bytes must be positive, got {max_disk_bytes}")
+
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_bytes = max_disk_bytes
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def fingerprint(balances: Any) -> str:
+        """Digest of a balance array's content.
+
+        Args:
+            balances: List or array of balances, or a FixedPointBalances column
+
+        Returns:
+            Hex digest identifying the exact balance values and their order
+
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        if isinstance(balances, FixedPointBalances):
+            # Hash the exact limbs so distinct wei amounts never collide through float rounding
+            digest.update(f"fixed:{balances.decimals}:".encode())
+            digest.update(np.ascontiguousarray(balances.low).data)
+            if balances.high is not None:
+                digest.update(np.ascontiguousarray(balances.high).data)
+        else:
+            digest.update(b"float64:")
+            digest.update(np.ascontiguousarray(np.asarray(balances, dtype=np.float64)).data)
+        return digest.hexdigest()
+
+    def make_key(self, balances: Any, metric: str, **params: Any) -> str:
+        """Build the cache key for a metric over a balance array.
+
+        Args:
+            balances: List or array of balances, or a FixedPointBalances column
+            metric: Metric name
+            **params: Parameters the result depends on
+
+        Returns:
+            Hex cache key
+
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"v{METRIC_CACHE_VERSION}:{__version__}:".encode())
+        digest.update(self.fingerprint(balances).encode())
+        digest.update(metric.encode())
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Look up a result, checking memory first and then disk.
+
+        Args:
+            key: Cache key from make_key
+            default: Value returned on a miss
+
+        Returns:
+            A copy of the cached result, or default
+
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self._entries[key])
+
+        value = self._read_disk(key)
+        if value is not None:
+            self.hits += 1
+            self._remember(key, value)
+            return copy.deepcopy(value)
+
+        self.misses += 1
+        return default
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable result in every tier.
+
+        Args:
+            key: Cache key from make_key
+            value: Metric result
+
+        """
+        self._remember(key, copy.deepcopy(value))
+        if self.cache_dir:
+            self._write_disk(key, value)
+
+    def get_or_compute(self, balances: Any, metric: str, compute: Callable[[], Any], **params: Any) -> Any:
+        """Return a cached result or compute and cache it.
+
+        Args:
+            balances: List or array of balances, or a FixedPointBalances column
+            metric: Metric name
+            compute: Zero-argument callable producing the result on a miss
+            **params: Parameters the result depends on
+
+        Returns:
+            Metric result
+
+        """
+        key = self.make_key(balances, metric, **params)
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers and reset the statistics."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        for path in self._disk_files():
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counts and the current size of each tier."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_entries": len(self._entries),
+            "disk_bytes": sum(path.stat().st_size for path in self._disk_files()),
+        }
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Insert into the LRU tier, evicting the least recently used entry if full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path:
+        """Return the path of the disk tier file for a key."""
+        return self.cache_dir / f"{key}.json"
+
+    def _disk_files(self) -> List[Path]:
+        """Return the paths of every file in the disk tier."""
+        if not self.cache_dir or not self.cache_dir.is_dir():
+            return []
+        return list(self.cache_dir.glob("*.json"))
+
+    def _read_disk(self, key: str) -> Any:
+        """Read a result from the disk tier and mark it as recently used."""
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            value = json.loads(path.read_text())
+            path.touch()
+            return value
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable metric cache entry {path}: {e}")
+            return None
+
+    def _write_disk(self, key: str, value: Any) -> None:
+        """Write a result atomically, then evict old entries beyond the size bound."""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(value, f, default=_json_default)
+            Path(tmp_path).replace(self._disk_path(key))
+        except (OSError, TypeError) as e:
+            logger.warning(f"Could not write metric cache entry {key}: {e}")
+            return
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Delete the least recently used files until the tier fits its size bound."""
+        files = []
+        for path in self._disk_files():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+
+_default_cache: Optional[MetricCache] = None
+
+
+def get_metric_cache() -> MetricCache:
+    """Shared process-wide cache configured from Config.
+
+    Returns:
+        MetricCache with a disk tier if a metric cache directory is configured
+
+    """
+    global _default_cache
+    if _default_cache is None:
+        config = Config()
+        _default_cache = MetricCache(
+            max_entries=config.metric_cache_entries,
+            cache_dir=config.metric_cache_dir,
+            max_disk_bytes=config.metric_cache_max_bytes,
+        )
+    return _default_cache
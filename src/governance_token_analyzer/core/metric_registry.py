@@ -0,0 +1,217 @@
+"""Metric Registry for Concentration Metrics.
+
+Every concentration metric is registered here together with the intermediates it
+reads from the ConcentrationEngine (ascending or descending sort, prefix sum, shares,
+log-shares). A request names the metrics it wants; the registry resolves the union of
+their intermediates through the dependency graph, builds each one once on a shared
+engine and runs only the requested metrics. Sort-free metrics such as the Herfindahl
+index therefore never pay for a sort.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .concentration_engine import DEFAULT_LORENZ_RESOLUTION, ConcentrationEngine
+
+# Intermediate name -> intermediates it is derived from
+INTERMEDIATE_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "sorted_ascending": (),
+    "sorted_descending": ("sorted_ascending",),
+    "cumsum": ("sorted_ascending",),
+    "shares": (),
+    "log_shares": ("shares",),
+}
+
+# Intermediate name -> ConcentrationEngine attribute that caches it
+_ENGINE_ATTRIBUTES = {
+    "sorted_ascending": "sorted_balances",
+    "sorted_descending": "sorted_descending",
+    "cumsum": "cumulative",
+    "shares": "shares",
+    "log_shares": "log_shares",
+}
+
+
+class MetricSpec:
+    """A registered metric and the intermediates it needs."""
+
+    def __init__(
+        self,
+        name: str,
+        compute: Callable[..., Any],
+        requires: Sequence[str],
+        scalar: bool = True,
+        description: str = "",
+    ):
+        """Initialize the metric specification.
+
+        Args:
+            name: Metric name used in results and on the command line
+            compute: Callable taking a ConcentrationEngine and optional keyword options
+            requires: Names of the intermediates the metric reads
+            scalar: Whether the metric produces a single number
+            description: Short human-readable description
+
+        Raises:
+            ValueError: If an intermediate is unknown
+
+        """
+        unknown = [item for item in requires if item not in INTERMEDIATE_DEPENDENCIES]
+        if unknown:
+            raise ValueError(f"Unknown intermediates for metric '{name}': {', '.join(unknown)}")
+
+        self.name = name
+        self.compute = compute
+        self.requires = tuple(requires)
+        self.scalar = scalar
+        self.description = description
+
+
+METRIC_REGISTRY: Dict[str, MetricSpec] = {}
+
+
+def register_metric(
+    name: str, requires: Sequence[str], scalar: bool = True, description: str = ""
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Register a metric function under ``name``.
+
+    Args:
+        name: Metric name
+        requires: Names of the intermediates the metric reads
+        scalar: Whether the metric produces a single number
+        description: Short human-readable description
+
+    Returns:
+        Decorator that registers the function and returns it unchanged
+
+    """
+
+    def decorator(compute: Callable[..., Any]) -> Callable[..., Any]:
+        METRIC_REGISTRY[name] = MetricSpec(name, compute, requires, scalar=scalar, description=description)
+        return compute
+
+    return decorator
+
+
+def available_metrics(scalar_only: bool = False) -> List[str]:
+    """List the registered metric names in registration order.
+
+    Args:
+        scalar_only: Whether to leave out metrics that return curves or mappings
+
+    Returns:
+        List of metric names
+
+    """
+    return [name for name, spec in METRIC_REGISTRY.items() if spec.scalar or not scalar_only]
+
+
+def required_intermediates(metrics: Iterable[str]) -> List[str]:
+    """Resolve the intermediates needed by a set of metrics, dependencies first.
+
+    Args:
+        metrics: Metric names
+
+    Returns:
+        Intermediate names in an order where each follows the ones it is derived from
+
+    Raises:
+        ValueError: If a metric is not registered
+
+    """
+    ordered: List[str] = []
+
+    def visit(intermediate: str) -> None:
+        if intermediate in ordered:
+            return
+        for dependency in INTERMEDIATE_DEPENDENCIES[intermediate]:
+            visit(dependency)
+        ordered.append(intermediate)
+
+    for name in metrics:
+        if name not in METRIC_REGISTRY:
+            raise ValueError(f"Unknown metric: {name}. Available metrics: {', '.join(METRIC_REGISTRY)}")
+        for intermediate in METRIC_REGISTRY[name].requires:
+            visit(intermediate)
+
+    return ordered
+
+
+def compute_metrics(
+    balances: Union[ConcentrationEngine, Sequence[float], np.ndarray],
+    metrics: Optional[Iterable[str]] = None,
+    options: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Compute the requested metrics from one shared engine.
+
+    Args:
+        balances: Array-like of token balances or an existing ConcentrationEngine
+        metrics: Metric names to compute. If None, every registered metric is computed.
+        options: Per-metric keyword arguments, e.g. ``{"nakamoto_coefficient": {"threshold": 50.0}}``
+
+    Returns:
+        Dictionary mapping each requested metric name to its value
+
+    Raises:
+        ValueError: If a metric is not registered
+
+    """
+    names = list(METRIC_REGISTRY) if metrics is None else list(dict.fromkeys(metrics))
+    options = options or {}
+    engine = ConcentrationEngine.from_balances(balances)
+
+    # Build every intermediate once, before any metric reads it
+    for intermediate in required_intermediates(names):
+        getattr(engine, _ENGINE_ATTRIBUTES[intermediate])
+
+    return {name: METRIC_REGISTRY[name].compute(engine, **options.get(name, {})) for name in names}
+
+
+@register_metric("gini_coefficient", requires=("sorted_ascending",), description="Gini coefficient")
+def _gini_coefficient(engine: ConcentrationEngine) -> float:
+    return engine.gini_coefficient()
+
+
+@register_metric("herfindahl_index", requires=("shares",), description="Herfindahl-Hirschman Index (0-10000)")
+def _herfindahl_index(engine: ConcentrationEngine, total_supply: Optional[float] = None) -> float:
+    return engine.herfindahl_index(total_supply)
+
+
+@register_metric("shannon_entropy", requires=("log_shares",), description="Shannon entropy of holder shares")
+def _shannon_entropy(engine: ConcentrationEngine) -> float:
+    return engine.shannon_entropy()
+
+
+@register_metric("theil_index", requires=("log_shares",), description="Theil T index")
+def _theil_index(engine: ConcentrationEngine) -> float:
+    return engine.theil_index()
+
+
+@register_metric("hoover_index", requires=("shares",), description="Hoover (Robin Hood) index")
+def _hoover_index(engine: ConcentrationEngine) -> float:
+    return engine.hoover_index()
+
+
+@register_metric("nakamoto_coefficient", requires=("cumsum",), description="Holders needed to control a threshold")
+def _nakamoto_coefficient(engine: ConcentrationEngine, threshold: float = 51.0, strict: bool = False) -> int:
+    return engine.nakamoto_coefficient(threshold, strict=strict)
+
+
+@register_metric("palma_ratio", requires=("cumsum",), description="Top 10% share over bottom 40% share")
+def _palma_ratio(engine: ConcentrationEngine) -> float:
+    return engine.palma_ratio()
+
+
+@register_metric(
+    "top_percentile_concentration", requires=("cumsum",), scalar=False, description="Share held by top percentiles"
+)
+def _top_percentiles(engine: ConcentrationEngine, percentiles: Optional[List[int]] = None) -> Dict[str, float]:
+    return engine.top_percentiles(percentiles)
+
+
+@register_metric("lorenz_curve", requires=("cumsum",), scalar=False, description="Lorenz curve coordinates")
+def _lorenz_curve(
+    engine: ConcentrationEngine, resolution: Optional[int] = DEFAULT_LORENZ_RESOLUTION
+) -> Dict[str, List[float]]:
+    return engine.lorenz_curve(resolution)
@@ -8,6 +8,8 @@ from typing import Any, Dict, List, Union
 import numpy as np
 import pandas as pd
 
+from .concentration_engine import ConcentrationEngine
+
 
 def calculate_gini_coefficient(
     balances: Union[List[float], np.ndarray, pd.Series],
@@ -26,20 +28,13 @@ def calculate_gini_coefficient(
 
     """
     # Convert to numpy array and ensure no negative values
-    balances_array = np.array(balances)
-    balances_array = np.abs(balances_array)
+    engine = ConcentrationEngine(np.abs(np.asarray(balances, dtype=np.float64)))
 
     # Handle edge cases
-    if len(balances_array) <= 1 or np.sum(balances_array) == 0:
+    if engine.n <= 1:
         return 0.0
 
-    # Sort balances
-    balances_array = np.sort(balances_array)
-
-    # Calculate Gini coefficient
-    n = len(balances_array)
-    index = np.arange(1, n + 1)
-    return ((2 * np.sum(index * balances_array)) / (n * np.sum(balances_array))) - ((n + 1) / n)
+    return engine.gini_coefficient()
 
 
 def calculate_concentration_ratio(df: pd.DataFrame, n: int = 10) -> float:
@@ -1,103 +1,240 @@
-"""
-Metrics collector for governance token analysis.
+"""Metrics collector for governance token analysis.
 
 This module provides functionality to collect and aggregate metrics
 across different protocols for comparison and analysis.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Callable, Optional, Sequence, TypeVar
+import functools
+import inspect
 import logging
+import time
 
 from governance_token_analyzer.core.api_client import APIClient
-from governance_token_analyzer.core.token_analysis import (
-    calculate_gini_coefficient,
-    calculate_nakamoto_coefficient,
-    calculate_shannon_entropy,
-    calculate_theil_index,
-    calculate_palma_ratio,
-)
+from governance_token_analyzer.core.balance_parsing import extract_balance_column
+from governance_token_analyzer.core.balance_sketch import BalanceSketch
+from governance_token_analyzer.core.concentration_engine import ConcentrationEngine
+from governance_token_analyzer.core.fixed_point import FixedPointBalances, parse_balances
+from governance_token_analyzer.core.metric_cache import get_metric_cache
+from governance_token_analyzer.core.metric_registry import compute_metrics
+from governance_token_analyzer.core.streaming_metrics import StreamingMetrics
 
 logger = logging.getLogger(__name__)
 
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Metrics collected per protocol when no explicit selection is made
+COLLECTOR_METRICS = ("gini_coefficient", "nakamoto_coefficient", "shannon_entropy", "theil_index", "palma_ratio")
+
+# The collector reports the strict 50% Nakamoto coefficient, like token_analysis
+COLLECTOR_METRIC_OPTIONS = {"nakamoto_coefficient": {"threshold": 50.0, "strict": True}}
+
+
+def measure_api_call(protocol: str, method: str) -> Callable[[F], F]:
+    """Log how long each call of the decorated analysis function takes.
+
+    Args:
+        protocol: Protocol label of the log record, or the name of the decorated
+            function's argument holding it in angle brackets, e.g. "<protocol_name>"
+        method: Method label of the log record
+
+    Returns:
+        Decorator that leaves the function's arguments and result unchanged
 
-class MetricsCollector:
     """
-    Collects and aggregates metrics across different protocols.
+
+    def decorator(function: F) -> F:
+        signature = inspect.signature(function)
+        argument = protocol[1:-1] if protocol.startswith("<") and protocol.endswith(">") else None
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            label = protocol
+            if argument is not None:
+                bound = signature.bind_partial(*args, **kwargs)
+                parameter = signature.parameters.get(argument)
+                default = parameter.default if parameter is not None else None
+                label = str(bound.arguments.get(argument, default))
+
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                logger.debug(f"{label}.{method} took {time.perf_counter() - started:.3f}s")
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+class MetricsCollector:
+    """Collects and aggregates metrics across different protocols.
 
     This class provides a unified interface for collecting metrics
     from various protocols for comparison and analysis.
     """
 
-    def __init__(self, use_live_data: bool = True):
-        """
-        Initialize the MetricsCollector.
+    def __init__(self, use_live_data: bool = True, use_metric_cache: bool = True):
+        """Initialize the MetricsCollector.
 
         Args:
             use_live_data: Whether to use live data or simulated data
+            use_metric_cache: Whether to reuse metrics computed earlier for identical balances
+
         """
         self.use_live_data = use_live_data
+        self.use_metric_cache = use_metric_cache
         self.api_client = APIClient()
 
-    def collect_protocol_data(self, protocol: str, limit: int = 1000) -> Dict[str, Any]:
-        """
-        Collect comprehensive data for a specific protocol.
+    def collect_protocol_data(
+        self, protocol: str, limit: int = 1000, metrics: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Collect comprehensive data for a specific protocol.
 
         Args:
             protocol: Name of the protocol to collect data for
             limit: Maximum number of token holders to collect
+            metrics: Registered metric names to compute (default: COLLECTOR_METRICS).
+                Only the intermediates these metrics need are built.
 
         Returns:
             Dictionary containing token holder data and metrics
+
         """
         # Get token holders data
         holders_data = self.api_client.get_token_holders(protocol, limit=limit, use_real_data=self.use_live_data)
 
         # Extract balances
-        balances = []
-        for holder in holders_data:
-            if isinstance(holder, dict) and "balance" in holder:
-                try:
-                    balance = float(holder["balance"])
-                    if balance > 0:
-                        balances.append(balance)
-                except (ValueError, TypeError):
-                    continue
-
-        # Calculate metrics
-        metrics = {}
+        balances = self._extract_positive_balances(holders_data)
+
+        requested = tuple(COLLECTOR_METRICS if metrics is None else metrics)
+        results = {}
         if balances:
-            metrics["gini_coefficient"] = calculate_gini_coefficient(balances)
-            metrics["nakamoto_coefficient"] = calculate_nakamoto_coefficient(balances)
-            metrics["shannon_entropy"] = calculate_shannon_entropy(balances)
-            metrics["theil_index"] = calculate_theil_index(balances)
-            metrics["palma_ratio"] = calculate_palma_ratio(balances)
-            metrics["total_holders"] = len(balances)
-            metrics["total_supply"] = sum(balances)
+            if self.use_metric_cache:
+                results = get_metric_cache().get_or_compute(
+                    balances,
+                    "collector_metrics",
+                    lambda: self._compute_metrics(balances, requested),
+                    metrics=requested,
+                )
+            else:
+                results = self._compute_metrics(balances, requested)
+
+        return {
+            "protocol": protocol,
+            "token_holders": holders_data,
+            "balances": balances.tolist(),
+            "rejected_balances": balances.rejected,
+            "metrics": results,
+        }
+
+    def stream_protocol_metrics(self, protocol: str, limit: int = 1000, page_size: int = 100) -> Dict[str, Any]:
+        """Compute streamable metrics for a protocol page by page.
 
-        return {"protocol": protocol, "token_holders": holders_data, "balances": balances, "metrics": metrics}
+        Holder pages are folded into streaming accumulators and a fixed-size balance
+        sketch as soon as the API client yields them and are then discarded, so memory
+        stays bounded by the page size regardless of how many holders the token has.
+        HHI, Shannon entropy, Theil, total supply and holder count are exact; Nakamoto,
+        Palma and top-percentile shares are sketch estimates within the reported
+        relative error.
+
+        Args:
+            protocol: Name of the protocol to collect data for
+            limit: Maximum number of token holders to consume
+            page_size: Number of holders requested per page
+
+        Returns:
+            Dictionary containing the protocol name, pages consumed, metrics and the sketch
+
+        """
+        accumulators = StreamingMetrics()
+        sketch = BalanceSketch()
+        pages = 0
+
+        for page in self.api_client.iter_token_holder_pages(
+            protocol, limit=limit, page_size=page_size, use_real_data=self.use_live_data
+        ):
+            balances = self._extract_positive_balances(page)
+            accumulators.update(balances)
+            sketch.update(balances)
+            pages += 1
+
+        metrics = {}
+        if pages:
+            metrics = accumulators.result()
+            metrics["nakamoto_coefficient"] = sketch.nakamoto_coefficient()
+            metrics["palma_ratio"] = sketch.palma_ratio()
+            metrics["top_percentile_concentration"] = sketch.top_percentiles()
+            metrics["sketch_relative_error"] = sketch.relative_error
+
+        return {"protocol": protocol, "pages": pages, "metrics": metrics, "sketch": sketch}
+
+    @staticmethod
+    def _compute_metrics(
+        balances: FixedPointBalances, metrics: Sequence[str] = COLLECTOR_METRICS
+    ) -> Dict[str, Any]:
+        """Calculate the requested metrics from a single engine shared by every metric.
+
+        Args:
+            balances: Positive balances
+            metrics: Registered metric names to compute
+
+        Returns:
+            Dictionary of metrics, plus total holders and total supply
+
+        """
+        engine = ConcentrationEngine(balances)
+        results = compute_metrics(engine, metrics, options=COLLECTOR_METRIC_OPTIONS)
+        results["total_holders"] = engine.n
+        results["total_supply"] = engine.total
+        return results
+
+    @staticmethod
+    def _extract_positive_balances(holders: List[Dict[str, Any]]) -> FixedPointBalances:
+        """Extract positive balances from holder dictionaries.
+
+        Balances are parsed once into an exact fixed-point column that every metric
+        function accepts directly.
+
+        Args:
+            holders: List of token holder dictionaries
+
+        Returns:
+            FixedPointBalances column of the positive balances; ``rejected`` counts the
+            holders whose balance was missing or could not be parsed
+
+        """
+        balances = parse_balances(extract_balance_column(holders)).positive()
+        if balances.rejected:
+            logger.warning(f"Skipped {balances.rejected} of {len(holders)} holders without a valid balance")
+        return balances
 
     def compare_protocols(
-        self, protocol_list: List[str], primary_metric: str = "gini_coefficient"
+        self,
+        protocol_list: List[str],
+        primary_metric: str = "gini_coefficient",
+        metrics: Optional[List[str]] = None,
     ) -> Dict[str, Dict[str, Any]]:
-        """
-        Compare metrics across multiple protocols.
+        """Compare metrics across multiple protocols.
 
         Args:
             protocol_list: List of protocols to compare
             primary_metric: Primary metric for comparison
+            metrics: Registered metric names to compute (default: COLLECTOR_METRICS)
 
         Returns:
             Dictionary mapping protocols to their metrics
+
         """
         results = {}
 
         for protocol in protocol_list:
             try:
-                protocol_data = self.collect_protocol_data(protocol)
-                metrics = protocol_data.get("metrics", {})
+                protocol_data = self.collect_protocol_data(protocol, metrics=metrics)
+                protocol_metrics = protocol_data.get("metrics", {})
 
-                if metrics:
-                    results[protocol] = metrics
+                if protocol_metrics:
+                    results[protocol] = protocol_metrics
                 else:
                     results[protocol] = {"error": "No metrics available"}
 
@@ -108,27 +245,24 @@ class MetricsCollector:
         return results
 
     def get_governance_data(self, protocol: str) -> Dict[str, Any]:
-        """
-        Get governance-related data for a protocol.
+        """Get governance-related data for a protocol.
 
         Args:
             protocol: Name of the protocol
 
         Returns:
             Dictionary containing governance data
+
         """
         try:
             proposals = self.api_client.get_governance_proposals(protocol, use_real_data=self.use_live_data)
 
-            # Collect votes for each proposal
-            all_votes = []
-            for proposal in proposals:
-                if proposal.get("id"):
-                    proposal_id = int(proposal["id"])
-                    proposal_votes = self.api_client.get_governance_votes(
-                        protocol, proposal_id, use_real_data=self.use_live_data
-                    )
-                    all_votes.extend(proposal_votes)
+            # Collect votes for every proposal concurrently
+            proposal_ids = [int(proposal["id"]) for proposal in proposals if proposal.get("id")]
+            votes_by_proposal = self.api_client.get_votes_for_proposals(
+                protocol, proposal_ids, use_real_data=self.use_live_data
+            )
+            all_votes = [vote for proposal_votes in votes_by_proposal.values() for vote in proposal_votes]
 
             return {
                 "protocol": protocol,
@@ -1,8 +1,11 @@
 from datetime import datetime, timedelta
 from typing import Any, Dict
 
+import numpy as np
 import pandas as pd
 
+from .balance_parsing import to_float_balances
+from .concentration_engine import calculate_grouped_metrics
 from .logging_config import get_logger
 from .metrics import calculate_participation_rate, calculate_vote_distribution
 from .metrics_collector import measure_api_call
@@ -10,6 +13,10 @@ from .metrics_collector import measure_api_call
 # Configure logger
 logger = get_logger(__name__)
 
+# Holder size groups by percentage of supply: below 0.1%, 0.1-1%, 1% and above
+HOLDER_SIZE_PERCENT_THRESHOLDS = (0.1, 1.0)
+HOLDER_SIZE_GROUPS = ("small_holders", "medium_holders", "large_holders")
+
 
 @measure_api_call(protocol="<protocol_name>", method="analyze_governance_participation")
 def analyze_governance_participation(
@@ -222,39 +229,36 @@ def analyze_participation_by_holder_size(
             if voter:
                 voter_addresses.add(voter.lower())
 
-        # Categorize token holders by size
-        token_holders["address_lower"] = token_holders["address"].str.lower()
-        token_holders["participated"] = token_holders["address_lower"].isin(voter_addresses)
-
-        # Define holder categories
-        large_holders = token_holders[token_holders["percentage"] >= 1.0]
-        medium_holders = token_holders[(token_holders["percentage"] < 1.0) & (token_holders["percentage"] >= 0.1)]
-        small_holders = token_holders[token_holders["percentage"] < 0.1]
-
-        # Calculate participation rates by category
-        large_participation = large_holders["participated"].mean() * 100
-        medium_participation = medium_holders["participated"].mean() * 100
-        small_participation = small_holders["participated"].mean() * 100
+        # Assign size groups from the percentage column and aggregate every group in one pass
+        percentages = np.nan_to_num(to_float_balances(token_holders["percentage"])[0])
+        balances = (
+            np.nan_to_num(to_float_balances(token_holders["balance"])[0])
+            if "balance" in token_holders
+            else np.zeros_like(percentages)
+        )
+        grouped = calculate_grouped_metrics(
+            balances, thresholds=HOLDER_SIZE_PERCENT_THRESHOLDS, labels=HOLDER_SIZE_GROUPS, group_values=percentages
+        )
+        codes = grouped["codes"]
+
+        participated = token_holders["address"].str.lower().isin(voter_addresses).to_numpy(dtype=np.float64)
+        voters = np.bincount(codes, weights=participated, minlength=len(HOLDER_SIZE_GROUPS))
+
+        participation_by_size = {}
+        for code in reversed(range(len(HOLDER_SIZE_GROUPS))):
+            group = grouped["groups"][HOLDER_SIZE_GROUPS[code]]
+            count = group["holder_count"]
+            participation_by_size[HOLDER_SIZE_GROUPS[code]] = {
+                "count": count,
+                # An empty group has no participation rate, like the mean of an empty selection
+                "participation_rate": voters[code] / count * 100 if count else float("nan"),
+                "supply_share": group["share"],
+            }
 
         # Compile results
         results = {
             "protocol": protocol_name,
-            "metrics": {
-                "participation_by_size": {
-                    "large_holders": {
-                        "count": len(large_holders),
-                        "participation_rate": large_participation,
-                    },
-                    "medium_holders": {
-                        "count": len(medium_holders),
-                        "participation_rate": medium_participation,
-                    },
-                    "small_holders": {
-                        "count": len(small_holders),
-                        "participation_rate": small_participation,
-                    },
-                }
-            },
+            "metrics": {"participation_by_size": participation_by_size},
         }
 
         logger.info(f"Participation by holder size analysis completed for {protocol_name}")
@@ -0,0 +1,161 @@
+"""Process-wide Token-Bucket Rate Limiting for Data Providers.
+
+Every provider (Etherscan, The Graph, Moralis, Alchemy) gets one token bucket that is
+shared by all client instances in the process, so concurrent clients together stay at
+the provider's quota instead of each pacing itself independently. Callers reserve a
+token under a lock and then wait outside it, which keeps the bucket fair across threads;
+coroutines wait with ``asyncio.sleep`` so the event loop is never blocked.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at a fixed rate."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        """Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens, i.e. the allowed burst. Defaults to one second of tokens.
+            clock: Monotonic time source in seconds
+
+        Raises:
+            ValueError: If the rate or capacity is not positive
+
+        """
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got: {rate}")
+
+        capacity = max(rate, 1.0) if capacity is None else capacity
+        if capacity <= 0:
+            raise ValueError(f"Capacity must be positive, got: {capacity}")
+
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Add the tokens accrued since the last update. Must be called with the lock held."""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self, tokens: float) -> float:
+        """Take ``tokens`` from the bucket, possibly going into debt, and return the wait in seconds."""
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of capacity {self.capacity}")
+
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens only if they are available right now.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Whether the tokens were taken
+
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens, blocking the calling thread until they are available.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, tokens: float = 1.0) -> float:
+        """Take tokens, suspending the calling coroutine until they are available.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds spent waiting
+
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> TokenBucket:
+    """Return the process-wide token bucket for a provider, creating it from Config on first use.
+
+    Args:
+        provider: Provider name, e.g. 'etherscan', 'graph', 'moralis' or 'alchemy'
+
+    Returns:
+        TokenBucket shared by every caller for this provider
+
+    """
+    provider = provider.lower()
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            config = Config()
+            rate = config.rate_limits.get(provider, config.default_rate_limit)
+            limiter = TokenBucket(rate, capacity=config.rate_limit_bursts.get(provider))
+            _limiters[provider] = limiter
+            logger.debug(f"Rate limiter for {provider}: {limiter.rate} requests/s, burst {limiter.capacity}")
+        return limiter
+
+
+def configure_rate_limit(provider: str, rate: float, capacity: Optional[float] = None) -> TokenBucket:
+    """Replace a provider's token bucket, e.g. after upgrading to a higher quota tier.
+
+    Args:
+        provider: Provider name
+        rate: Requests per second
+        capacity: Allowed burst, or None for one second of requests
+
+    Returns:
+        The new TokenBucket
+
+    """
+    limiter = TokenBucket(rate, capacity=capacity)
+    with _limiters_lock:
+        _limiters[provider.lower()] = limiter
+    return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Drop every provider bucket so the next use re-reads Config."""
+    with _limiters_lock:
+        _limiters.clear()
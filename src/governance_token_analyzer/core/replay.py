@@ -0,0 +1,435 @@
+"""Record/Replay Transport for Deterministic Offline Load Tests.
+
+The fetch layer (APIClient, TheGraphAPI and the legacy ``analyzer.api`` clients) talks to
+live Etherscan, Graph and Moralis endpoints, which makes it impossible to benchmark
+reproducibly. This module hooks the ``requests`` transport underneath all of them:
+
+- ``recording(cassette_dir)`` lets requests through to the real providers and stores
+  every response in a cassette directory, one JSON file per distinct request, with API
+  keys redacted.
+- ``replaying(cassette_dir, latency=..., jitter=..., error_rate=...)`` starts a local
+  stand-in HTTP server that serves the cassette, and reroutes every request to it. The
+  server injects the configured latency, random jitter and HTTP errors, so throughput
+  and tail latency of the whole fetch pipeline (connection pooling, rate limiting,
+  retries, decoding) can be measured with no network access.
+- ``run_load`` drives a fetch function concurrently and summarizes throughput and latency.
+
+Requests are matched by method, URL (with secrets removed and query parameters sorted)
+and body, so a cassette recorded with one client can be replayed with another.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .config import Config
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Query parameters that carry credentials and are never part of a request key
+SECRET_PARAMS = {"apikey", "api_key", "key"}
+REDACTED = "REDACTED"
+# Header carrying the original URL of a rerouted request, for diagnostics
+ORIGINAL_URL_HEADER = "X-Replay-Original-URL"
+
+_transport_lock = threading.Lock()
+
+
+def _configured_secrets() -> List[str]:
+    """Return the configured API keys, which must never be written to a cassette."""
+    config = Config()
+    candidates = [
+        config.etherscan_api_key,
+        config.alchemy_api_key,
+        config.graph_api_key,
+        config.infura_project_id,
+        os.getenv("MORALIS_API_KEY"),
+    ]
+    return [secret for secret in candidates if secret and len(secret) >= 4]
+
+
+def redact(text: str, secrets: List[str]) -> str:
+    """Replace every secret in a string with a placeholder."""
+    for secret in secrets:
+        text = text.replace(secret, REDACTED)
+    return text
+
+
+def normalize_url(url: str, secrets: List[str]) -> str:
+    """Remove credentials from a URL and sort its query parameters.
+
+    Args:
+        url: Request URL
+        secrets: Secret values to redact, e.g. API keys embedded in the path
+
+    Returns:
+        URL suitable for matching and storing
+
+    """
+    parts = urlsplit(url)
+    query = sorted((name, value) for name, value in parse_qsl(parts.query) if name.lower() not in SECRET_PARAMS)
+    return redact(urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), "")), secrets)
+
+
+def request_key(method: str, url: str, body: Optional[Union[str, bytes]], secrets: List[str]) -> str:
+    """Key identifying a request in a cassette.
+
+    Args:
+        method: HTTP method
+        url: Request URL
+        body: Request body
+        secrets: Secret values excluded from the key
+
+    Returns:
+        Hex digest of the method, normalized URL and body
+
+    """
+    if isinstance(body, str):
+        body = body.encode()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(method.upper().encode())
+    digest.update(normalize_url(url, secrets).encode())
+    digest.update(redact((body or b"").decode("utf-8", "replace"), secrets).encode())
+    return digest.hexdigest()
+
+
+class Cassette:
+    """Directory of recorded provider interactions, one JSON file per request key."""
+
+    def __init__(self, directory: str):
+        """Open or create a cassette directory.
+
+        Args:
+            directory: Directory holding the recorded interactions
+
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def save(
+        self, key: str, request: requests.PreparedRequest, response: requests.Response, secrets: List[str]
+    ) -> None:
+        """Store a response under its request key, replacing an earlier recording.
+
+        Args:
+            key: Request key from request_key
+            request: The request that was sent
+            response: The provider's response
+            secrets: Secret values to redact from the stored request and response
+
+        """
+        body = request.body.decode("utf-8", "replace") if isinstance(request.body, bytes) else request.body
+        interaction = {
+            "request": {
+                "method": request.method,
+                "url": normalize_url(request.url, secrets),
+                "body": redact(body, secrets) if body else None,
+            },
+            "response": {
+                "status_code": response.status_code,
+                "content_type": response.headers.get("Content-Type", "application/json"),
+                "body": redact(response.text, secrets),
+            },
+            "recorded_at": time.time(),
+        }
+        with open(self._path(key), "w", encoding="utf-8") as cassette_file:
+            json.dump(interaction, cassette_file, indent=2)
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the recorded interaction for a request key, or None if it was never recorded."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as cassette_file:
+                return json.load(cassette_file)
+        except FileNotFoundError:
+            return None
+
+    def __len__(self) -> int:
+        """Return the number of recorded interactions."""
+        return sum(1 for _ in Path(self.directory).glob("*.json"))
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """Serves cassette responses; the request path is the request key."""
+
+    server: "_StandInHTTPServer"
+    # Keep connections open so replayed traffic exercises connection pooling
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802 - name required by BaseHTTPRequestHandler
+        self._replay()
+
+    def do_POST(self) -> None:  # noqa: N802 - name required by BaseHTTPRequestHandler
+        # Drain the body so the connection can be reused
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self._replay()
+
+    def _replay(self) -> None:
+        status, content_type, body = self.server.replay.respond(self.path.lstrip("/"))
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - signature of the base class
+        logger.debug(f"Replay server: {format % args}")
+
+
+class _StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, replay: "ReplayServer"):
+        super().__init__(("127.0.0.1", 0), _ReplayHandler)
+        self.replay = replay
+
+
+class ReplayServer:
+    """Local stand-in HTTP server replaying a cassette with injected latency and errors."""
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+    ):
+        """Configure the server; it starts listening on start() or when used as a context manager.
+
+        Args:
+            cassette: Recorded interactions to serve
+            latency: Seconds added to every response
+            jitter: Upper bound in seconds of uniformly random extra latency
+            error_rate: Probability of answering with error_status instead of the recording
+            error_status: HTTP status of injected errors
+            seed: Seed for jitter and error injection, for reproducible runs
+
+        Raises:
+            ValueError: If a latency is negative or the error rate is outside [0, 1]
+
+        """
+        if latency < 0 or jitter < 0:
+            raise ValueError(f"latency and jitter must not be negative, got: {latency}, {jitter}")
+        if not 0 <= error_rate <= 1:
+            raise ValueError(f"error_rate must be between 0 and 1, got: {error_rate}")
+
+        self.cassette = cassette
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.served = 0
+        self.injected_errors = 0
+        self.misses = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[_StandInHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        if self._server is None:
+            raise RuntimeError("Replay server is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ReplayServer":
+        """Start serving on a free local port in a background thread."""
+        self._server = _StandInHTTPServer(self)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="replay-server", daemon=True)
+        self._thread.start()
+        logger.info(f"Replaying {len(self.cassette)} recorded responses from {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and wait for its thread to finish."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+            self._thread = None
+
+    def __enter__(self) -> "ReplayServer":
+        """Start the server."""
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        """Stop the server."""
+        self.stop()
+
+    def respond(self, key: str) -> Tuple[int, str, str]:
+        """Produce the (status, content type, body) for a request key, after the injected delay."""
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            inject_error = self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+
+        if inject_error:
+            with self._lock:
+                self.injected_errors += 1
+            return self.error_status, "application/json", json.dumps({"error": "Injected by replay server"})
+
+        interaction = self.cassette.load(key)
+        if interaction is None:
+            with self._lock:
+                self.misses += 1
+            logger.warning(f"Replay server has no recording for request {key}")
+            return 404, "application/json", json.dumps({"error": f"No recording for request {key}"})
+
+        with self._lock:
+            self.served += 1
+        response = interaction["response"]
+        return response["status_code"], response["content_type"], response["body"]
+
+
+@contextmanager
+def _patched_send(send: Callable[..., requests.Response]) -> Iterator[None]:
+    """Route every requests transport call in the process through ``send``."""
+    with _transport_lock:
+        original = HTTPAdapter.send
+        HTTPAdapter.send = send
+    try:
+        yield
+    finally:
+        with _transport_lock:
+            HTTPAdapter.send = original
+
+
+@contextmanager
+def recording(cassette_dir: str) -> Iterator[Cassette]:
+    """Record every provider response made inside the block.
+
+    Args:
+        cassette_dir: Directory to write the recorded interactions to
+
+    Yields:
+        The cassette being recorded
+
+    """
+    cassette = Cassette(cassette_dir)
+    secrets = _configured_secrets()
+    original_send = HTTPAdapter.send
+
+    def send(adapter: HTTPAdapter, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        response = original_send(adapter, request, **kwargs)
+        cassette.save(request_key(request.method, request.url, request.body, secrets), request, response, secrets)
+        return response
+
+    with _patched_send(send):
+        yield cassette
+
+
+@contextmanager
+def replaying(
+    cassette_dir: str,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    error_status: int = 503,
+    seed: Optional[int] = None,
+) -> Iterator[ReplayServer]:
+    """Serve every provider request made inside the block from a cassette via a local server.
+
+    Args:
+        cassette_dir: Directory holding the recorded interactions
+        latency: Seconds added to every response
+        jitter: Upper bound in seconds of uniformly random extra latency
+        error_rate: Probability of answering with error_status instead of the recording
+        error_status: HTTP status of injected errors
+        seed: Seed for jitter and error injection
+
+    Yields:
+        The running replay server, whose counters report served, missing and failed requests
+
+    """
+    server = ReplayServer(Cassette(cassette_dir), latency, jitter, error_rate, error_status, seed)
+    secrets = _configured_secrets()
+    original_send = HTTPAdapter.send
+
+    def send(adapter: HTTPAdapter, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        local = request.copy()
+        local.url = f"{server.url}/{request_key(request.method, request.url, request.body, secrets)}"
+        local.headers[ORIGINAL_URL_HEADER] = normalize_url(request.url, secrets)
+        # Never send replayed traffic through a proxy configured for the real providers
+        kwargs["proxies"] = {}
+        response = original_send(adapter, local, **kwargs)
+        response.url = request.url
+        response.request = request
+        return response
+
+    with server, _patched_send(send):
+        yield server
+
+
+def run_load(function: Callable[[], Any], requests_count: int, concurrency: int = 1) -> Dict[str, float]:
+    """Call a fetch function repeatedly and summarize throughput and latency.
+
+    Args:
+        function: Zero-argument function performing one unit of fetch work
+        requests_count: Number of calls
+        concurrency: Number of calls in flight at once
+
+    Returns:
+        Dictionary with the call and error counts, wall time, throughput in calls per
+        second, and p50/p95/p99/max latency in seconds
+
+    Raises:
+        ValueError: If requests_count or concurrency is smaller than 1
+
+    """
+    if requests_count < 1 or concurrency < 1:
+        raise ValueError(f"requests_count and concurrency must be at least 1, got: {requests_count}, {concurrency}")
+
+    def timed_call() -> Tuple[float, bool]:
+        started = time.perf_counter()
+        try:
+            function()
+            failed = False
+        except Exception as exception:
+            logger.debug(f"Load test call failed: {exception}")
+            failed = True
+        return time.perf_counter() - started, failed
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: timed_call(), range(requests_count)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, _ in results)
+
+    def percentile(q: float) -> float:
+        return latencies[max(1, math.ceil(q / 100 * len(latencies))) - 1]
+
+    return {
+        "requests": requests_count,
+        "errors": sum(failed for _, failed in results),
+        "seconds": elapsed,
+        "throughput": requests_count / elapsed if elapsed > 0 else math.inf,
+        "p50": percentile(50),
+        "p95": percentile(95),
+        "p99": percentile(99),
+        "max": latencies[-1],
+    }
@@ -0,0 +1,250 @@
+"""Streaming Metric Accumulators for Token Distribution Analysis.
+
+This module provides online accumulators for concentration metrics that can be
+expressed through additive sufficient statistics (count, sum, sum of squares and
+sum of x*ln(x)). Each accumulator consumes balances batch by batch with
+``update(batch)``, can be combined with an accumulator computed on another shard
+with ``merge(other)``, and reports its value with ``result()``. Nothing but the
+running sums is kept in memory, so holder sets of any size can be analyzed while
+they are still being paginated from an API.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, Sequence, Union
+
+import numpy as np
+
+BalanceBatch = Union[Sequence[float], np.ndarray]
+
+
+def _as_positive_array(batch: BalanceBatch) -> np.ndarray:
+    """Convert a batch of balances to a float64 array of positive values."""
+    values = np.asarray(batch, dtype=np.float64).ravel()
+    return values[values > 0]
+
+
+class MetricAccumulator(ABC):
+    """Base class for mergeable streaming metric accumulators."""
+
+    def update(self, batch: BalanceBatch) -> "MetricAccumulator":
+        """Add a batch of balances to the accumulator.
+
+        Args:
+            batch: Array-like of token balances. Zero and negative balances are ignored.
+
+        Returns:
+            The accumulator itself, to allow chaining
+
+        """
+        self._update(_as_positive_array(batch))
+        return self
+
+    def merge(self, other: "MetricAccumulator") -> "MetricAccumulator":
+        """Combine the state of another accumulator of the same type into this one.
+
+        Args:
+            other: Accumulator computed on a different shard of holders
+
+        Returns:
+            The accumulator itself, to allow chaining
+
+        """
+        if type(other) is not type(self):
+            raise TypeError(f"Cannot merge {type(other).__name__} into {type(self).__name__}")
+        self._merge(other)
+        return self
+
+    @abstractmethod
+    def result(self) -> float:
+        """Return the metric value for all balances seen so far."""
+
+    @abstractmethod
+    def _update(self, values: np.ndarray) -> None:
+        """Add positive balances to the running statistics."""
+
+    @abstractmethod
+    def _merge(self, other: "MetricAccumulator") -> None:
+        """Add the running statistics of an accumulator of the same type."""
+
+
+class HolderCountAccumulator(MetricAccumulator):
+    """Counts holders with a positive balance."""
+
+    def __init__(self):
+        """Initialize an empty holder count."""
+        self.count = 0
+
+    def _update(self, values: np.ndarray) -> None:
+        self.count += int(values.size)
+
+    def _merge(self, other: "HolderCountAccumulator") -> None:
+        self.count += other.count
+
+    def result(self) -> int:
+        """Return the number of holders seen so far."""
+        return self.count
+
+
+class TotalSupplyAccumulator(MetricAccumulator):
+    """Sums the balances held by all holders."""
+
+    def __init__(self):
+        """Initialize an empty total."""
+        self.total = 0.0
+
+    def _update(self, values: np.ndarray) -> None:
+        self.total += float(values.sum())
+
+    def _merge(self, other: "TotalSupplyAccumulator") -> None:
+        self.total += other.total
+
+    def result(self) -> float:
+        """Return the total balance seen so far."""
+        return self.total
+
+
+class HerfindahlAccumulator(MetricAccumulator):
+    """Herfindahl-Hirschman Index from the running sum and sum of squares.
+
+    HHI = sum(x_i^2) / (sum x_i)^2, scaled to the traditional 0-10000 range.
+    """
+
+    def __init__(self):
+        """Initialize empty running sums."""
+        self.total = 0.0
+        self.sum_squares = 0.0
+
+    def _update(self, values: np.ndarray) -> None:
+        self.total += float(values.sum())
+        self.sum_squares += float(np.dot(values, values))
+
+    def _merge(self, other: "HerfindahlAccumulator") -> None:
+        self.total += other.total
+        self.sum_squares += other.sum_squares
+
+    def result(self) -> float:
+        """Return the Herfindahl index for all balances seen so far."""
+        if self.total == 0:
+            return 0.0
+        return self.sum_squares / (self.total * self.total) * 10000
+
+
+class ShannonEntropyAccumulator(MetricAccumulator):
+    """Shannon entropy (base 2) from the running sum and sum of x*ln(x).
+
+    H = ln(S) / ln(2) - sum(x_i * ln(x_i)) / (S * ln(2)), where S is the total balance.
+    """
+
+    def __init__(self):
+        """Initialize empty running sums."""
+        self.total = 0.0
+        self.sum_x_log_x = 0.0
+
+    def _update(self, values: np.ndarray) -> None:
+        self.total += float(values.sum())
+        self.sum_x_log_x += float(np.dot(values, np.log(values)))
+
+    def _merge(self, other: "ShannonEntropyAccumulator") -> None:
+        self.total += other.total
+        self.sum_x_log_x += other.sum_x_log_x
+
+    def result(self) -> float:
+        """Return the Shannon entropy for all balances seen so far."""
+        if self.total == 0:
+            return 0.0
+        entropy = (math.log(self.total) - self.sum_x_log_x / self.total) / math.log(2)
+        return max(0.0, entropy)
+
+
+class TheilAccumulator(MetricAccumulator):
+    """Theil T index from the running count, sum and sum of x*ln(x).
+
+    T = sum(x_i * ln(x_i)) / S - ln(S / n), where S is the total balance and n the holder count.
+    """
+
+    def __init__(self):
+        """Initialize empty running sums."""
+        self.count = 0
+        self.total = 0.0
+        self.sum_x_log_x = 0.0
+
+    def _update(self, values: np.ndarray) -> None:
+        self.count += int(values.size)
+        self.total += float(values.sum())
+        self.sum_x_log_x += float(np.dot(values, np.log(values)))
+
+    def _merge(self, other: "TheilAccumulator") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.sum_x_log_x += other.sum_x_log_x
+
+    def result(self) -> float:
+        """Return the Theil index for all balances seen so far."""
+        if self.total == 0:
+            return 0.0
+        theil = self.sum_x_log_x / self.total - math.log(self.total / self.count)
+        return max(0.0, theil)
+
+
+class StreamingMetrics:
+    """Bundle of streaming accumulators updated together from the same batches."""
+
+    ACCUMULATORS = {
+        "herfindahl_index": HerfindahlAccumulator,
+        "shannon_entropy": ShannonEntropyAccumulator,
+        "theil_index": TheilAccumulator,
+        "total_holders": HolderCountAccumulator,
+        "total_supply": TotalSupplyAccumulator,
+    }
+
+    def __init__(self):
+        """Initialize one empty accumulator per supported metric."""
+        self.accumulators = {name: accumulator_class() for name, accumulator_class in self.ACCUMULATORS.items()}
+
+    def update(self, batch: BalanceBatch) -> "StreamingMetrics":
+        """Add a batch of balances to every accumulator.
+
+        Args:
+            batch: Array-like of token balances. Zero and negative balances are ignored.
+
+        Returns:
+            The bundle itself, to allow chaining
+
+        """
+        values = _as_positive_array(batch)
+        for accumulator in self.accumulators.values():
+            accumulator._update(values)
+        return self
+
+    def update_many(self, batches: Iterable[BalanceBatch]) -> "StreamingMetrics":
+        """Consume an iterable of balance batches.
+
+        Args:
+            batches: Iterable yielding array-like batches of token balances
+
+        Returns:
+            The bundle itself, to allow chaining
+
+        """
+        for batch in batches:
+            self.update(batch)
+        return self
+
+    def merge(self, other: "StreamingMetrics") -> "StreamingMetrics":
+        """Combine the accumulators of another bundle into this one.
+
+        Args:
+            other: Bundle computed on a different shard of holders
+
+        Returns:
+            The bundle itself, to allow chaining
+
+        """
+        for name, accumulator in self.accumulators.items():
+            accumulator.merge(other.accumulators[name])
+        return self
+
+    def result(self) -> Dict[str, Any]:
+        """Return the current value of every accumulated metric."""
+        return {name: accumulator.result() for name, accumulator in self.accumulators.items()}
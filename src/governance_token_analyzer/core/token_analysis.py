@@ -7,10 +7,8 @@ including concentration metrics and governance participation.
 import logging
 from typing import Any, Dict, List, Optional
 
-import numpy as np
-import math
-
 from .api_client import APIClient
+from .concentration_engine import ConcentrationEngine
 from .config import PROTOCOLS, Config
 
 # Configure logging
@@ -36,20 +34,8 @@ def calculate_gini_coefficient(balances: List[float]) -> float:
     Returns:
         Gini coefficient as a float between 0 and 1.
     """
-    # Filter out any negative values that might cause issues
-    positive_balances = [b for b in balances if b >= 0]
-
-    if not positive_balances or sum(positive_balances) == 0:
-        return 0
-
-    # Sort balances in ascending order
-    balances_sorted = sorted(positive_balances)
-    n = len(balances_sorted)
-
-    # Calculate Gini coefficient using the formula
-    # G = (2 * sum(i * x_i) / (n * sum(x_i))) - (n + 1) / n
-    indices = np.arange(1, n + 1)
-    return 2 * np.sum(indices * balances_sorted) / (n * np.sum(balances_sorted)) - (n + 1) / n
+    # Negative values are filtered out before calculation
+    return ConcentrationEngine.from_balances(balances, drop_negative=True).gini_coefficient()
 
 
 def calculate_nakamoto_coefficient(balances: List[float]) -> int:
@@ -64,22 +50,7 @@ def calculate_nakamoto_coefficient(balances: List[float]) -> int:
     Returns:
         Nakamoto coefficient as an integer.
     """
-    if not balances:
-        return 0
-
-    # Sort balances in descending order
-    balances_sorted = sorted(balances, reverse=True)
-    total_supply = sum(balances_sorted)
-    threshold = total_supply * 0.5
-
-    # Count how many holders needed to exceed 50%
-    cumulative_sum = 0
-    for i, balance in enumerate(balances_sorted):
-        cumulative_sum += balance
-        if cumulative_sum > threshold:
-            return i + 1
-
-    return len(balances_sorted)
+    return ConcentrationEngine.from_balances(balances).nakamoto_coefficient(50.0, strict=True)
 
 
 def calculate_shannon_entropy(balances: List[float]) -> float:
@@ -94,19 +65,7 @@ def calculate_shannon_entropy(balances: List[float]) -> float:
     Returns:
         Shannon entropy as a float.
     """
-    if not balances or sum(balances) == 0:
-        return 0
-
-    total = sum(balances)
-    proportions = [balance / total for balance in balances]
-
-    # Calculate entropy
-    entropy = 0
-    for p in proportions:
-        if p > 0:
-            entropy -= p * math.log2(p)
-
-    return entropy
+    return ConcentrationEngine.from_balances(balances).shannon_entropy()
 
 
 def calculate_theil_index(balances: List[float]) -> float:
@@ -120,23 +79,7 @@ def calculate_theil_index(balances: List[float]) -> float:
     Returns:
         Theil index as a float.
     """
-    if not balances or sum(balances) == 0:
-        return 0
-
-    n = len(balances)
-    total = sum(balances)
-    mean = total / n
-
-    if mean == 0:
-        return 0
-
-    # Calculate Theil index
-    theil = 0
-    for balance in balances:
-        if balance > 0:
-            theil += (balance / total) * math.log(balance / mean)
-
-    return theil
+    return ConcentrationEngine.from_balances(balances).theil_index()
 
 
 def calculate_palma_ratio(balances: List[float]) -> float:
@@ -156,13 +99,11 @@ def calculate_palma_ratio(balances: List[float]) -> float:
         Palma ratio as a float. Returns 0 if insufficient data, or
         float("inf") if bottom 40% sum is zero.
     """
-    if not balances or sum(balances) == 0:
+    engine = ConcentrationEngine.from_balances(balances)
+    if engine.is_empty:
         return 0
 
-    # Sort balances in ascending order
-    balances_sorted = sorted(balances)
-    n = len(balances_sorted)
-
+    n = engine.n
     if n < 5:  # Need at least 5 holders to calculate meaningful ratio
         logger.warning("Cannot calculate reliable Palma ratio: insufficient data points (n=%d)", n)
         return 0
@@ -175,13 +116,9 @@ def calculate_palma_ratio(balances: List[float]) -> float:
             n,
         )
 
-    # Calculate indices for percentiles
-    bottom_40_idx = int(n * 0.4)
-    top_10_idx = int(n * 0.9)
-
-    # Calculate sum for each group
-    bottom_40_sum = sum(balances_sorted[:bottom_40_idx])
-    top_10_sum = sum(balances_sorted[top_10_idx:])
+    # Sums for the bottom 40% and top 10% come straight from the shared cumulative sum
+    bottom_40_sum = engine.bottom_sum(int(n * 0.4))
+    top_10_sum = engine.top_sum(n - int(n * 0.9))
 
     if bottom_40_sum == 0:
         logger.warning("Palma ratio calculation resulted in division by zero: bottom 40%% has zero total balance")
@@ -292,22 +229,7 @@ class TokenDistributionAnalyzer:
             HHI as a float between 0 and 10000.
 
         """
-        if not balances:
-            return 0
-
-        if total_supply is None or total_supply <= 0:
-            total_supply = sum(balances)
-
-        if total_supply <= 0:
-            return 0
-
-        # Calculate market shares as percentages (0-100)
-        market_shares = [(balance / total_supply) * 100 for balance in balances]
-
-        # Calculate HHI as sum of squared market shares
-        hhi = sum(share**2 for share in market_shares)
-
-        return hhi
+        return ConcentrationEngine.from_balances(balances).herfindahl_index(total_supply)
 
     def calculate_concentration_metrics(self, holders: List[Dict[str, Any]], total_supply: str) -> Dict[str, Any]:
         """Calculate concentration metrics for token holders.
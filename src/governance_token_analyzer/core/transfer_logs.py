@@ -0,0 +1,408 @@
+"""On-Chain Holder Balances from ERC-20 Transfer Logs.
+
+Provider holder endpoints return at most a top-100 sample. The complete holder set
+of a token follows from its ``Transfer`` event logs alone: every balance is the sum
+of the amounts an address received minus the amounts it sent. This module rebuilds
+it over plain JSON-RPC:
+
+- ``JSONRPCClient`` sends calls through the shared transport, so node requests use
+  the pooled connections, retries, rate limiter and circuit breaker of provider 'rpc'
+- ``TransferLogIngestor`` splits a block range into chunks that are fetched with
+  ``eth_getLogs`` in parallel. A chunk the node rejects for matching too many logs
+  is split in half and retried, and the chunk size shrinks for the rest of the
+  range; it grows back by a quarter after each chunk that succeeds at full width.
+- ``BalanceTable`` folds the logs into exact integer balances in base units.
+  Addition is commutative, so chunks may complete in any order.
+"""
+
+import itertools
+import logging
+import re
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .circuit_breaker import get_circuit_breaker
+from .config import Config
+from .exceptions import JSONRPCError
+from .rate_limiter import get_rate_limiter
+from .transport import get_transport
+
+logger = logging.getLogger(__name__)
+
+# keccak256("Transfer(address,address,uint256)")
+TRANSFER_TOPIC = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+# Mints are transfers from the zero address and burns are transfers to it
+ZERO_ADDRESS = "0x" + "0" * 40
+
+# Error codes and messages nodes use to reject a log query that matches too many logs
+# (e.g. Infura "query returned more than 10000 results", Alchemy "Log response size exceeded")
+RANGE_TOO_LARGE_CODES = frozenset({-32005})
+_RANGE_TOO_LARGE = re.compile(
+    r"more than \d+ results|too many|response size|block range|range (is )?too (large|wide|big)|is limited to",
+    re.IGNORECASE,
+)
+
+
+def is_range_too_large(error: JSONRPCError) -> bool:
+    """Whether a node rejected a log query because its block range matches too many logs.
+
+    Args:
+        error: Error returned by the node
+
+    Returns:
+        True if a smaller block range may succeed
+
+    """
+    return error.code in RANGE_TOO_LARGE_CODES or bool(_RANGE_TOO_LARGE.search(str(error)))
+
+
+class JSONRPCClient:
+    """Minimal Ethereum JSON-RPC client on top of the shared HTTP transport."""
+
+    def __init__(self, url: str, provider: str = "rpc"):
+        """Initialize the client.
+
+        Args:
+            url: HTTP endpoint of the node
+            provider: Provider name whose rate limiter, circuit breaker and timings are used
+
+        """
+        self.url = url
+        self.provider = provider
+        self.transport = get_transport()
+        self.session = self.transport.create_session({"User-Agent": "GovernanceTokenAnalyzer/1.0"})
+        self.rate_limiter = get_rate_limiter(provider)
+        self.circuit_breaker = get_circuit_breaker(provider)
+        self._ids = itertools.count(1)
+
+    def call(self, method: str, params: Sequence[Any] = ()) -> Any:
+        """Call a JSON-RPC method.
+
+        Args:
+            method: Method name, e.g. 'eth_getLogs'
+            params: Positional parameters
+
+        Returns:
+            The call's result
+
+        Raises:
+            JSONRPCError: If the node answers with an error object
+            CircuitOpenError: If the provider's circuit breaker is open
+            requests.exceptions.RequestException: If the request fails
+
+        """
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": list(params)}
+
+        def post() -> Dict[str, Any]:
+            response = self.transport.request(
+                self.session, self.provider, "POST", self.url, throttle=self.rate_limiter.acquire, json=payload
+            )
+            response.raise_for_status()
+            return response.json()
+
+        reply = self.circuit_breaker.call(post)
+        error = reply.get("error")
+        if error:
+            raise JSONRPCError(error.get("message", "unknown error"), code=error.get("code"), data=error.get("data"))
+        return reply.get("result")
+
+    def block_number(self) -> int:
+        """Return the number of the latest block."""
+        return int(self.call("eth_blockNumber"), 16)
+
+    def get_logs(self, address: str, from_block: int, to_block: int) -> List[Dict[str, Any]]:
+        """Transfer logs emitted by a token contract in an inclusive block range.
+
+        Args:
+            address: Token contract address
+            from_block: First block of the range
+            to_block: Last block of the range
+
+        Returns:
+            Log objects as returned by the node
+
+        """
+        log_filter = {
+            "address": address,
+            "fromBlock": hex(from_block),
+            "toBlock": hex(to_block),
+            "topics": [TRANSFER_TOPIC],
+        }
+        return self.call("eth_getLogs", [log_filter]) or []
+
+
+def decode_transfer(log: Dict[str, Any]) -> Optional[Tuple[str, str, int]]:
+    """Decode an ERC-20 Transfer log.
+
+    Args:
+        log: Log object from eth_getLogs
+
+    Returns:
+        (sender, recipient, amount in base units) with lowercase addresses, or None for
+        logs removed by a reorg and for other events, such as ERC-721 transfers whose
+        token ID is a fourth topic
+
+    """
+    topics = log.get("topics") or []
+    if log.get("removed") or len(topics) != 3 or topics[0].lower() != TRANSFER_TOPIC:
+        return None
+    data = log.get("data") or "0x"
+    amount = int(data[:66], 16) if len(data) > 2 else 0
+    # Indexed addresses are left-padded to 32 bytes
+    return "0x" + topics[1][-40:].lower(), "0x" + topics[2][-40:].lower(), amount
+
+
+def format_units(amount: int, decimals: int) -> str:
+    """Format a base-unit amount as a canonical decimal token string without trailing zeros.
+
+    Args:
+        amount: Amount in base units
+        decimals: Token decimals
+
+    Returns:
+        Decimal string, e.g. '1.5' for 15 * 10**17 with 18 decimals
+
+    """
+    if not decimals:
+        return str(amount)
+    sign = "-" if amount < 0 else ""
+    whole, fraction = divmod(abs(amount), 10**decimals)
+    fraction_digits = str(fraction).rjust(decimals, "0").rstrip("0")
+    return f"{sign}{whole}.{fraction_digits}" if fraction_digits else f"{sign}{whole}"
+
+
+class BalanceTable:
+    """Exact token balances folded from Transfer logs."""
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self.balances: Dict[str, int] = defaultdict(int)
+        self.transfers = 0
+        self.minted = 0
+        self.burned = 0
+        # Last block whose logs have been applied, so a later run can continue from there
+        self.last_block: Optional[int] = None
+
+    def apply(self, logs: Iterable[Dict[str, Any]]) -> int:
+        """Apply Transfer logs to the balances.
+
+        Args:
+            logs: Log objects in any order
+
+        Returns:
+            Number of transfers applied
+
+        """
+        applied = 0
+        balances = self.balances
+        for log in logs:
+            transfer = decode_transfer(log)
+            if transfer is None:
+                continue
+            sender, recipient, amount = transfer
+            if sender == ZERO_ADDRESS:
+                self.minted += amount
+            else:
+                balances[sender] -= amount
+            if recipient == ZERO_ADDRESS:
+                self.burned += amount
+            else:
+                balances[recipient] += amount
+            applied += 1
+        self.transfers += applied
+        return applied
+
+    @property
+    def total_supply(self) -> int:
+        """Tokens minted minus tokens burned, in base units."""
+        return self.minted - self.burned
+
+    def holders(self) -> List[Tuple[str, int]]:
+        """Addresses with a positive balance, largest first.
+
+        Returns:
+            (address, balance in base units) pairs; ties are ordered by address
+
+        """
+        return sorted(
+            ((address, balance) for address, balance in self.balances.items() if balance > 0),
+            key=lambda item: (-item[1], item[0]),
+        )
+
+    def negative_balances(self) -> Dict[str, int]:
+        """Addresses that sent more than they received.
+
+        Only possible if the logs do not start at the token's deployment or some are
+        missing, so a non-empty result means the table is incomplete.
+        """
+        return {address: balance for address, balance in self.balances.items() if balance < 0}
+
+    def to_holder_records(self, protocol: str, decimals: int = 18) -> List[Dict[str, Any]]:
+        """Holder dictionaries in the shape returned by the provider fetchers.
+
+        Args:
+            protocol: Protocol name stored in every record
+            decimals: Token decimals used to format the balances
+
+        Returns:
+            One record per holder, largest first, with exact decimal string balances and
+            the share of the total supply
+
+        """
+        supply = self.total_supply
+        updated = datetime.now().isoformat()
+        return [
+            {
+                "protocol": protocol,
+                "address": address,
+                "balance": format_units(balance, decimals),
+                "percentage": balance / supply if supply > 0 else 0.0,
+                "label": f"Whale {rank}" if rank <= 5 else f"Holder {rank}",
+                "last_updated": updated,
+            }
+            for rank, (address, balance) in enumerate(self.holders(), start=1)
+        ]
+
+
+class TransferLogIngestor:
+    """Fetches a token's Transfer logs in parallel block-range chunks of adaptive size."""
+
+    def __init__(
+        self,
+        client: JSONRPCClient,
+        token_address: str,
+        chunk_size: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        min_chunk_size: int = 1,
+        max_chunk_size: Optional[int] = None,
+    ):
+        """Initialize the ingestor.
+
+        Args:
+            client: JSON-RPC client of the node to query
+            token_address: Token contract address
+            chunk_size: Blocks per initial range, defaults to Config().transfer_log_chunk_blocks
+            max_workers: Concurrent range requests, defaults to Config().transfer_log_workers
+            min_chunk_size: Smallest range the chunk size shrinks to
+            max_chunk_size: Largest range the chunk size grows to, defaults to 16 times the initial size
+
+        Raises:
+            ValueError: If a chunk size or the worker count is not positive
+
+        """
+        config = Config()
+        chunk_size = chunk_size or config.transfer_log_chunk_blocks
+        max_workers = max_workers or config.transfer_log_workers
+        if min(chunk_size, min_chunk_size, max_workers) < 1:
+            raise ValueError("Chunk sizes and max_workers must be positive")
+
+        self.client = client
+        self.token_address = token_address
+        self.chunk_size = chunk_size
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max(max_chunk_size or chunk_size * 16, chunk_size)
+        self.max_workers = max_workers
+        self.stats = {"requests": 0, "splits": 0, "logs": 0}
+
+    def _shrink(self, span: int) -> None:
+        """Halve the chunk size below a range the node rejected."""
+        self.chunk_size = max(self.min_chunk_size, min(self.chunk_size, span // 2))
+
+    def _grow(self, span: int) -> None:
+        """Grow the chunk size by a quarter after a full-width range succeeded."""
+        if span >= self.chunk_size:
+            self.chunk_size = min(self.max_chunk_size, self.chunk_size + max(1, self.chunk_size // 4))
+
+    def iter_logs(self, from_block: int, to_block: int) -> Iterator[List[Dict[str, Any]]]:
+        """Fetch the Transfer logs of an inclusive block range.
+
+        Ranges are planned lazily at the current chunk size and at most ``max_workers``
+        are in flight at once.
+
+        Args:
+            from_block: First block
+            to_block: Last block
+
+        Yields:
+            The logs of one completed range at a time, in completion order
+
+        Raises:
+            JSONRPCError: If the node rejects a query for another reason, or a single
+                block still matches too many logs
+
+        """
+        retry: Deque[Tuple[int, int]] = deque()
+        next_block = from_block
+        running: Dict[Future, Tuple[int, int]] = {}
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="transfer-logs")
+        try:
+            while True:
+                while len(running) < self.max_workers:
+                    if retry:
+                        start, end = retry.popleft()
+                    elif next_block <= to_block:
+                        start, end = next_block, min(to_block, next_block + self.chunk_size - 1)
+                        next_block = end + 1
+                    else:
+                        break
+                    future = executor.submit(self.client.get_logs, self.token_address, start, end)
+                    running[future] = (start, end)
+                if not running:
+                    return
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, end = running.pop(future)
+                    self.stats["requests"] += 1
+                    try:
+                        logs = future.result()
+                    except JSONRPCError as error:
+                        if start == end or not is_range_too_large(error):
+                            raise
+                        middle = (start + end) // 2
+                        retry.extendleft([(middle + 1, end), (start, middle)])
+                        self.stats["splits"] += 1
+                        self._shrink(end - start + 1)
+                        logger.debug(f"Blocks {start}-{end} matched too many logs; chunk size now {self.chunk_size}")
+                        continue
+
+                    self._grow(end - start + 1)
+                    self.stats["logs"] += len(logs)
+                    yield logs
+        finally:
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def build_balance_table(
+        self, from_block: int = 0, to_block: Optional[int] = None, table: Optional[BalanceTable] = None
+    ) -> BalanceTable:
+        """Fold the Transfer logs of a block range into a balance table.
+
+        Args:
+            from_block: First block, usually the token's deployment block
+            to_block: Last block, defaults to the latest block
+            table: Table to continue, e.g. from its last_block + 1; a new one if None
+
+        Returns:
+            The updated balance table
+
+        """
+        if to_block is None:
+            to_block = self.client.block_number()
+        table = table if table is not None else BalanceTable()
+
+        for logs in self.iter_logs(from_block, to_block):
+            table.apply(logs)
+        table.last_block = to_block
+
+        logger.info(
+            f"Folded {table.transfers} transfers of {self.token_address} up to block {to_block} "
+            f"({self.stats['requests']} requests, {self.stats['splits']} splits)"
+        )
+        negative = table.negative_balances()
+        if negative:
+            logger.warning(f"{len(negative)} addresses have negative balances; the logs do not cover the full history")
+        return table
@@ -0,0 +1,262 @@
+"""Shared HTTP Transport for Provider Requests.
+
+Every provider call (Etherscan, Moralis, The Graph) goes through one process-wide
+``HTTPTransport``:
+
+- one ``HTTPAdapter`` whose per-host connection pools are shared by every session it
+  creates, so keep-alive connections are reused across clients and requests
+- compressed responses (gzip and deflate, plus brotli when a decoder is installed)
+- retries of timeouts, connection errors, HTTP 429 and 5xx responses with full-jitter
+  exponential backoff; a ``Retry-After`` header is honored, and a response asking for
+  a longer wait than the maximum backoff is returned instead of retried
+- per-attempt timing per provider, reported by ``transport_stats``
+"""
+
+import email.utils
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from .config import Config
+from .hedging import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+# Status codes that mean the provider is overloaded or briefly unavailable
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Number of distinct provider hosts whose connection pools are kept
+POOL_HOSTS = 16
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Parse a Retry-After header into seconds.
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+        now: Current time for HTTP dates, defaults to the system clock
+
+    Returns:
+        Non-negative seconds to wait, or None if the header is absent or invalid
+
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        moment = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max(0.0, (moment - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class HTTPTransport:
+    """Pooled, retrying HTTP transport shared by every provider client."""
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        timeout: float = 30.0,
+        max_retries: int = 2,
+        backoff: float = 1.0,
+        max_backoff: float = 30.0,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+    ):
+        """Initialize the transport and its connection pools.
+
+        Args:
+            pool_size: Connections kept open per provider host
+            timeout: Default request timeout in seconds
+            max_retries: Retries after the first attempt
+            backoff: Base of the exponential backoff in seconds
+            max_backoff: Upper bound on any wait between attempts in seconds
+            sleep: Function used to wait between attempts
+            rng: Random source for the backoff jitter
+
+        Raises:
+            ValueError: If the pool size is not positive or the retries are negative
+
+        """
+        if pool_size < 1:
+            raise ValueError(f"pool_size must be positive, got: {pool_size}")
+        if max_retries < 0:
+            raise ValueError(f"max_retries must not be negative, got: {max_retries}")
+
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._sleep = sleep
+        self._random = rng or random.Random()
+        # Retries are handled here, so the adapter itself never retries
+        self.adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=pool_size, max_retries=0)
+        self.latencies = LatencyTracker()
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def create_session(self, headers: Optional[Dict[str, str]] = None) -> requests.Session:
+        """Create a session that draws its connections from the shared pools.
+
+        Args:
+            headers: Default headers of the session, e.g. its User-Agent
+
+        Returns:
+            requests.Session mounted on the shared adapter
+
+        """
+        session = requests.Session()
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+        session.headers.update({"Accept-Encoding": ACCEPT_ENCODING, "Connection": "keep-alive"})
+        session.headers.update(headers or {})
+        return session
+
+    def retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> Optional[float]:
+        """Seconds to wait before retrying after a failed attempt.
+
+        Args:
+            attempt: Zero-based number of the attempt that failed
+            response: Response of the failed attempt, if one was received
+
+        Returns:
+            Delay in seconds, or None if the provider asked for a longer wait than max_backoff
+
+        """
+        jitter = self._random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+        if retry_after is None:
+            return jitter
+        if retry_after > self.max_backoff:
+            return None
+        # Never earlier than asked; the jitter keeps waiting clients from returning in lockstep
+        return min(retry_after + jitter, self.max_backoff)
+
+    def request(
+        self,
+        session: requests.Session,
+        provider: str,
+        method: str,
+        url: str,
+        throttle: Optional[Callable[[], Any]] = None,
+        prepaid: bool = False,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send a request with retries, recording the timing of every attempt.
+
+        Args:
+            session: Session to send the request with, usually one from create_session
+            provider: Provider name the timing is recorded under, e.g. 'etherscan'
+            method: HTTP method
+            url: Request URL
+            throttle: Called before each attempt, e.g. a rate limiter's acquire
+            prepaid: Whether the caller already throttled the first attempt
+            **kwargs: Further arguments for ``session.request``, e.g. params, json or stream
+
+        Returns:
+            The first response that is not retried. Its status is not checked, so a
+            final 429 or 5xx response is returned for the caller to raise.
+
+        Raises:
+            requests.exceptions.RequestException: If the last attempt times out or cannot connect
+
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            if throttle is not None and (attempt > 0 or not prepaid):
+                throttle()
+
+            started = time.perf_counter()
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as exception:
+                self._record(provider, time.perf_counter() - started, failed=True)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.retry_delay(attempt)
+                logger.warning(
+                    f"{provider} request failed (attempt {attempt + 1}), retrying in {delay:.2f}s: {exception}"
+                )
+            else:
+                failed = response.status_code in RETRY_STATUSES
+                self._record(provider, time.perf_counter() - started, failed=failed)
+                if not failed or attempt >= self.max_retries:
+                    return response
+                delay = self.retry_delay(attempt, response)
+                if delay is None:
+                    logger.warning(f"{provider} asked to retry after more than {self.max_backoff:.0f}s; giving up")
+                    return response
+                # Release the connection back to the pool before waiting
+                response.close()
+                logger.warning(
+                    f"{provider} answered HTTP {response.status_code} (attempt {attempt + 1}), "
+                    f"retrying in {delay:.2f}s"
+                )
+
+            with self._lock:
+                self._counts.setdefault(provider, {"requests": 0, "retries": 0, "failures": 0})["retries"] += 1
+            self._sleep(delay)
+            attempt += 1
+
+    def _record(self, provider: str, seconds: float, failed: bool) -> None:
+        """Record the duration and outcome of one attempt."""
+        self.latencies.record(provider, seconds)
+        with self._lock:
+            counts = self._counts.setdefault(provider, {"requests": 0, "retries": 0, "failures": 0})
+            counts["requests"] += 1
+            counts["failures"] += failed
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return attempts, retries, failures and latency percentiles per provider."""
+        latencies = self.latencies.summary()
+        with self._lock:
+            counts = {provider: dict(values) for provider, values in self._counts.items()}
+        return {provider: {**values, **latencies.get(provider, {})} for provider, values in counts.items()}
+
+
+_transport: Optional[HTTPTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HTTPTransport:
+    """Return the process-wide transport, creating it from Config on first use.
+
+    Returns:
+        HTTPTransport shared by every provider client
+
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            config = Config()
+            _transport = HTTPTransport(
+                pool_size=config.http_pool_size,
+                timeout=config.http_timeout,
+                max_retries=config.http_max_retries,
+                backoff=config.http_backoff,
+                max_backoff=config.http_max_backoff,
+            )
+        return _transport
+
+
+def transport_stats() -> Dict[str, Dict[str, float]]:
+    """Per-provider request statistics of the shared transport."""
+    return get_transport().stats()
+
+
+def reset_transport() -> None:
+    """Drop the shared transport so the next use starts fresh and re-reads Config."""
+    global _transport
+    with _transport_lock:
+        _transport = None
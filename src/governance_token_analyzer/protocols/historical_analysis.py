@@ -11,7 +11,6 @@ import argparse
 import json
 import logging
 import os
-import time
 from datetime import datetime, timedelta
 
 from analyzer.config import Config
@@ -134,12 +133,9 @@ class HistoricalTokenAnalyzer:
                 filepath = self.save_historical_data(results, current_date)
                 result_files.append(filepath)
 
-                # Move to next interval
+                # Move to next interval; API clients pace themselves with the shared rate limiters
                 current_date += timedelta(days=interval_days)
 
-                # Add a delay to avoid API rate limits
-                time.sleep(1)
-
             except Exception as e:
                 logger.error(
                     f"Error analyzing {self.token_symbol} for date {current_date.strftime('%Y-%m-%d')}: {str(e)}"
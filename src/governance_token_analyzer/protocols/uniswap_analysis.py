@@ -5,6 +5,9 @@ import logging
 import os
 from datetime import datetime
 
+import numpy as np
+
+from governance_token_analyzer.core.balance_parsing import HOLDER_BALANCE_FIELDS, holder_balances
 from analyzer.api import EtherscanAPI
 from analyzer.config import Config
 from analyzer.token_analysis import TokenDistributionAnalyzer
@@ -63,32 +66,11 @@ class UniswapAnalyzer:
             # If not, assume the response is already the list of holders
             holders = holders_response
 
-        # Extract balances from holders
-        balances = []
-        for holder in holders:
-            # Handle different formats of holder data
-            if isinstance(holder, dict):
-                # Try different field names for balances
-                if "TokenHolderQuantity" in holder:
-                    balance = float(holder["TokenHolderQuantity"])
-                elif "balance" in holder:
-                    balance = float(holder["balance"])
-                elif "tokenBalance" in holder:
-                    balance = float(holder["tokenBalance"])
-                else:
-                    # If no recognized field, use the first numeric value found
-                    for key, value in holder.items():
-                        try:
-                            balance = float(value)
-                            break
-                        except (ValueError, TypeError):
-                            continue
-                    else:
-                        # If no numeric value found, skip this holder
-                        logger.warning(f"Could not extract balance from holder data: {holder}")
-                        continue
-
-                balances.append(balance)
+        # Extract and convert every holder's balance in one vectorized pass
+        balances, rejected = holder_balances(holders, fields=HOLDER_BALANCE_FIELDS)
+        if rejected:
+            logger.warning(f"Could not extract a balance from {rejected} of {len(holders)} holders")
+        balances = balances[~np.isnan(balances)].tolist()
 
         if not balances:
             logger.error("No valid balances found in holder data")
@@ -202,6 +202,52 @@ def create_whale_influence_chart(
     return fig
 
 
+def create_concentration_curve_chart(
+    curves: Dict[str, Dict[str, List[float]]],
+    thresholds: Dict[str, float] = None,
+    title: str = "Holders Needed to Control Supply",
+) -> plt.Figure:
+    """Create a step chart of how many of the largest holders control each share of supply.
+
+    Args:
+        curves: Dictionary mapping protocol names to concentration curves with
+            'share' and 'holders' arrays, as returned by calculate_concentration_curve
+        thresholds: Optional mapping of threshold names to percentages to mark on the chart
+        title: Chart title
+
+    Returns:
+        Matplotlib Figure object
+
+    """
+    fig, ax = plt.subplots(figsize=(12, 8))
+
+    for protocol, curve in curves.items():
+        ax.step(curve["share"], curve["holders"], where="post", label=protocol)
+
+    # Mark governance thresholds such as quorum and majority
+    for name, percentage in (thresholds or {}).items():
+        ax.axvline(percentage, color="gray", linestyle="--", alpha=0.5)
+        ax.annotate(
+            name.replace("_", " ").title(),
+            xy=(percentage, 1),
+            xycoords=("data", "axes fraction"),
+            xytext=(3, -12),
+            textcoords="offset points",
+            fontsize=9,
+            rotation=90,
+            va="top",
+        )
+
+    ax.set_xlabel("Share of Total Supply (%)")
+    ax.set_ylabel("Number of Largest Holders Needed")
+    ax.set_yscale("symlog")
+    ax.set_title(title)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+    return fig
+
+
 def save_chart(fig: plt.Figure, filename: str, dpi: int = 300) -> None:
     """Save a chart to a file.
 
@@ -4,10 +4,33 @@ from pathlib import Path
 
 import pytest
 
+from governance_token_analyzer.core.circuit_breaker import reset_circuit_breakers
+from governance_token_analyzer.core.http_cache import configure_http_cache
+from governance_token_analyzer.core.rate_limiter import reset_rate_limiters
+from governance_token_analyzer.core.transport import reset_transport
+
 # Add the project root to the Python path for imports
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# Keep provider responses out of the user's HTTP cache; tests that need one configure it
+os.environ.setdefault("HTTP_CACHE_ENABLED", "false")
+
+
+def _reset_provider_state():
+    configure_http_cache(None)
+    reset_rate_limiters()
+    reset_circuit_breakers()
+    reset_transport()
+
+
+@pytest.fixture(autouse=True)
+def isolated_provider_state():
+    """Give every test fresh process-wide caches, rate limiters, circuit breakers and transport."""
+    _reset_provider_state()
+    yield
+    _reset_provider_state()
+
 
 def pytest_configure(config):
     """Register custom markers."""
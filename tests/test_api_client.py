@@ -1,8 +1,13 @@
 """Tests for the API Client module."""
 
+import asyncio
+import json
+
 import pytest
 
-from governance_token_analyzer.core.api_client import APIClient
+from governance_token_analyzer.core import api_client as api_client_module
+from governance_token_analyzer.core.api_client import APIClient, AsyncAPIClient, TheGraphAPI, build_vote_batch_query
+from governance_token_analyzer.core.exceptions import DataAccessError
 
 
 # Initialize API client with test configuration
@@ -92,3 +97,180 @@ def test_get_protocol_data(api_client):
     # Test with invalid protocol
     with pytest.raises(ValueError):
         api_client.get_protocol_data("invalid_protocol")
+
+
+class _SlowGraphClient:
+    """Stand-in Graph client that records how many queries run at once."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def execute_query_async(self, query, variables=None, executor=None, **cache_options):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+        proposal_id = variables["proposalId"]
+        return {"data": {"votes": [{"id": f"{proposal_id}-1", "voter": "0xabc", "votingPower": "5"}]}}
+
+
+def test_get_votes_for_proposals_runs_concurrently(api_client):
+    """Votes for many proposals are fetched with bounded concurrency and keep their order."""
+    graph_client = _SlowGraphClient()
+    api_client.graph_clients["compound"] = graph_client
+
+    votes = api_client.get_votes_for_proposals(
+        "compound", [5, 3, 9, 1, 7, 2], use_real_data=True, max_concurrency=3, batch_size=1
+    )
+
+    assert list(votes) == [5, 3, 9, 1, 7, 2]
+    assert all(proposal_votes[0]["proposal_id"] == pid for pid, proposal_votes in votes.items())
+    assert graph_client.max_in_flight == 3
+
+
+def test_async_client_sample_data(api_client):
+    """Without real data the async client returns the same sample votes as the sync API."""
+    async_client = AsyncAPIClient(api_client, max_concurrency=2)
+    votes = asyncio.run(async_client.get_votes_for_proposals("compound", [1, 2]))
+
+    assert set(votes) == {1, 2}
+    assert all(len(proposal_votes) > 0 for proposal_votes in votes.values())
+    with pytest.raises(ValueError):
+        AsyncAPIClient(api_client, max_concurrency=0)
+
+
+class _PagedSession:
+    """Stand-in requests session serving id-ordered records with id_gt cursor paging."""
+
+    def __init__(self, entity, count, fail_after=None):
+        self.entity = entity
+        self.ids = sorted(f"{i:04d}" for i in range(count))
+        self.fail_after = fail_after
+        self.pages = 0
+        self.streamed = 0
+
+    def request(self, method, url, json=None, timeout=None, stream=False):
+        variables = json["variables"]
+        if self.fail_after is not None and self.pages >= self.fail_after:
+            raise ConnectionError("subgraph went away")
+        self.pages += 1
+        self.streamed += stream
+        page = [i for i in self.ids if i > variables["lastId"]][: variables["first"]]
+        records = [{"id": i, "voter": f"0x{i}", "votingPower": "1", "executed": i < "0002"} for i in page]
+        return _JSONResponse({"data": {self.entity: records}})
+
+
+class _JSONResponse:
+    status_code = 200
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+    def iter_content(self, chunk_size=1):
+        body = json.dumps(self.payload).encode()
+        for start in range(0, len(body), 7):
+            yield body[start : start + 7]
+
+    def close(self):
+        pass
+
+
+def _paged_graph_client(entity, count, fail_after=None):
+    graph_client = TheGraphAPI("http://localhost/subgraph")
+    graph_client.session = _PagedSession(entity, count, fail_after)
+    return graph_client
+
+
+def test_iter_votes_pages_past_the_first_page(api_client):
+    """Votes are streamed with id cursors instead of being truncated to one page."""
+    api_client.graph_clients["compound"] = _paged_graph_client("votes", 25)
+
+    votes = api_client.iter_votes("compound", 7, page_size=10)
+    first = next(votes)
+    assert first["proposal_id"] == 7 and first["id"] == "0000"
+    assert api_client.graph_clients["compound"].session.pages == 1
+
+    rest = list(votes)
+    assert [vote["id"] for vote in rest] == [f"{i:04d}" for i in range(1, 25)]
+    assert api_client.graph_clients["compound"].session.pages == 3
+    # Without a response cache every page is decoded from the body incrementally
+    assert api_client.graph_clients["compound"].session.streamed == 3
+
+
+def test_iter_proposals_limit_and_closed_tracking(api_client):
+    """Proposals are normalized, limited and remembered as closed when executed."""
+    api_client.graph_clients["compound"] = _paged_graph_client("proposals", 12)
+
+    proposals = list(api_client.iter_proposals("compound", limit=5, page_size=4))
+
+    assert [proposal["id"] for proposal in proposals] == [0, 1, 2, 3, 4]
+    assert api_client.graph_clients["compound"].session.pages == 2
+    assert api_client.closed_proposals["compound"] == {0, 1}
+
+
+def test_iter_votes_failure_mid_stream_raises(api_client):
+    """A failure after some pages were yielded is not hidden behind sample data."""
+    api_client.graph_clients["compound"] = _paged_graph_client("votes", 25, fail_after=1)
+
+    with pytest.raises(DataAccessError):
+        list(api_client.iter_votes("compound", 7, page_size=10))
+
+    api_client.graph_clients["compound"] = _paged_graph_client("votes", 25, fail_after=0)
+    fallback = list(api_client.iter_votes("compound", 7, page_size=10))
+    assert fallback and "vote_choice" in fallback[0]
+
+
+class _BatchSession:
+    """Stand-in requests session answering aliased vote batches from per-proposal vote counts."""
+
+    def __init__(self, vote_counts):
+        self.vote_counts = vote_counts
+        self.requests = 0
+
+    def request(self, method, url, json=None, timeout=None, stream=False):
+        self.requests += 1
+        variables = json["variables"]
+        data = {}
+        i = 0
+        while f"proposal{i}" in variables:
+            proposal_id = variables[f"proposal{i}"]
+            ids = [f"{proposal_id}-{n:03d}" for n in range(self.vote_counts[int(proposal_id)])]
+            page = [vote_id for vote_id in ids if vote_id > variables[f"lastId{i}"]][: variables["first"]]
+            data[f"p{i}"] = [{"id": vote_id, "voter": "0xabc", "votingPower": "2"} for vote_id in page]
+            i += 1
+        return _JSONResponse({"data": data})
+
+
+def test_batched_vote_query_aliases_each_proposal():
+    query = build_vote_batch_query(3)
+    assert query.count(": votes(") == 3
+    assert "p2: votes(where: {proposal: $proposal2, id_gt: $lastId2}" in query
+    with pytest.raises(ValueError):
+        build_vote_batch_query(0)
+
+
+def test_get_votes_for_proposals_in_batches(api_client, monkeypatch):
+    """Proposals share requests and are de-multiplexed back into per-proposal vote lists."""
+    monkeypatch.setattr(api_client_module, "GRAPH_PAGE_SIZE", 2)
+    vote_counts = {1: 3, 2: 1, 3: 5, 4: 0, 5: 2}
+    graph_client = TheGraphAPI("http://localhost/subgraph")
+    graph_client.session = _BatchSession(vote_counts)
+    api_client.graph_clients["compound"] = graph_client
+
+    votes = api_client.get_votes_for_proposals("compound", [1, 2, 3, 4, 5], use_real_data=True, batch_size=3)
+
+    assert list(votes) == [1, 2, 3, 4, 5]
+    for proposal_id in (1, 2, 3, 5):
+        assert [vote["id"] for vote in votes[proposal_id]] == [
+            f"{proposal_id}-{n:03d}" for n in range(vote_counts[proposal_id])
+        ]
+    assert "vote_choice" in votes[4][0]  # no votes: sample fallback, as for single proposals
+    # Three page rounds for the first batch and two for the second
+    assert graph_client.session.requests == 5
@@ -0,0 +1,76 @@
+"""Tests for vectorized balance ingestion."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from governance_token_analyzer.core.advanced_metrics import calculate_all_concentration_metrics
+from governance_token_analyzer.core.balance_parsing import (
+    HOLDER_BALANCE_FIELDS,
+    clean_balances,
+    holder_balances,
+    to_float_balances,
+)
+from governance_token_analyzer.core.data_processor import standardize_holder_data
+from governance_token_analyzer.core.metrics_collector import MetricsCollector
+
+
+def test_mixed_values_convert_in_bulk():
+    raw = ["1,000", "$5", " 7 ", 2.5, 3, True, None, "abc", "inf", "1e3", {"a": 1}, "12 345"]
+    numeric, rejected = to_float_balances(raw)
+
+    expected = [1000.0, 5.0, 7.0, 2.5, 3.0, 1.0, np.nan, np.nan, np.nan, 1000.0, np.nan, 12345.0]
+    np.testing.assert_array_equal(numeric, expected)
+    assert rejected == 4
+
+
+def test_clean_balances_keeps_positive_values_in_order():
+    positive, rejected = clean_balances(pd.Series(["10", "-3", "0", "oops", 4]))
+
+    assert positive.tolist() == [10.0, 4.0]
+    assert rejected == 1
+    assert clean_balances(np.array([3, 0, 2]))[0].tolist() == [3.0, 2.0]
+
+
+def test_holder_balances_use_first_present_field():
+    holders = [
+        {"TokenHolderQuantity": "5", "balance": 1},
+        {"balance": "2"},
+        {"tokenBalance": 3},
+        {"address": "0x1"},
+        "not a holder",
+    ]
+    numeric, rejected = holder_balances(holders, fields=HOLDER_BALANCE_FIELDS)
+
+    assert numeric[:3].tolist() == [5.0, 2.0, 3.0]
+    assert np.isnan(numeric[3:]).all()
+    assert rejected == 2
+
+
+def test_concentration_metrics_accept_formatted_strings():
+    formatted = calculate_all_concentration_metrics(["1,000", "$500", "250", None, "bad"])
+    plain = calculate_all_concentration_metrics([1000.0, 500.0, 250.0])
+
+    assert formatted["gini_coefficient"] == pytest.approx(plain["gini_coefficient"])
+    assert calculate_all_concentration_metrics(["0", None])["gini_coefficient"] == 0
+
+
+def test_standardize_holder_data_keeps_rows_aligned():
+    holders = [
+        {"address": "0xa", "balance": "1,500", "percentage": "60"},
+        {"address": "0xb", "balance": "oops"},
+        {"address": "0xc", "balance": 1000, "percentage": 40.0},
+    ]
+    df = standardize_holder_data(holders, "compound")
+
+    assert df["address"].tolist() == ["0xa", "0xb", "0xc"]
+    assert df["balance"].tolist() == [1500.0, 0.0, 1000.0]
+    assert df["percentage"].tolist() == [60.0, 0.0, 40.0]
+    assert (df["protocol"] == "compound").all()
+
+
+def test_collector_counts_rejected_holders():
+    balances = MetricsCollector._extract_positive_balances([{"balance": "10"}, {"balance": "x"}, {"other": 1}])
+
+    assert balances.to_ints() == [10]
+    assert balances.rejected == 2
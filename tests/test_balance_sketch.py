@@ -0,0 +1,104 @@
+"""Tests for the mergeable BalanceSketch."""
+
+import json
+
+import numpy as np
+import pytest
+
+from governance_token_analyzer.core.advanced_metrics import (
+    calculate_nakamoto_coefficient,
+    calculate_palma_ratio,
+    calculate_top_percentiles,
+)
+from governance_token_analyzer.core.balance_sketch import BalanceSketch
+from governance_token_analyzer.core.concentration_engine import ConcentrationEngine
+from governance_token_analyzer.core.historical_data import HistoricalDataManager
+
+
+@pytest.fixture
+def balances():
+    """Heavy-tailed balances spanning many orders of magnitude."""
+    rng = np.random.default_rng(3)
+    return rng.pareto(1.1, size=50_000) * 1e3 + 0.5
+
+
+def test_top_shares_within_error_bound(balances):
+    sketch = BalanceSketch(relative_accuracy=0.01).update(balances)
+    exact = ConcentrationEngine(balances).top_percentiles([1, 5, 10, 20, 50])
+    approx = sketch.top_percentiles([1, 5, 10, 20, 50])
+
+    for percentile, value in exact.items():
+        assert abs(approx[percentile] - value) <= sketch.relative_error * value
+
+
+def test_nakamoto_and_palma_within_error_bound(balances):
+    sketch = BalanceSketch(relative_accuracy=0.01).update(balances)
+    engine = ConcentrationEngine(balances)
+
+    for threshold in (33.0, 51.0, 67.0):
+        exact = engine.nakamoto_coefficient(threshold)
+        assert abs(sketch.nakamoto_coefficient(threshold) - exact) <= sketch.relative_error * exact + 1
+
+    assert sketch.palma_ratio() == pytest.approx(engine.palma_ratio(), rel=3 * sketch.relative_error)
+
+
+def test_sketch_size_is_independent_of_holder_count(balances):
+    small = BalanceSketch().update(balances[:1000])
+    large = BalanceSketch().update(np.tile(balances, 4))
+
+    assert large.count == 4 * len(balances)
+    assert len(large) <= small.max_buckets
+    assert large.total == pytest.approx(4 * balances.sum())
+
+
+def test_collapse_keeps_exact_totals():
+    sketch = BalanceSketch(max_buckets=16).update(np.logspace(0, 12, 1000))
+
+    assert len(sketch) == 16
+    assert sketch.collapsed
+    assert sketch.count == 1000
+    assert sketch.total == pytest.approx(np.logspace(0, 12, 1000).sum())
+
+
+def test_merge_equals_single_pass(balances):
+    merged = BalanceSketch()
+    for shard in np.array_split(balances, 5):
+        merged.merge(BalanceSketch().update(shard))
+    single = BalanceSketch().update(balances)
+
+    assert merged.counts == single.counts
+    assert merged.top_percentiles() == pytest.approx(single.top_percentiles())
+
+    with pytest.raises(ValueError):
+        merged.merge(BalanceSketch(relative_accuracy=0.05))
+
+
+def test_serialization_roundtrip(balances):
+    sketch = BalanceSketch().update(list(balances[:2000]) + [0, 0])
+    restored = BalanceSketch.from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+    assert restored.count == sketch.count
+    assert restored.nakamoto_coefficient() == sketch.nakamoto_coefficient()
+
+
+def test_approximate_mode_in_metric_functions():
+    balances = [1000, 500, 250, 100, 50, 25, 10, 5, 2, 1]
+
+    assert calculate_nakamoto_coefficient(balances, approximate=True) == calculate_nakamoto_coefficient(balances)
+    assert calculate_top_percentiles(BalanceSketch().update(balances))["50"] == pytest.approx(
+        calculate_top_percentiles(balances)["50"], rel=0.03
+    )
+    assert calculate_palma_ratio(balances, approximate=True) == pytest.approx(calculate_palma_ratio(balances), rel=0.05)
+
+
+def test_historical_manager_stores_sketch(tmp_path, balances):
+    manager = HistoricalDataManager(data_dir=str(tmp_path))
+    sketch = BalanceSketch().update(balances[:500])
+    data = {"metrics": {"gini_coefficient": 0.5}}
+
+    manager.store_snapshot("compound", data, timestamp="2024-01-01T00:00:00", sketch=sketch)
+    restored = manager.load_sketch("compound", "2024-01-01T00:00:00")
+
+    assert "balance_sketch" not in data
+    assert restored.counts == sketch.counts
+    assert manager.load_sketch("compound", "2024-02-01T00:00:00") is None
@@ -0,0 +1,82 @@
+"""Tests for bootstrap confidence intervals of concentration metrics."""
+
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from governance_token_analyzer.cli.main import cli
+from governance_token_analyzer.core import bootstrap
+from governance_token_analyzer.core.bootstrap import bootstrap_confidence_intervals
+from governance_token_analyzer.core.concentration_engine import ConcentrationEngine
+
+
+@pytest.fixture
+def balances():
+    return np.random.default_rng(0).pareto(1.5, 400) + 1
+
+
+def test_intervals_bracket_point_estimates(balances):
+    result = bootstrap_confidence_intervals(balances, confidence=0.9, resamples=300, seed=7)
+    engine = ConcentrationEngine(balances)
+
+    assert result["confidence"] == 0.9
+    assert result["resamples"] == 300
+    intervals = result["intervals"]
+    assert intervals["gini_coefficient"]["estimate"] == pytest.approx(engine.gini_coefficient())
+    assert intervals["nakamoto_coefficient"]["estimate"] == engine.nakamoto_coefficient()
+    assert intervals["herfindahl_index"]["estimate"] == pytest.approx(engine.herfindahl_index())
+    for interval in intervals.values():
+        assert interval["lower"] <= interval["upper"]
+        assert interval["std_error"] > 0
+    assert intervals["gini_coefficient"]["lower"] < engine.gini_coefficient() < intervals["gini_coefficient"]["upper"]
+
+
+def test_resamples_match_per_sample_metrics(balances):
+    # Each row of the index matrix must score like a full engine pass over that resample
+    seeds = np.random.SeedSequence(3).spawn(1)
+    block = bootstrap._resample_block(balances, 5, seeds[0], 51.0)
+    indices = np.random.default_rng(seeds[0]).integers(0, balances.size, size=(5, balances.size))
+
+    for row, sample in enumerate(balances[indices]):
+        engine = ConcentrationEngine(sample)
+        assert block["gini_coefficient"][row] == pytest.approx(engine.gini_coefficient())
+        assert block["nakamoto_coefficient"][row] == engine.nakamoto_coefficient()
+
+    assert bootstrap_confidence_intervals(balances, resamples=20, seed=3) == bootstrap_confidence_intervals(
+        balances, resamples=20, seed=3
+    )
+
+
+def test_process_pool_gives_same_result(balances, monkeypatch):
+    monkeypatch.setattr(bootstrap, "_BLOCK_ELEMENTS", 4000)
+    serial = bootstrap_confidence_intervals(balances, resamples=40, seed=11, workers=1)
+    monkeypatch.setattr(bootstrap, "_PARALLEL_MIN_ELEMENTS", 0)
+    parallel = bootstrap_confidence_intervals(balances, resamples=40, seed=11, workers=2)
+
+    assert parallel == serial
+
+
+def test_invalid_arguments_are_rejected():
+    with pytest.raises(ValueError):
+        bootstrap_confidence_intervals([1, 2, 3], confidence=1.5)
+    with pytest.raises(ValueError):
+        bootstrap_confidence_intervals([1, 2, 3], resamples=0)
+    with pytest.raises(ValueError):
+        bootstrap_confidence_intervals([0, -1])
+
+
+def test_analyze_command_reports_intervals(tmp_path, balances):
+    holders = [{"address": f"0x{i}", "balance": str(balance)} for i, balance in enumerate(balances)]
+    data = {"token_holders": holders, "metrics": {"gini_coefficient": 0.5}}
+    with patch("governance_token_analyzer.cli.commands.analyze.MetricsCollector") as collector:
+        collector.return_value.collect_protocol_data.return_value = data
+        result = CliRunner().invoke(cli, ["analyze", "-p", "compound", "--ci", "0.95", "--output-dir", str(tmp_path)])
+
+    assert result.exit_code == 0, result.output
+    assert "95% bootstrap confidence intervals" in result.output
+    (output_file,) = [path for path in tmp_path.iterdir() if path.suffix == ".json"]
+    saved = json.loads(output_file.read_text())
+    assert set(saved["confidence_intervals"]["intervals"]) == set(bootstrap.BOOTSTRAP_METRICS)
@@ -0,0 +1,139 @@
+"""Tests for the per-provider circuit breakers."""
+
+import pytest
+import requests
+from click.testing import CliRunner
+
+from governance_token_analyzer.cli.main import cli
+from governance_token_analyzer.core.api_client import APIClient, TheGraphAPI
+from governance_token_analyzer.core.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    circuit_breaker_states,
+    get_circuit_breaker,
+    reset_circuit_breakers,
+)
+from governance_token_analyzer.core.exceptions import CircuitOpenError
+
+
+class FakeClock:
+    """Clock that only moves when a test advances ``now``."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current fake time."""
+        return self.now
+
+
+def _http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    return requests.exceptions.HTTPError(f"HTTP {status_code}", response=response)
+
+
+def _raise(exception):
+    def call():
+        raise exception
+
+    return call
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    reset_circuit_breakers()
+    yield
+    reset_circuit_breakers()
+
+
+def test_opens_after_consecutive_failures_and_probes_after_cooldown():
+    clock = FakeClock()
+    breaker = CircuitBreaker("moralis", failure_threshold=2, cooldown=30, clock=clock)
+
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.Timeout):
+            breaker.call(_raise(requests.exceptions.Timeout("slow")))
+    assert breaker.state == OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(calls.append, 1)
+    assert calls == []
+
+    clock.now = 31
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # only one probe at a time
+    breaker.record_failure()
+    assert breaker.snapshot() == {"state": OPEN, "consecutive_failures": 3, "retry_in": 30}
+
+    clock.now = 62
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["consecutive_failures"] == 0
+
+
+def test_interrupted_probe_is_released():
+    clock = FakeClock()
+    breaker = CircuitBreaker("alchemy", failure_threshold=1, cooldown=30, clock=clock)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        breaker.call(_raise(requests.exceptions.ConnectionError("down")))
+
+    clock.now = 31
+    with pytest.raises(KeyboardInterrupt):
+        breaker.call(_raise(KeyboardInterrupt()))
+    assert breaker.state == HALF_OPEN
+    assert breaker.snapshot()["consecutive_failures"] == 1
+
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_only_provider_failures_count():
+    breaker = CircuitBreaker("etherscan", failure_threshold=1)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        breaker.call(_raise(_http_error(404)))
+    assert breaker.state == CLOSED
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        breaker.call(_raise(_http_error(503)))
+    assert breaker.state == OPEN
+
+
+def test_breakers_are_shared_and_reported(monkeypatch):
+    monkeypatch.setenv("CIRCUIT_FAILURE_THRESHOLD", "1")
+
+    first, second = APIClient(), APIClient()
+    assert first.circuit_breakers["moralis"] is second.circuit_breakers["moralis"]
+    assert TheGraphAPI("http://localhost/subgraph").circuit_breaker is get_circuit_breaker("graph")
+
+    first.circuit_breakers["moralis"].record_failure()
+    states = circuit_breaker_states()
+    assert set(states) >= {"alchemy", "graph", "moralis", "etherscan"}
+    assert states["moralis"]["state"] == OPEN
+    assert states["etherscan"]["state"] == CLOSED
+
+
+def test_status_labels_breaker_state_as_process_local():
+    get_circuit_breaker("moralis").failure_threshold = 1
+    get_circuit_breaker("moralis").record_failure()
+
+    result = CliRunner().invoke(cli, ["status"])
+
+    assert result.exit_code == 0, result.output
+    assert "Provider Health (this process only)" in result.output
+    assert "add -t to probe the providers first" in result.output
+    assert "moralis: open" in result.output
+
+
+def test_open_circuit_skips_graph_requests():
+    graph_client = TheGraphAPI("http://localhost/subgraph")
+    graph_client.circuit_breaker.failure_threshold = 1
+    graph_client.circuit_breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        graph_client.execute_query("{ proposals { id } }")
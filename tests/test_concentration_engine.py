@@ -0,0 +1,244 @@
+"""Tests for the vectorized ConcentrationEngine."""
+
+import math
+
+import numpy as np
+import pytest
+
+from governance_token_analyzer.core import advanced_metrics, token_analysis
+from governance_token_analyzer.core.concentration_engine import (
+    HOLDER_SIZE_LABELS,
+    ConcentrationEngine,
+    calculate_batch_metrics,
+    calculate_grouped_metrics,
+)
+from governance_token_analyzer.core.delegation_pattern_analysis import DelegationPatternAnalyzer
+from governance_token_analyzer.core.historical_data import analyze_concentration_trends
+
+
+@pytest.fixture
+def balances():
+    """Power-law style balances with a few ties."""
+    rng = np.random.default_rng(7)
+    return (rng.pareto(1.5, size=997) * 1000 + 1).round(3).tolist() + [50.0, 50.0, 50.0]
+
+
+def reference_gini(values):
+    ordered = sorted(values)
+    n = len(ordered)
+    weighted = sum((i + 1) * v for i, v in enumerate(ordered))
+    return (2 * weighted) / (n * sum(ordered)) - (n + 1) / n
+
+
+def reference_nakamoto(values, threshold):
+    ordered = sorted(values, reverse=True)
+    total = sum(ordered)
+    running = 0
+    for i, value in enumerate(ordered):
+        running += value
+        if running / total * 100 >= threshold:
+            return i + 1
+    return len(ordered)
+
+
+class TestConcentrationEngine:
+    """Compare the engine against straightforward loop implementations."""
+
+    def test_matches_reference_formulas(self, balances):
+        """Every index matches its textbook formula."""
+        engine = ConcentrationEngine(balances)
+        total = sum(balances)
+        mean = total / len(balances)
+
+        assert engine.gini_coefficient() == pytest.approx(reference_gini(balances))
+        assert engine.herfindahl_index() == pytest.approx(sum((b / total) ** 2 for b in balances) * 10000)
+        assert engine.hoover_index() == pytest.approx(sum(abs(b - mean) for b in balances) / (2 * total))
+        assert engine.theil_index() == pytest.approx(
+            sum((b / mean) * math.log(b / mean) for b in balances) / len(balances)
+        )
+        assert engine.shannon_entropy() == pytest.approx(-sum((b / total) * math.log2(b / total) for b in balances))
+        for threshold in (4.0, 33.0, 51.0, 67.0):
+            assert engine.nakamoto_coefficient(threshold) == reference_nakamoto(balances, threshold)
+
+    def test_top_percentiles_and_palma(self, balances):
+        """Top shares and the Palma ratio use the ranked balances."""
+        engine = ConcentrationEngine(balances)
+        ordered = sorted(balances, reverse=True)
+        total = sum(ordered)
+
+        top_10 = sum(ordered[:100]) / total
+        bottom_40 = sum(ordered[-400:]) / total
+        assert engine.palma_ratio() == pytest.approx(top_10 / bottom_40)
+        assert engine.top_percentiles([1, 10])["10"] == pytest.approx(top_10 * 100)
+
+    def test_lorenz_curve_endpoints(self, balances):
+        """The Lorenz curve runs from (0, 0) to (1, 1) with one point per holder."""
+        lorenz = ConcentrationEngine(balances).lorenz_curve()
+
+        assert len(lorenz["x"]) == len(balances) + 1
+        assert lorenz["x"][0] == 0 and lorenz["y"][0] == 0
+        assert lorenz["x"][-1] == 1 and lorenz["y"][-1] == 1
+
+    def test_empty_and_zero_balances(self):
+        """Empty and all-zero distributions report zero concentration."""
+        for engine in (ConcentrationEngine([]), ConcentrationEngine([0, 0, 0])):
+            assert engine.is_empty
+            assert engine.gini_coefficient() == 0.0
+            assert engine.nakamoto_coefficient() == 0
+            assert engine.lorenz_curve() == {"x": [0, 1], "y": [0, 1]}
+
+    def test_strict_nakamoto_threshold(self):
+        """A strict threshold needs holders above, not at, the share."""
+        engine = ConcentrationEngine([100, 100, 100, 100])
+
+        assert engine.nakamoto_coefficient(50.0) == 2
+        assert engine.nakamoto_coefficient(50.0, strict=True) == 3
+
+    def test_wrappers_reuse_prebuilt_engine(self, balances):
+        """Module-level wrappers accept an engine and reuse it."""
+        engine = ConcentrationEngine(balances)
+
+        assert ConcentrationEngine.from_balances(engine) is engine
+        assert advanced_metrics.calculate_gini_coefficient(engine) == engine.gini_coefficient()
+        assert token_analysis.calculate_nakamoto_coefficient(engine) == engine.nakamoto_coefficient(50.0, strict=True)
+
+    def test_all_concentration_metrics_uses_engine(self, balances):
+        """The combined metrics come from a single engine."""
+        metrics = advanced_metrics.calculate_all_concentration_metrics(balances)
+
+        assert metrics == ConcentrationEngine(balances).calculate_all()
+
+
+def test_batch_metrics_match_engine_per_snapshot():
+    rng = np.random.default_rng(5)
+    snapshots = [rng.pareto(1.4, size=size) * 100 + 1 for size in (0, 1, 7, 250, 1000)] + [[0.0, -3.0]]
+    batch = calculate_batch_metrics(snapshots, threshold=[51, 51, 33, 51, 67, 51], top_n=5)
+
+    for i, (snapshot, threshold) in enumerate(zip(snapshots, [51, 51, 33, 51, 67, 51])):
+        engine = ConcentrationEngine([value for value in snapshot if value > 0])
+        assert batch["gini_coefficient"][i] == pytest.approx(engine.gini_coefficient())
+        assert batch["nakamoto_coefficient"][i] == engine.nakamoto_coefficient(threshold)
+        assert batch["herfindahl_index"][i] == pytest.approx(engine.herfindahl_index())
+        assert batch["total_holders"][i] == engine.n
+        expected_top = engine.top_sum(5) / engine.total * 100 if engine.total else 0.0
+        assert batch["top_5_concentration"][i] == pytest.approx(expected_top)
+
+
+def test_batch_metrics_accepts_padded_matrix():
+    matrix = np.array([[1.0, 2.0, 3.0, np.nan], [5.0, 5.0, 5.0, 5.0]])
+    ragged = calculate_batch_metrics([[1.0, 2.0, 3.0], [5.0, 5.0, 5.0, 5.0]], strict=True)
+    padded = calculate_batch_metrics(matrix, strict=True)
+
+    for name, values in ragged.items():
+        assert padded[name] == pytest.approx(values)
+    assert padded["nakamoto_coefficient"].tolist() == [2, 3]
+
+
+def test_concentration_trends_computes_missing_metrics():
+    snapshots = [
+        {"timestamp": "2024-01-01T00:00:00", "data": {"token_holders": [{"balance": b} for b in (10, 20, 70)]}},
+        {"timestamp": "2024-02-01T00:00:00", "data": {"metrics": {"gini_coefficient": 0.4}}},
+    ]
+    trends = analyze_concentration_trends(snapshots, top_n_holders=1)
+
+    assert trends["top_1_concentration"].iloc[0] == pytest.approx(70.0)
+    assert trends["gini_coefficient"].tolist() == pytest.approx([reference_gini([10, 20, 70]), 0.4])
+
+
+def test_concentration_trends_parses_formatted_balances():
+    holders = [{"balance": "1,000.5"}, {"balance": "$2,000"}, {"balance": "n/a"}, {"balance": None}, "0xabc"]
+    trends = analyze_concentration_trends([{"timestamp": "2024-01-01T00:00:00", "data": {"token_holders": holders}}])
+
+    assert trends["gini_coefficient"].iloc[0] == pytest.approx(reference_gini([1000.5, 2000.0]))
+
+
+def test_lorenz_resolution_preserves_endpoints_and_gini():
+    balances = np.random.default_rng(9).pareto(1.2, size=50_000) + 0.01
+    engine = ConcentrationEngine(balances)
+    lorenz = engine.lorenz_curve(resolution=1000)
+    x, y = np.array(lorenz["x"]), np.array(lorenz["y"])
+
+    assert len(x) == len(y) == 1000
+    assert (x[0], y[0], x[-1], y[-1]) == (0.0, 0.0, 1.0, 1.0)
+    assert np.allclose(np.diff(x), 1 / 999)
+    assert np.all(np.diff(y) >= 0)
+    assert 1 - 2 * np.sum((x[1:] - x[:-1]) * (y[1:] + y[:-1]) / 2) == pytest.approx(engine.gini_coefficient(), abs=1e-12)
+
+
+def test_lorenz_resolution_defaults():
+    engine = ConcentrationEngine(list(range(1, 11)))
+
+    assert engine.lorenz_curve(resolution=1000) == engine.lorenz_curve()
+    assert len(advanced_metrics.calculate_all_concentration_metrics(list(range(1, 5001)))["lorenz_curve"]["x"]) == 1000
+    assert len(advanced_metrics.calculate_lorenz_curve(list(range(1, 5001)))["x"]) == 5001
+    with pytest.raises(ValueError):
+        engine.lorenz_curve(resolution=1)
+
+
+def test_grouped_metrics_match_per_group_engines():
+    rng = np.random.default_rng(4)
+    balances = np.concatenate([rng.pareto(1.1, 3000) + 1, [0.0, 0.0]])
+    result = calculate_grouped_metrics(balances)
+
+    assert result["theil_index"] == pytest.approx(ConcentrationEngine(balances).theil_index())
+    assert result["theil_within"] + result["theil_between"] == pytest.approx(result["theil_index"])
+    assert sum(group["share"] for group in result["groups"].values()) == pytest.approx(100)
+    for code, label in enumerate(HOLDER_SIZE_LABELS):
+        members = balances[result["codes"] == code]
+        engine = ConcentrationEngine(members)
+        group = result["groups"][label]
+        assert group["holder_count"] == members.size
+        assert group["gini_coefficient"] == pytest.approx(engine.gini_coefficient(), abs=1e-12)
+        assert group["herfindahl_index"] == pytest.approx(engine.herfindahl_index())
+
+
+def test_grouped_metrics_with_custom_group_values():
+    result = calculate_grouped_metrics(
+        [10, 20, 30, 40], thresholds=(0.1, 1.0), labels=("small", "medium", "large"), group_values=[0.05, 0.5, 0.5, 2]
+    )
+
+    assert [group["holder_count"] for group in result["groups"].values()] == [1, 2, 1]
+    assert result["groups"]["medium"]["total_balance"] == 50
+    with pytest.raises(ValueError):
+        calculate_grouped_metrics([1, 2], thresholds=(0.5,), labels=("only",))
+
+
+def test_delegation_categories_use_share_buckets():
+    holders = [{"address": f"0x{i}", "balance": balance} for i, balance in enumerate([5000, 50, 5, 0.5, 0.01])]
+    categories = DelegationPatternAnalyzer()._categorize_holders_by_balance(holders)
+    assert {label: len(members) for label, members in categories.items()} == {
+        "whale": 1,
+        "large": 1,
+        "medium": 1,
+        "small": 2,
+    }
+
+
+def test_nakamoto_thresholds_in_one_search(balances):
+    engine = ConcentrationEngine(balances)
+    thresholds = [67.0, 4.0, 50.0, 33.0, 100.0]
+
+    counts = engine.nakamoto_coefficients(thresholds)
+    assert counts.tolist() == [reference_nakamoto(balances, t) for t in thresholds]
+
+    named = advanced_metrics.calculate_nakamoto_thresholds(balances, proposal_threshold=0.1 * sum(balances))
+    assert named["majority"] == reference_nakamoto(balances, 50.0)
+    assert named["proposal_threshold"] == reference_nakamoto(balances, 10.0)
+
+    ordered = sorted(balances, reverse=True)
+    two_holders = advanced_metrics.calculate_nakamoto_thresholds(balances, proposal_threshold=ordered[0] + ordered[1] / 2)
+    assert two_holders["proposal_threshold"] == 2
+    assert advanced_metrics.calculate_nakamoto_thresholds(balances, proposal_threshold=2 * sum(balances)) == {
+        **advanced_metrics.calculate_nakamoto_thresholds(balances),
+        "proposal_threshold": None,
+    }
+
+
+def test_concentration_curve_is_monotonic(balances):
+    curve = advanced_metrics.calculate_concentration_curve(balances, resolution=11)
+
+    assert curve["share"] == pytest.approx(np.linspace(0, 100, 11))
+    assert curve["holders"][0] == 0
+    assert curve["holders"][-1] == len(balances)
+    assert curve["holders"][5] == reference_nakamoto(balances, 50.0)
+    assert np.all(np.diff(curve["holders"]) >= 0)
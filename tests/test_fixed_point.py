@@ -0,0 +1,104 @@
+"""Tests for exact fixed-point balance columns."""
+
+import numpy as np
+import pytest
+
+from governance_token_analyzer.core.advanced_metrics import calculate_all_concentration_metrics
+from governance_token_analyzer.core.api_client import APIClient
+from governance_token_analyzer.core.concentration_engine import ConcentrationEngine, calculate_batch_metrics
+from governance_token_analyzer.core.fixed_point import parse_balances
+from governance_token_analyzer.core.metrics_collector import MetricsCollector
+from governance_token_analyzer.core.token_analysis import calculate_gini_coefficient
+
+
+def test_wei_amounts_parse_exactly():
+    raw = ["123456789012345678901234567890", "1000000000000000000", "7", "00042"]
+    column = parse_balances(raw)
+
+    assert column.decimals == 0
+    assert column.to_ints() == [int(value) for value in raw]
+    assert column.exact_total() == sum(int(value) for value in raw)
+    assert column.scaled is None
+
+
+def test_fractional_tokens_keep_eighteen_decimals():
+    raw = ["1.000000000000000001", "0.5", "12", "3."]
+    column = parse_balances(raw)
+
+    assert column.decimals == 18
+    assert column.to_strings() == ["1.000000000000000001", "0.5", "12", "3"]
+    assert column.exact_total() == 16_500_000_000_000_000_001
+    assert np.asarray(column, dtype=np.float64).tolist() == pytest.approx([1.0, 0.5, 12.0, 3.0])
+
+
+def test_invalid_values_are_rejected_and_fallbacks_are_exact():
+    column = parse_balances([None, "abc", "-5", "1.2.3", "", "1e+21", 2.25, 10**30])
+
+    assert column.rejected == 4
+    assert column.to_strings() == ["0", "0", "0", "0", "0", "1000000000000000000000", "2.25", str(10**30)]
+
+
+def test_fallback_keeps_more_digits_than_the_default_decimal_precision():
+    # 31 significant digits in scientific notation take the Decimal fallback
+    column = parse_balances(["1234567890123456789012345678901.5e-13"], decimals=18)
+
+    assert column.to_ints() == [123456789012345678901234567890150000]
+
+
+def test_scientific_notation_sets_the_inferred_scale_and_negatives_are_rejected():
+    column = parse_balances(["5e-05", 5e-05, "10", "-3", -0.5, "1e-30"])
+
+    assert column.decimals == 18
+    assert column.to_strings() == ["0.00005", "0.00005", "10", "0", "0", "0"]
+    # Negative amounts and amounts below the 18 kept digits are reported, not silently zeroed
+    assert column.rejected == 3
+
+    holders = [{"address": "0x1", "balance": "5e-05"}, {"address": "0x2", "balance": "-3"}, {"address": "0x3", "balance": "10"}]
+    assert MetricsCollector._extract_positive_balances(holders).to_strings() == ["0.00005", "10"]
+    normalized = APIClient._normalize_holder_balances(holders)
+    assert [(holder["address"], holder["balance"]) for holder in normalized] == [
+        ("0x3", "10"),
+        ("0x1", "0.00005"),
+        ("0x2", "-3.0"),
+    ]
+
+
+def test_large_random_column_matches_python_ints():
+    rng = np.random.default_rng(2)
+    raw = [f"{high}{low:018d}" for high, low in zip(rng.integers(0, 10**9, 5000), rng.integers(0, 10**18, 5000))]
+    column = parse_balances(raw)
+
+    assert column.to_ints() == [int(value) for value in raw]
+    order = column.argsort(descending=True)
+    assert [column.to_ints()[i] for i in order] == sorted((int(value) for value in raw), reverse=True)
+
+
+def test_metric_functions_accept_columns_directly():
+    column = parse_balances(["400000000000000000000", "300000000000000000000", "200000000000000000000", "0"])
+    floats = [400.0, 300.0, 200.0]
+
+    assert ConcentrationEngine(column.positive()).gini_coefficient() == pytest.approx(
+        ConcentrationEngine(floats).gini_coefficient()
+    )
+    assert calculate_gini_coefficient(column) == pytest.approx(calculate_gini_coefficient(floats + [0.0]))
+    assert calculate_all_concentration_metrics(column)["nakamoto_coefficient"] == 2
+    assert calculate_batch_metrics([column])["total_holders"].tolist() == [3]
+
+
+def test_holder_normalization_keeps_every_digit():
+    holders = [
+        {"address": "0xa", "balance": "123456789012345678901"},
+        {"address": "0xb", "balance": 123456789012345678902},
+        {"address": "0xc", "balance": "oops"},
+    ]
+    normalized = APIClient._normalize_holder_balances(holders)
+
+    assert [holder["address"] for holder in normalized] == ["0xb", "0xa", "0xc"]
+    assert normalized[0]["balance"] == "123456789012345678902"
+    assert normalized[2]["balance"] == "0"
+
+
+def test_collector_parses_balances_once():
+    balances = MetricsCollector._extract_positive_balances([{"balance": "10"}, {"balance": "0"}, {"other": 1}])
+
+    assert balances.to_ints() == [10]
@@ -0,0 +1,117 @@
+"""Tests for hedged provider calls and latency tracking."""
+
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+from governance_token_analyzer.core.exceptions import AllProvidersFailedError
+from governance_token_analyzer.core.hedging import LatencyTracker, hedged_call
+
+
+def _slow(result, seconds, release=None):
+    def call():
+        if release is not None:
+            release.wait(seconds)
+        else:
+            time.sleep(seconds)
+        return result
+
+    return call
+
+
+def _failing(message):
+    def call():
+        raise ConnectionError(message)
+
+    return call
+
+
+def test_slow_primary_is_hedged():
+    release = threading.Event()
+    tracker = LatencyTracker()
+    start = time.monotonic()
+
+    name, result = hedged_call(
+        [("primary", _slow(["late"], 5, release)), ("secondary", _slow(["fast"], 0.01))],
+        tracker=tracker,
+        hedge_delay=0.05,
+    )
+    release.set()
+
+    assert (name, result) == ("secondary", ["fast"])
+    assert time.monotonic() - start < 1
+    assert tracker.summary()["secondary"]["count"] == 1
+
+
+def test_blocked_loser_does_not_delay_return_or_exit():
+    blocked = threading.Event()
+    start = time.monotonic()
+
+    name, result = hedged_call(
+        [("hanging", _slow(["never"], 60, blocked)), ("fallback", lambda: ["ok"])],
+        tracker=LatencyTracker(),
+        hedge_delay=0.05,
+    )
+
+    assert (name, result) == ("fallback", ["ok"])
+    assert time.monotonic() - start < 1
+    losers = [thread for thread in threading.enumerate() if thread.name == "hedge-hanging"]
+    assert losers and all(thread.daemon for thread in losers)
+    blocked.set()
+
+    # A fresh interpreter must exit without joining the request that is still hanging
+    script = textwrap.dedent(
+        """
+        import time
+        from governance_token_analyzer.core.hedging import LatencyTracker, hedged_call
+
+        print(hedged_call(
+            [("hanging", lambda: time.sleep(60)), ("fallback", lambda: ["ok"])],
+            tracker=LatencyTracker(),
+            hedge_delay=0.05,
+        )[0])
+        """
+    )
+    start = time.monotonic()
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=30)
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == "fallback"
+    assert time.monotonic() - start < 20
+
+
+def test_failures_fail_over_without_waiting():
+    start = time.monotonic()
+    name, result = hedged_call(
+        [("a", _failing("down")), ("b", lambda: []), ("c", lambda: ["ok"])],
+        tracker=LatencyTracker(),
+        hedge_delay=5,
+    )
+
+    assert (name, result) == ("c", ["ok"])
+    assert time.monotonic() - start < 1
+
+    with pytest.raises(AllProvidersFailedError):
+        hedged_call([("a", _failing("down")), ("b", lambda: None)], tracker=LatencyTracker())
+    with pytest.raises(ValueError):
+        hedged_call([])
+
+
+def test_hedge_delay_follows_latency_percentile():
+    tracker = LatencyTracker(percentile=90, default_delay=2.0, min_delay=0.1, max_delay=3.0)
+    assert tracker.hedge_delay("graph") == 2.0
+
+    for latency in [0.2, 0.3, 0.25, 0.4, 0.35, 0.3, 0.2, 0.3, 0.28, 1.5]:
+        tracker.record("graph", latency)
+    assert tracker.percentile("graph", 50) == 0.3
+    assert tracker.hedge_delay("graph") == 0.4
+
+    for _ in range(20):
+        tracker.record("etherscan", 0.01)
+        tracker.record("moralis", 30.0)
+    assert tracker.hedge_delay("etherscan") == 0.1
+    assert tracker.hedge_delay("moralis") == 3.0
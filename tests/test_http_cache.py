@@ -0,0 +1,132 @@
+"""Tests for the persistent HTTP response cache."""
+
+import pytest
+
+from governance_token_analyzer.core import http_cache
+from governance_token_analyzer.core.api_client import APIClient, TheGraphAPI
+from governance_token_analyzer.core.exceptions import OfflineCacheMissError
+from governance_token_analyzer.core.http_cache import (
+    NEVER_EXPIRES,
+    HTTPResponseCache,
+    configure_http_cache,
+    set_offline_mode,
+)
+
+
+class FakeClock:
+    """Clock that only moves when a test advances ``now``."""
+
+    def __init__(self):
+        self.now = 1_000.0
+
+    def __call__(self):
+        """Return the current fake time."""
+        return self.now
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class _CountingSession:
+    """Stand-in requests session that answers every request with the same payload."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.calls = 0
+
+    def request(self, method, url, json=None, timeout=None, stream=False):
+        self.calls += 1
+        return _Response(self.payload)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(http_cache.time, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HTTPResponseCache(str(tmp_path / "responses.sqlite"), ttls={"graph": 60, "graph:votes": 10})
+    configure_http_cache(cache)
+    yield cache
+    configure_http_cache(None)
+
+
+def test_entries_expire_per_endpoint(cache, clock):
+    cache.put("votes", "graph:votes", {"votes": [1]})
+    cache.put("proposals", "graph:proposals", {"proposals": [2]})
+    cache.put("closed", "graph:votes", {"votes": [3]}, ttl=NEVER_EXPIRES)
+
+    clock.now += 30
+    assert cache.get("votes") is None
+    assert cache.get("proposals") == {"proposals": [2]}
+
+    clock.now += 10**9
+    assert cache.get("closed") == {"votes": [3]}
+    assert cache.ttl_for("etherscan:account.balance") == http_cache.DEFAULT_TTL
+
+
+def test_eviction_drops_least_recently_used(tmp_path, clock):
+    cache = HTTPResponseCache(str(tmp_path / "small.sqlite"), max_bytes=40)
+    cache.put("a", "graph", "x" * 15)
+    clock.now += 1
+    cache.put("b", "graph", "y" * 15)
+    clock.now += 1
+    assert cache.get("a") == "x" * 15  # "a" is now the most recently used
+
+    clock.now += 1
+    cache.put("c", "graph", "z" * 15)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.stats()["bytes"] <= 40
+
+
+def test_offline_serves_stale_entries_and_raises_on_miss(cache, clock):
+    cache.put("votes", "graph:votes", {"votes": [1]})
+    clock.now += 3600
+
+    set_offline_mode(True)
+    assert cache.get("votes") == {"votes": [1]}
+    with pytest.raises(OfflineCacheMissError):
+        cache.get("unknown")
+
+
+def test_graph_queries_are_served_from_cache(cache):
+    client = TheGraphAPI("http://localhost/subgraph")
+    client.session = _CountingSession({"data": {"votes": []}})
+
+    first = client.execute_query("{ votes { id } }", {"proposalId": "1"}, cache_endpoint="graph:votes")
+    second = client.execute_query("{ votes { id } }", {"proposalId": "1"}, cache_endpoint="graph:votes")
+    client.execute_query("{ votes { id } }", {"proposalId": "2"}, cache_endpoint="graph:votes")
+
+    assert first == second
+    assert client.session.calls == 2
+
+    client.session = _CountingSession({"errors": ["indexing"]})
+    client.execute_query("{ broken }")
+    client.execute_query("{ broken }")
+    assert client.session.calls == 2
+
+
+def test_votes_of_closed_proposals_never_expire(cache):
+    api_client = APIClient()
+    api_client._record_closed_proposals(
+        "compound", [{"id": 1, "executed": True}, {"id": 2, "canceled": False, "queued": False}]
+    )
+
+    assert api_client._vote_cache_ttl("compound", 1) == NEVER_EXPIRES
+    assert api_client._vote_cache_ttl("compound", 2) is None
+    assert api_client._vote_cache_ttl("uniswap", 1) is None
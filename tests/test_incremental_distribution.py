@@ -0,0 +1,153 @@
+"""Tests for the delta-driven IncrementalDistribution."""
+
+import math
+import time
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from governance_token_analyzer.core.concentration_engine import ConcentrationEngine
+from governance_token_analyzer.core.exceptions import DataFormatError
+from governance_token_analyzer.core.historical_data import HistoricalDataManager
+from governance_token_analyzer.core.incremental_distribution import IncrementalDistribution
+
+
+def assert_matches_engine(distribution):
+    engine = ConcentrationEngine(list(distribution.balances.values()))
+
+    assert distribution.n == engine.n
+    assert distribution.total == pytest.approx(engine.total)
+    assert distribution.gini_coefficient() == pytest.approx(engine.gini_coefficient(), abs=1e-12)
+    for threshold in (33.0, 50.0, 51.0, 67.0):
+        assert distribution.nakamoto_coefficient(threshold) == engine.nakamoto_coefficient(threshold)
+        assert distribution.nakamoto_coefficient(threshold, strict=True) == engine.nakamoto_coefficient(
+            threshold, strict=True
+        )
+    for count in (1, 10, 100):
+        assert distribution.top_sum(count) == pytest.approx(engine.top_sum(count))
+
+
+def test_random_delta_batches_match_full_recompute():
+    rng = np.random.default_rng(1)
+    distribution = IncrementalDistribution({f"0x{i:040x}": float(v) for i, v in enumerate(rng.integers(1, 1000, 500))})
+
+    for _ in range(40):
+        deltas = []
+        for index in rng.integers(0, 700, size=rng.integers(1, 30)):
+            address = f"0x{index:040x}"
+            old = {a: new for a, _, new in deltas}.get(address, distribution.balances.get(address, 0.0))
+            new = float(rng.integers(0, 1200)) if rng.random() < 0.9 else 0.0
+            deltas.append((address, old, new))
+        distribution.apply_deltas(deltas)
+        assert_matches_engine(distribution)
+
+
+def _tree_depth(tree):
+    depth, level = 0, [tree.root] if tree.root else []
+    while level:
+        depth += 1
+        level = [child for node in level for child in (tree.left[node], tree.right[node]) if child]
+    return depth
+
+
+@pytest.mark.parametrize("holders", [1_000, 100_000])
+def test_updates_to_unseen_balances_stay_logarithmic(holders):
+    rng = np.random.default_rng(holders)
+    balances = rng.pareto(1.3, size=holders) * 1000 + 1
+    distribution = IncrementalDistribution({f"0x{i:040x}": value for i, value in enumerate(balances)}, seed=3)
+
+    timings = []
+    for index in rng.integers(0, holders * 2, size=2_000):
+        started = time.perf_counter()
+        distribution.update(f"0x{index:040x}", float(rng.pareto(1.3) * 1000 + 1))
+        timings.append(time.perf_counter() - started)
+
+    # Every update introduced a new distinct balance, yet the tree stays shallow
+    assert _tree_depth(distribution._tree) <= 4 * math.log2(distribution.n)
+    assert_matches_engine(distribution)
+
+    started = time.perf_counter()
+    ConcentrationEngine(list(distribution.balances.values())).gini_coefficient()
+    recompute = time.perf_counter() - started
+    assert np.median(timings) < max(recompute, 1e-3)
+
+
+def test_holder_diff_and_lorenz_curve():
+    holders = [{"address": f"0x{i}", "balance": balance} for i, balance in enumerate([100, 50, 25, 10])]
+    distribution = IncrementalDistribution.from_holders(holders)
+
+    updated = [{"address": "0x0", "balance": 60}, {"address": "0x1", "balance": 50}, {"address": "0x9", "balance": 5}]
+    deltas = distribution.diff(updated)
+    distribution.apply_deltas(deltas)
+
+    assert sorted(address for address, _, _ in deltas) == ["0x0", "0x2", "0x3", "0x9"]
+    assert distribution.balances == {"0x0": 60.0, "0x1": 50.0, "0x9": 5.0}
+    assert distribution.lorenz_curve() == ConcentrationEngine([60, 50, 5]).lorenz_curve()
+    assert_matches_engine(distribution)
+
+
+def test_mismatched_old_balance_is_rejected():
+    distribution = IncrementalDistribution({"0xa": 10.0})
+
+    with pytest.raises(ValueError):
+        distribution.apply_deltas([("0xa", 5.0, 20.0)])
+    assert distribution.balances == {"0xa": 10.0}
+
+
+def test_store_snapshot_applies_deltas(tmp_path):
+    manager = HistoricalDataManager(data_dir=str(tmp_path))
+    holders = [{"address": f"0x{i}", "balance": balance} for i, balance in enumerate([400, 300, 200, 100])]
+
+    manager.store_snapshot("compound", {"token_holders": holders}, timestamp="2024-01-01T00:00:00")
+    manager.store_snapshot(
+        "compound", {}, timestamp="2024-01-01T01:00:00", deltas=[("0x0", 400, 100), ("0x3", 100, 400)]
+    )
+
+    stored = manager.load_snapshot("compound", "2024-01-01T01:00:00")["metrics"]
+    assert stored["gini_coefficient"] == pytest.approx(ConcentrationEngine([100, 300, 200, 400]).gini_coefficient())
+    assert stored["nakamoto_coefficient"] == 2
+    assert manager.get_distribution("compound").balances["0x3"] == 400.0
+
+    with pytest.raises(DataFormatError):
+        manager.store_snapshot("compound", {}, timestamp="2024-01-01T02:00:00", deltas=[("0x1", 1, 2)])
+
+
+def test_store_snapshot_diffs_full_holder_lists(tmp_path):
+    manager = HistoricalDataManager(data_dir=str(tmp_path))
+    first = [{"address": f"0x{i}", "balance": balance} for i, balance in enumerate([400, 300, 200, 100])]
+    second = [{"address": "0x0", "balance": 50}, {"address": "0x4", "balance": 950}]
+
+    # Full holder lists are stored unchanged unless metrics are requested
+    manager.store_snapshot("aave", {"token_holders": first}, timestamp="2024-01-01T00:00:00")
+    assert "metrics" not in manager.load_snapshot("aave", "2024-01-01T00:00:00")
+
+    distribution = manager.get_distribution("aave")
+    with patch.object(IncrementalDistribution, "resync", wraps=distribution.resync) as rebuild:
+        manager.store_snapshot(
+            "aave", {"token_holders": second}, timestamp="2024-01-02T00:00:00", record_metrics=True
+        )
+    assert rebuild.call_count == 0
+    assert manager.get_distribution("aave") is distribution
+
+    stored = manager.load_snapshot("aave", "2024-01-02T00:00:00")["metrics"]
+    assert stored["gini_coefficient"] == pytest.approx(ConcentrationEngine([50, 950]).gini_coefficient())
+    assert stored["top_10_concentration"] == pytest.approx(100.0)
+    assert (stored["total_holders"], stored["nakamoto_coefficient"]) == (2, 1)
+
+    assert distribution.balances == {"0x0": 50.0, "0x4": 950.0}
+    manager.store_snapshot("aave", {}, timestamp="2024-01-03T00:00:00", deltas=[("0x4", 950, 450), ("0x5", 0, 500)])
+    assert manager.load_snapshot("aave", "2024-01-03T00:00:00")["metrics"]["total_holders"] == 3
+
+
+def test_long_delta_sequences_do_not_drift():
+    rng = np.random.default_rng(4)
+    distribution = IncrementalDistribution({f"0x{i}": 0.001 * (i + 1) for i in range(200)})
+
+    # A whale entering and leaving next to tiny balances cancels almost all precision of the running sums
+    for step in range(20_000):
+        distribution.update("0xwhale", 1e15 if step % 2 == 0 else 0.0)
+        distribution.update(f"0x{rng.integers(200)}", float(rng.uniform(0.0001, 0.01)))
+
+    assert distribution.total == pytest.approx(math.fsum(distribution.balances.values()), rel=1e-9)
+    assert_matches_engine(distribution)
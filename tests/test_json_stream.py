@@ -0,0 +1,78 @@
+"""Tests for incremental JSON decoding of provider responses."""
+
+import json
+
+import pytest
+
+from governance_token_analyzer.core.exceptions import DataAccessError
+from governance_token_analyzer.core.json_stream import iter_json_array, iter_response_array
+
+
+def _chunks(document, size):
+    body = json.dumps(document, indent=1).encode()
+    return [body[start : start + size] for start in range(0, len(body), size)]
+
+
+VOTES = [
+    {"id": "1", "votingPower": 12345678901234567890, "reason": "für — ✓"},
+    {"id": "2", "votingPower": 0.5, "reason": None, "support": True},
+]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 64, 4096])
+def test_elements_survive_any_chunk_boundary(size):
+    document = {"meta": {"skip": [1, {"x": "}"}]}, "data": {"other": 1, "votes": VOTES}}
+
+    assert list(iter_json_array(_chunks(document, size), ("data", "votes"))) == VOTES
+
+
+def test_elements_are_yielded_before_the_body_ends():
+    chunks = iter(_chunks({"result": VOTES}, 8))
+    records = iter_json_array(chunks, ("result",))
+
+    assert next(records) == VOTES[0]
+    assert list(chunks)  # the second record has not been read yet
+
+
+def test_missing_or_null_arrays_yield_nothing():
+    assert list(iter_json_array(_chunks({"data": None}, 5), ("data", "votes"))) == []
+    assert list(iter_json_array(_chunks({"data": {"proposals": []}}, 5), ("data", "votes"))) == []
+    assert list(iter_json_array(['{"result": []}'], ("result",))) == []
+
+
+def test_reported_errors_and_malformed_bodies_raise():
+    with pytest.raises(DataAccessError, match="rate limit"):
+        list(iter_json_array(_chunks({"errors": ["rate limit"], "data": None}, 4), ("data", "votes"), "errors"))
+
+    # Errors listed after the records are raised once the records are consumed
+    document = {"data": {"votes": VOTES}, "errors": ["partial"]}
+    records = iter_json_array(_chunks(document, 4), ("data", "votes"), "errors")
+    assert next(records) == VOTES[0]
+    with pytest.raises(DataAccessError, match="partial"):
+        list(records)
+
+    with pytest.raises(DataAccessError, match="Expected an array"):
+        list(iter_json_array(['{"status": "0", "result": "Invalid API Key"}'], ("result",)))
+    with pytest.raises(DataAccessError, match="Malformed"):
+        list(iter_json_array(['{"result": [{"id": 1}, {"id"'], ("result",)))
+
+
+class _StreamedResponse:
+    def __init__(self, document):
+        self.document = document
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        return iter(_chunks(self.document, chunk_size))
+
+    def close(self):
+        self.closed = True
+
+
+def test_response_is_closed_when_abandoned():
+    response = _StreamedResponse({"result": VOTES})
+    records = iter_response_array(response, ("result",), chunk_size=16)
+
+    assert next(records) == VOTES[0]
+    records.close()
+    assert response.closed
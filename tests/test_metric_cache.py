@@ -0,0 +1,122 @@
+"""Tests for the content-addressed metric result cache."""
+
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from governance_token_analyzer.core import metric_cache
+from governance_token_analyzer.core.advanced_metrics import calculate_all_concentration_metrics
+from governance_token_analyzer.core.concentration_engine import ConcentrationEngine
+from governance_token_analyzer.core.fixed_point import parse_balances
+from governance_token_analyzer.core.metric_cache import MetricCache
+from governance_token_analyzer.core.metrics_collector import MetricsCollector
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    cache = MetricCache()
+    monkeypatch.setattr(metric_cache, "_default_cache", cache)
+    return cache
+
+
+def test_keys_depend_on_content_metric_and_parameters():
+    cache = MetricCache()
+    balances = np.array([5.0, 3.0, 1.0])
+
+    key = cache.make_key(balances, "gini")
+    assert cache.make_key([5, 3, 1], "gini") == key
+    assert cache.make_key(np.array([5.0, 3.0, 2.0]), "gini") != key
+    assert cache.make_key(balances, "hhi") != key
+    assert cache.make_key(balances, "gini", threshold=51) != cache.make_key(balances, "gini", threshold=67)
+
+    # Exact columns hash their integer limbs, so amounts that round to the same float differ
+    a = parse_balances(["100000000000000000000000001"])
+    b = parse_balances(["100000000000000000000000002"])
+    assert float(a.to_float()[0]) == float(b.to_float()[0])
+    assert cache.make_key(a, "gini") != cache.make_key(b, "gini")
+
+
+def test_keys_change_with_the_cache_version(monkeypatch):
+    cache = MetricCache()
+    key = cache.make_key([5.0, 3.0], "gini")
+
+    monkeypatch.setattr(metric_cache, "METRIC_CACHE_VERSION", metric_cache.METRIC_CACHE_VERSION + 1)
+    assert cache.make_key([5.0, 3.0], "gini") != key
+    monkeypatch.undo()
+    monkeypatch.setattr(metric_cache, "__version__", "99.0.0")
+    assert cache.make_key([5.0, 3.0], "gini") != key
+
+
+def test_memory_tier_is_lru_and_returns_copies():
+    cache = MetricCache(max_entries=2)
+    cache.put("a", {"value": [1]})
+    cache.put("b", 2)
+    cache.get("a")["value"].append(99)
+    cache.put("c", 3)
+
+    assert cache.get("a") == {"value": [1]}
+    assert cache.get("b") is None
+    assert cache.stats()["memory_entries"] == 2
+
+
+def test_disk_tier_survives_new_instances_and_is_size_bounded(tmp_path):
+    cache = MetricCache(cache_dir=str(tmp_path), max_disk_bytes=200)
+    key = cache.make_key([1.0, 2.0], "metrics")
+    cache.put(key, {"gini_coefficient": np.float64(0.25), "nakamoto_coefficient": np.int64(1)})
+
+    fresh = MetricCache(cache_dir=str(tmp_path), max_disk_bytes=200)
+    assert fresh.get(key) == {"gini_coefficient": 0.25, "nakamoto_coefficient": 1}
+
+    for index in range(10):
+        fresh.put(f"filler{index}", {"payload": "x" * 40})
+    assert fresh.stats()["disk_bytes"] <= 200
+    assert os.path.exists(os.path.join(tmp_path, "filler9.json"))
+    assert not os.path.exists(os.path.join(tmp_path, f"{key}.json"))
+
+
+def test_repeated_metrics_do_not_recompute(shared_cache):
+    balances = list(np.random.default_rng(0).pareto(1.5, 500) + 1)
+
+    with patch.object(ConcentrationEngine, "calculate_all", autospec=True, wraps=ConcentrationEngine.calculate_all) as spy:
+        first = calculate_all_concentration_metrics(balances)
+        second = calculate_all_concentration_metrics(list(balances))
+        calculate_all_concentration_metrics(balances, lorenz_resolution=10)
+
+    assert spy.call_count == 2
+    assert first == second
+    assert shared_cache.hits == 1
+
+
+def test_collector_reuses_metrics_for_unchanged_holders(shared_cache):
+    holders = [{"address": f"0x{i}", "balance": str(1000 - i)} for i in range(100)]
+    collector = MetricsCollector(use_live_data=False)
+
+    with patch.object(collector.api_client, "get_token_holders", return_value=holders):
+        with patch.object(MetricsCollector, "_compute_metrics", wraps=MetricsCollector._compute_metrics) as spy:
+            first = collector.compare_protocols(["compound"])
+            second = collector.compare_protocols(["compound"])
+
+    assert spy.call_count == 1
+    assert first == second
+
+
+def test_compare_protocols_requests_the_same_metrics_for_every_protocol():
+    holders = {
+        "compound": [{"address": f"0x{i}", "balance": str(1000 - i)} for i in range(100)],
+        "uniswap": [{"address": f"0x{i}", "balance": str((i + 1) ** 2)} for i in range(50)],
+        "aave": [{"address": f"0x{i}", "balance": "10"} for i in range(20)],
+    }
+    collector = MetricsCollector(use_live_data=False, use_metric_cache=False)
+
+    with patch.object(collector.api_client, "get_token_holders", side_effect=lambda protocol, **_: holders[protocol]):
+        results = collector.compare_protocols(list(holders), metrics=["gini_coefficient"])
+        expected = {protocol: collector.collect_protocol_data(protocol, metrics=["gini_coefficient"]) for protocol in holders}
+
+    assert list(results) == list(holders)
+    for protocol, metrics in results.items():
+        assert "error" not in metrics
+        assert metrics == expected[protocol]["metrics"]
+        assert metrics["total_holders"] == len(holders[protocol])
+    assert results["aave"]["gini_coefficient"] == pytest.approx(0.0)
@@ -0,0 +1,58 @@
+"""Tests for the metric registry and its shared intermediates."""
+
+import numpy as np
+import pytest
+
+from governance_token_analyzer.core.concentration_engine import ConcentrationEngine
+from governance_token_analyzer.core.metric_registry import (
+    METRIC_REGISTRY,
+    available_metrics,
+    compute_metrics,
+    required_intermediates,
+)
+
+
+@pytest.fixture
+def balances():
+    rng = np.random.default_rng(11)
+    return rng.pareto(1.3, size=500) * 100 + 1
+
+
+def test_full_request_matches_calculate_all(balances):
+    expected = ConcentrationEngine(balances).calculate_all()
+    results = compute_metrics(balances)
+
+    assert set(results) == set(METRIC_REGISTRY)
+    for name, value in expected.items():
+        if isinstance(value, float):
+            assert results[name] == pytest.approx(value)
+        else:
+            assert results[name] == value
+
+
+def test_sort_free_metrics_skip_the_sort(balances):
+    engine = ConcentrationEngine(balances)
+    results = compute_metrics(engine, ["herfindahl_index", "shannon_entropy", "theil_index"])
+
+    assert list(results) == ["herfindahl_index", "shannon_entropy", "theil_index"]
+    assert "sorted_balances" not in vars(engine)
+    assert "cumulative" not in vars(engine)
+    assert "log_shares" in vars(engine)
+
+
+def test_intermediates_resolve_dependencies_first():
+    assert required_intermediates(["palma_ratio", "theil_index"]) == [
+        "sorted_ascending",
+        "cumsum",
+        "shares",
+        "log_shares",
+    ]
+    with pytest.raises(ValueError):
+        required_intermediates(["not_a_metric"])
+
+
+def test_options_and_scalar_listing(balances):
+    strict = compute_metrics(balances, ["nakamoto_coefficient"], options={"nakamoto_coefficient": {"threshold": 50.0}})
+    assert strict["nakamoto_coefficient"] == ConcentrationEngine(balances).nakamoto_coefficient(50.0)
+    assert "lorenz_curve" in available_metrics()
+    assert "lorenz_curve" not in available_metrics(scalar_only=True)
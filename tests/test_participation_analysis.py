@@ -0,0 +1,49 @@
+"""Tests for governance participation by holder size."""
+
+import logging
+
+import pandas as pd
+import pytest
+
+from governance_token_analyzer.core.participation_analysis import analyze_participation_by_holder_size
+
+
+@pytest.fixture
+def governance_data():
+    """Two proposals voted on by one large, one medium and one small holder."""
+    return {
+        "proposals": [
+            {"id": 1, "votes": [{"voter": "0xA"}, {"voter_address": "0xb"}]},
+            {"id": 2, "votes": [{"voter": "0xd"}]},
+        ]
+    }
+
+
+def test_participation_by_holder_size_parses_formatted_values(governance_data, caplog):
+    holders = pd.DataFrame(
+        {
+            "address": ["0xa", "0xB", "0xc", "0xD", "0xe"],
+            "balance": ["5,000", "500.5", "$400", "50", "n/a"],
+            "percentage": ["5.0", 0.5, "0.4", 0.05, 0.01],
+        }
+    )
+
+    with caplog.at_level(logging.DEBUG, logger="governance_token_analyzer.core.metrics_collector"):
+        result = analyze_participation_by_holder_size(governance_data, holders, protocol_name="compound")
+
+    by_size = result["metrics"]["participation_by_size"]
+    assert "error" not in result
+    assert list(by_size) == ["large_holders", "medium_holders", "small_holders"]
+    assert (by_size["large_holders"]["count"], by_size["large_holders"]["participation_rate"]) == (1, 100.0)
+    assert (by_size["medium_holders"]["count"], by_size["medium_holders"]["participation_rate"]) == (2, 50.0)
+    assert (by_size["small_holders"]["count"], by_size["small_holders"]["participation_rate"]) == (2, 50.0)
+    assert by_size["large_holders"]["supply_share"] == pytest.approx(5000 / 5950.5 * 100)
+    assert any("compound.analyze_participation_by_holder_size" in message for message in caplog.messages)
+
+
+def test_participation_by_holder_size_without_votes_or_holders(governance_data):
+    empty = analyze_participation_by_holder_size({"proposals": []}, pd.DataFrame({"address": ["0xa"]}), "aave")
+    assert empty == {"protocol": "aave", "metrics": {}}
+
+    missing = analyze_participation_by_holder_size(governance_data, pd.DataFrame(), "aave")
+    assert missing["error"] == "Insufficient data for analysis"
@@ -0,0 +1,88 @@
+"""Tests for the shared token-bucket rate limiters."""
+
+import asyncio
+import threading
+
+import pytest
+
+from governance_token_analyzer.core.api_client import APIClient, TheGraphAPI
+from governance_token_analyzer.core.rate_limiter import (
+    TokenBucket,
+    configure_rate_limit,
+    get_rate_limiter,
+    reset_rate_limiters,
+)
+
+
+class FakeClock:
+    """Clock that only moves when a test advances ``now``."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current fake time."""
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters():
+    reset_rate_limiters()
+    yield
+    reset_rate_limiters()
+
+
+def test_bucket_allows_burst_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock)
+
+    assert bucket._reserve(1) == 0
+    assert bucket._reserve(1) == 0
+    assert bucket._reserve(1) == pytest.approx(0.1)
+    assert not bucket.try_acquire()
+
+    clock.now = 0.3
+    assert bucket.try_acquire()
+    with pytest.raises(ValueError):
+        bucket.acquire(5)
+
+
+def test_concurrent_callers_share_the_quota():
+    bucket = TokenBucket(rate=1000, capacity=1)
+    waits = []
+
+    def worker():
+        waits.append(bucket.acquire())
+
+    threads = [threading.Thread(target=worker) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Reservations queue up: the slowest caller waits for up to 19 refills
+    assert 0.01 < max(waits) <= 0.019 + 1e-9
+
+
+def test_async_acquire_waits_without_blocking():
+    bucket = TokenBucket(rate=100, capacity=1)
+
+    async def run():
+        return await asyncio.gather(*(bucket.acquire_async() for _ in range(3)))
+
+    waits = asyncio.run(run())
+    assert waits[0] == 0
+    assert 0.01 < max(waits) <= 0.02 + 1e-9
+
+
+def test_limiters_are_shared_across_clients(monkeypatch):
+    monkeypatch.setenv("GRAPH_RATE_LIMIT", "3")
+
+    first = TheGraphAPI("http://localhost/subgraph")
+    second = TheGraphAPI("http://localhost/other")
+    assert first.rate_limiter is second.rate_limiter is get_rate_limiter("graph")
+    assert first.rate_limiter.rate == 3
+    assert APIClient().rate_limiters["etherscan"] is APIClient().rate_limiters["etherscan"]
+
+    upgraded = configure_rate_limit("graph", 50)
+    assert get_rate_limiter("graph") is upgraded
@@ -0,0 +1,106 @@
+"""Tests for the record/replay provider transport."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from governance_token_analyzer.core.api_client import TheGraphAPI
+from governance_token_analyzer.core.circuit_breaker import reset_circuit_breakers
+from governance_token_analyzer.core.rate_limiter import configure_rate_limit, reset_rate_limiters
+from governance_token_analyzer.core.replay import normalize_url, recording, replaying, run_load
+from src.analyzer.api import TheGraphAPI as LegacyGraphAPI
+
+SECRET = "sk-test-secret"
+QUERY = "query Votes($proposalId: String!) { votes(where: {proposal: $proposalId}) { id } }"
+
+
+class _UpstreamHandler(BaseHTTPRequestHandler):
+    """Stand-in for a live subgraph that echoes the query variables."""
+
+    def do_POST(self):  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        payload = json.dumps({"data": {"votes": [{"id": body["variables"]["proposalId"]}], "token": SECRET}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _UpstreamHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}/api/{SECRET}/subgraphs/id/votes"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_providers(monkeypatch):
+    monkeypatch.setenv("GRAPH_API_KEY", SECRET)
+    reset_circuit_breakers()
+    configure_rate_limit("graph", 10_000)
+    yield
+    reset_circuit_breakers()
+    reset_rate_limiters()
+
+
+def test_record_then_replay_without_the_provider(upstream, tmp_path):
+    server, url = upstream
+    cassette_dir = str(tmp_path / "cassette")
+
+    with recording(cassette_dir) as cassette:
+        recorded = TheGraphAPI(url).execute_query(QUERY, {"proposalId": "42"})
+    assert recorded["data"]["votes"] == [{"id": "42"}]
+    assert len(cassette) == 1
+    stored = next((tmp_path / "cassette").iterdir()).read_text()
+    assert SECRET not in stored
+
+    server.shutdown()
+
+    with replaying(cassette_dir, latency=0.05) as replay:
+        started = time.perf_counter()
+        replayed = TheGraphAPI(url).execute_query(QUERY, {"proposalId": "42"})
+        legacy = LegacyGraphAPI(url).execute_query(QUERY, {"proposalId": "42"})
+        elapsed = time.perf_counter() - started
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            TheGraphAPI(url).execute_query(QUERY, {"proposalId": "7"})
+
+    assert replayed["data"]["votes"] == legacy["data"]["votes"] == [{"id": "42"}]
+    assert elapsed >= 0.1
+    assert (replay.served, replay.misses) == (2, 1)
+
+
+def test_injected_errors_and_load_summary(upstream, tmp_path):
+    _, url = upstream
+    cassette_dir = str(tmp_path / "cassette")
+    with recording(cassette_dir):
+        TheGraphAPI(url).execute_query(QUERY, {"proposalId": "1"})
+
+    with replaying(cassette_dir, error_rate=1.0, seed=3) as replay:
+        with pytest.raises(requests.exceptions.HTTPError):
+            LegacyGraphAPI(url).execute_query(QUERY, {"proposalId": "1"})
+    assert replay.injected_errors == 1
+
+    client = TheGraphAPI(url)
+    with replaying(cassette_dir, latency=0.01, jitter=0.01, seed=3):
+        summary = run_load(lambda: client.execute_query(QUERY, {"proposalId": "1"}), 20, concurrency=4)
+
+    assert summary["requests"] == 20 and summary["errors"] == 0
+    assert 0.01 <= summary["p50"] <= summary["p99"] <= summary["max"]
+    assert summary["throughput"] > 0
+
+
+def test_normalized_urls_drop_credentials():
+    url = f"https://api.etherscan.io/api?module=stats&apikey={SECRET}&action=tokensupply"
+    assert normalize_url(url, [SECRET]) == "https://api.etherscan.io/api?action=tokensupply&module=stats"
@@ -0,0 +1,85 @@
+"""Tests for vectorized sample data generation."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from governance_token_analyzer.core.api_client import PROTOCOL_INFO, APIClient
+from governance_token_analyzer.core.balance_parsing import HOLDER_BALANCE_FIELDS, extract_balance_column
+from governance_token_analyzer.core.sample_data import (
+    VOTE_CHOICES,
+    ColumnRecords,
+    power_law_balances,
+    sample_holder_records,
+    sample_vote_records,
+)
+
+
+def test_power_law_matches_the_reference_formula():
+    balances = power_law_balances(1000, 5_000.0, alpha=1.3)
+    expected = [1.0 / ((i + 1) ** 1.3) for i in range(1000)]
+    expected = [value * 5_000.0 / sum(expected) for value in expected]
+
+    assert balances == pytest.approx(expected, rel=1e-12)
+    assert balances.sum() == pytest.approx(5_000.0)
+    assert power_law_balances(0, 10.0).size == 0
+
+
+def test_holder_records_build_dicts_only_on_access():
+    whales = ["0x" + "a" * 40, "0x" + "b" * 40]
+    holders = sample_holder_records("compound", 1_000_000, 10_000_000, 1.8, 42, whales)
+
+    assert len(holders) == 1_000_000
+    first, sixth, last = holders[0], holders[5], holders[-1]
+    assert first["address"] == whales[0] and first["label"] == "Whale 1" and first["is_contract"]
+    assert sixth["address"] == f"0x{42 + 5:040x}" and sixth["label"] == "Holder 6" and sixth["is_contract"]
+    assert not holders[6]["is_contract"]  # Only every 5th holder is a contract
+    assert last["balance"] < first["balance"]
+    assert first["percentage"] == pytest.approx(first["balance"] / 10_000_000)
+    assert list(first) == ["protocol", "address", "balance", "percentage", "label", "is_contract", "last_updated"]
+
+    # Pages are views: slicing and column access copy nothing and build no records
+    page = holders[100:200]
+    assert isinstance(page, ColumnRecords) and len(page) == 100
+    assert np.shares_memory(page.column("balance"), holders.column("balance"))
+    assert page[0] == holders[100] and page.to_list()[-1] == holders[199]
+    assert np.shares_memory(extract_balance_column(page, HOLDER_BALANCE_FIELDS), holders.column("balance"))
+
+    reversed_view = holders[4::-2]
+    assert [holder["label"] for holder in reversed_view] == ["Whale 5", "Whale 3", "Whale 1"]
+    assert reversed_view.column("balance").tolist() == holders.column("balance")[[4, 2, 0]].tolist()
+
+
+def test_vote_records_are_reproducible_and_tiered():
+    whales = PROTOCOL_INFO["aave"]["whale_addresses"]
+    now = datetime(2024, 5, 1)
+    votes = sample_vote_records(np.random.default_rng(11), "aave", 3, 16_000_000, whales, now=now)
+    again = sample_vote_records(np.random.default_rng(11), "aave", 3, 16_000_000, whales, now=now)
+
+    assert votes.to_list() == again.to_list()
+    assert 50 <= len(votes) <= 200
+    assert votes.column("voter")[: len(whales)].tolist() == whales
+    assert all(len(voter) == 42 for voter in votes.column("voter"))
+    assert all(len(tx_hash) == 66 and tx_hash.startswith("0x") for tx_hash in votes.column("tx_hash"))
+    assert set(votes.column("vote_choice")) <= set(VOTE_CHOICES)
+
+    # Top 5 voters hold 1-10% of supply each, the next 15 0.1-1%, the rest 0.01-0.1%
+    weights = votes.column("vote_weight")
+    for rows, low in ((slice(0, 5), 0.01), (slice(5, 20), 0.001), (slice(20, None), 0.0001)):
+        assert (weights[rows] > low * 0.999).all() and (weights[rows] < low * 10.001).all()
+    assert votes[0]["proposal_id"] == 3 and isinstance(votes[0]["voting_power"], float)
+    assert min(votes.column("voted_at")) >= "2024-04-17" and max(votes.column("voted_at")) < "2024-05-01"
+
+
+def test_client_sample_data_is_seeded(monkeypatch):
+    monkeypatch.setenv("SAMPLE_DATA_SEED", "5")
+    first, second = APIClient(), APIClient()
+
+    def tx_hashes(client, proposal_id):
+        return [vote["tx_hash"] for vote in client._generate_sample_vote_data("compound", proposal_id)]
+
+    assert tx_hashes(first, 1) == tx_hashes(second, 1)
+    assert tx_hashes(first, 2) != tx_hashes(first, 2)
+    holders = first._generate_sample_holder_data("uniswap", 10)
+    assert isinstance(holders, list) and holders[0]["address"] == PROTOCOL_INFO["uniswap"]["whale_addresses"][0]
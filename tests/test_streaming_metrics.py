@@ -0,0 +1,125 @@
+"""Tests for the streaming metric accumulators."""
+
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from click.testing import CliRunner
+
+from governance_token_analyzer.cli.main import cli
+from governance_token_analyzer.core.api_client import APIClient
+from governance_token_analyzer.core.concentration_engine import ConcentrationEngine
+from governance_token_analyzer.core.metrics_collector import MetricsCollector
+from governance_token_analyzer.core.streaming_metrics import (
+    HerfindahlAccumulator,
+    MetricAccumulator,
+    StreamingMetrics,
+    TheilAccumulator,
+)
+
+
+@pytest.fixture
+def balances():
+    """Heavy-tailed balances."""
+    rng = np.random.default_rng(11)
+    return rng.pareto(1.3, size=5000) * 1e6 + 1
+
+
+def test_streaming_matches_full_engine(balances):
+    metrics = StreamingMetrics().update_many(np.array_split(balances, 17)).result()
+    engine = ConcentrationEngine(balances)
+
+    assert metrics["total_holders"] == len(balances)
+    assert metrics["total_supply"] == pytest.approx(engine.total)
+    assert metrics["herfindahl_index"] == pytest.approx(engine.herfindahl_index())
+    assert metrics["shannon_entropy"] == pytest.approx(engine.shannon_entropy())
+    assert metrics["theil_index"] == pytest.approx(engine.theil_index())
+
+
+def test_merged_shards_equal_single_pass(balances):
+    shards = np.array_split(balances, 4)
+    merged = StreamingMetrics()
+    for shard in shards:
+        merged.merge(StreamingMetrics().update(shard))
+
+    single = StreamingMetrics().update(balances).result()
+    for name, value in merged.result().items():
+        assert value == pytest.approx(single[name])
+
+
+def test_non_positive_balances_are_ignored():
+    accumulator = TheilAccumulator().update([0, -5, 100, 100])
+
+    assert accumulator.count == 2
+    assert accumulator.result() == pytest.approx(0.0)
+
+
+def test_merge_rejects_mismatched_types():
+    with pytest.raises(TypeError):
+        HerfindahlAccumulator().merge(TheilAccumulator())
+
+
+def test_incomplete_accumulator_cannot_be_created():
+    class CountOnly(MetricAccumulator):
+        def _update(self, values):
+            pass
+
+    with pytest.raises(TypeError):
+        CountOnly()
+
+
+def test_empty_accumulators_return_zero():
+    assert StreamingMetrics().result() == {
+        "herfindahl_index": 0.0,
+        "shannon_entropy": 0.0,
+        "theil_index": 0.0,
+        "total_holders": 0,
+        "total_supply": 0.0,
+    }
+
+
+def test_collector_streams_pages():
+    collector = MetricsCollector(use_live_data=False)
+
+    streamed = collector.stream_protocol_metrics("compound", limit=250, page_size=100)
+    collected = collector.collect_protocol_data("compound", limit=250)["metrics"]
+
+    assert streamed["pages"] == 3
+    assert streamed["metrics"]["total_holders"] == collected["total_holders"]
+    assert streamed["metrics"]["theil_index"] == pytest.approx(collected["theil_index"])
+    assert streamed["metrics"]["shannon_entropy"] == pytest.approx(collected["shannon_entropy"])
+
+
+def test_simulated_pages_are_generated_lazily():
+    client = APIClient()
+    expected = client._sample_holder_records("aave", 250).to_list()
+
+    with patch.object(APIClient, "_sample_holder_records", side_effect=AssertionError("materialized every holder")):
+        pages = client.iter_token_holder_pages("aave", limit=250, page_size=100, use_real_data=False)
+        first = next(pages)
+        assert len(first) == 100 and first.column("balance").size == 100
+        holders = first.to_list() + [holder for page in pages for holder in page]
+
+    assert [holder["address"] for holder in holders] == [holder["address"] for holder in expected]
+    assert [holder["label"] for holder in holders] == [holder["label"] for holder in expected]
+    assert [holder["balance"] for holder in holders] == pytest.approx([holder["balance"] for holder in expected])
+
+
+def test_analyze_command_streams_pages(tmp_path):
+    with patch(
+        "governance_token_analyzer.cli.commands.analyze.MetricsCollector",
+        side_effect=lambda use_live_data: MetricsCollector(use_live_data=False),
+    ):
+        result = CliRunner().invoke(
+            cli, ["analyze", "-p", "compound", "-l", "250", "--stream", "--output-dir", str(tmp_path)]
+        )
+
+    assert result.exit_code == 0, result.output
+    assert "streamed in 3 pages" in result.output
+    (output_file,) = tmp_path.iterdir()
+    saved = json.loads(output_file.read_text())
+    assert saved["metrics"]["total_holders"] == 250 and "buckets" in saved["balance_sketch"]
+
+    result = CliRunner().invoke(cli, ["analyze", "-p", "compound", "--stream", "--chart"])
+    assert result.exit_code != 0 and "--stream cannot be combined" in result.output
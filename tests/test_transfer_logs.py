@@ -0,0 +1,210 @@
+"""Tests for holder balance reconstruction from Transfer logs."""
+
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from governance_token_analyzer.core.api_client import TOKEN_ADDRESSES, APIClient
+from governance_token_analyzer.core.circuit_breaker import reset_circuit_breakers
+from governance_token_analyzer.core.exceptions import JSONRPCError
+from governance_token_analyzer.core.rate_limiter import configure_rate_limit, reset_rate_limiters
+from governance_token_analyzer.core.transfer_logs import (
+    TRANSFER_TOPIC,
+    ZERO_ADDRESS,
+    BalanceTable,
+    JSONRPCClient,
+    TransferLogIngestor,
+    decode_transfer,
+    format_units,
+)
+
+TOKEN = "0x" + "7" * 40
+LATEST_BLOCK = 999
+
+
+def _topic(address):
+    return "0x" + "0" * 24 + address[2:]
+
+
+def _log(block, sender, recipient, amount, **extra):
+    return {
+        "address": TOKEN,
+        "blockNumber": hex(block),
+        "topics": [TRANSFER_TOPIC, _topic(sender), _topic(recipient)],
+        "data": f"0x{amount:064x}",
+        **extra,
+    }
+
+
+def _synthetic_history(seed=3):
+    """Mints, random transfers with a dense burst of activity, and a burn."""
+    rng = random.Random(seed)
+    holders = [f"0x{index + 1:040x}" for index in range(30)]
+    logs = [_log(0, ZERO_ADDRESS, holder, 10**24 + index) for index, holder in enumerate(holders)]
+    for block in range(1, LATEST_BLOCK + 1):
+        per_block = 40 if 400 <= block < 420 else rng.randrange(0, 3)
+        for _ in range(per_block):
+            sender, recipient = rng.sample(holders, 2)
+            logs.append(_log(block, sender, recipient, rng.randrange(1, 10**18)))
+    logs.append(_log(LATEST_BLOCK, holders[0], ZERO_ADDRESS, 5 * 10**23))
+    return logs
+
+
+class _NodeHandler(BaseHTTPRequestHandler):
+    """JSON-RPC node that rejects log queries matching more than ``result_limit`` logs."""
+
+    def do_POST(self):  # noqa: N802
+        server = self.server
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        method, params = request["method"], request["params"]
+
+        if method == "eth_blockNumber":
+            reply = {"result": hex(LATEST_BLOCK)}
+        elif method == "eth_getLogs":
+            log_filter = params[0]
+            start, end = int(log_filter["fromBlock"], 16), int(log_filter["toBlock"], 16)
+            with server.lock:
+                server.ranges.append((start, end))
+            logs = [
+                log
+                for log in server.logs
+                if start <= int(log["blockNumber"], 16) <= end and log["address"] == log_filter["address"]
+            ]
+            if len(logs) > server.result_limit:
+                message = f"query returned more than {server.result_limit} results"
+                reply = {"error": {"code": -32005, "message": message}}
+            else:
+                reply = {"result": logs}
+        else:
+            reply = {"error": {"code": -32601, "message": f"the method {method} does not exist"}}
+
+        body = json.dumps({"jsonrpc": "2.0", "id": request["id"], **reply}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def node():
+    configure_rate_limit("rpc", 1_000_000)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _NodeHandler)
+    server.lock = threading.Lock()
+    server.logs = _synthetic_history()
+    server.ranges = []
+    server.result_limit = 100
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    reset_rate_limiters()
+    reset_circuit_breakers()
+
+
+def _expected_balances(logs):
+    balances = {}
+    for log in logs:
+        sender, recipient, amount = decode_transfer(log)
+        if sender != ZERO_ADDRESS:
+            balances[sender] = balances.get(sender, 0) - amount
+        if recipient != ZERO_ADDRESS:
+            balances[recipient] = balances.get(recipient, 0) + amount
+    return {address: balance for address, balance in balances.items() if balance}
+
+
+def test_parallel_ingestion_rebuilds_exact_balances(node):
+    server, url = node
+    ingestor = TransferLogIngestor(JSONRPCClient(url), TOKEN, chunk_size=200, max_workers=4)
+
+    table = ingestor.build_balance_table()
+
+    assert dict(table.holders()) == _expected_balances(server.logs)
+    assert table.transfers == len(server.logs) and table.last_block == LATEST_BLOCK
+    assert table.total_supply == sum(10**24 + index for index in range(30)) - 5 * 10**23
+    assert sum(balance for _, balance in table.holders()) == table.total_supply
+    assert table.negative_balances() == {}
+    # No range was skipped or fetched twice
+    assert ingestor.stats["logs"] == len(server.logs)
+    assert ingestor.stats["splits"] > 0
+
+
+def test_dense_ranges_are_split_and_the_chunk_size_adapts(node):
+    server, url = node
+    ingestor = TransferLogIngestor(JSONRPCClient(url), TOKEN, chunk_size=300, max_workers=1, max_chunk_size=600)
+
+    table = ingestor.build_balance_table(0, LATEST_BLOCK)
+
+    assert ingestor.stats["splits"] > 0
+    # Ranges over the 40-logs-per-block burst had to shrink to two blocks
+    assert any(end - start + 1 <= 2 and 400 <= start < 420 for start, end in server.ranges)
+    assert ingestor.chunk_size > 2  # and grew again over the sparse blocks after it
+    assert ingestor.chunk_size <= 600
+    assert dict(table.holders()) == _expected_balances(server.logs)
+
+
+def test_a_single_block_over_the_limit_and_other_errors_are_raised(node):
+    server, url = node
+    server.result_limit = 10
+    ingestor = TransferLogIngestor(JSONRPCClient(url), TOKEN, chunk_size=100, max_workers=2)
+    with pytest.raises(JSONRPCError, match="more than 10 results"):
+        ingestor.build_balance_table(390, 430)
+
+    with pytest.raises(JSONRPCError) as raised:
+        JSONRPCClient(url).call("eth_chainId")
+    assert raised.value.code == -32601
+
+
+def test_decoding_skips_removed_and_non_erc20_logs():
+    sender, recipient = "0x" + "A" * 40, "0x" + "b" * 40
+    assert decode_transfer(_log(1, sender, recipient, 5)) == ("0x" + "a" * 40, recipient, 5)
+    assert decode_transfer(_log(1, sender, recipient, 0, data="0x")) == ("0x" + "a" * 40, recipient, 0)
+    assert decode_transfer(_log(1, sender, recipient, 5, removed=True)) is None
+    nft = _log(1, sender, recipient, 0)
+    nft["topics"].append(_topic("0x" + "0" * 39 + "9"))
+    assert decode_transfer(nft) is None
+
+    table = BalanceTable()
+    assert table.apply([_log(1, ZERO_ADDRESS, sender, 3), _log(2, sender, recipient, 5)]) == 2
+    assert table.negative_balances() == {"0x" + "a" * 40: -2}
+
+
+def test_units_and_holder_records():
+    assert format_units(15 * 10**17, 18) == "1.5"
+    assert format_units(10**36 + 1, 18) == "1000000000000000000.000000000000000001"
+    assert format_units(-(10**18), 18) == "-1" and format_units(42, 0) == "42"
+
+    table = BalanceTable()
+    table.apply([_log(1, ZERO_ADDRESS, "0x" + "1" * 40, 3 * 10**18), _log(1, ZERO_ADDRESS, "0x" + "2" * 40, 10**18)])
+    records = table.to_holder_records("compound")
+    assert [record["balance"] for record in records] == ["3", "1"]
+    assert records[0]["percentage"] == 0.75 and records[0]["label"] == "Whale 1"
+
+
+def test_client_reconstructs_holders_from_a_node(node, monkeypatch):
+    server, url = node
+    token = TOKEN_ADDRESSES["compound"]
+    server.logs = [
+        _log(5, ZERO_ADDRESS, "0x" + "1" * 40, 7 * 10**18),
+        _log(9, "0x" + "1" * 40, "0x" + "2" * 40, 25 * 10**17),
+    ]
+    for log in server.logs:
+        log["address"] = token
+
+    holders = APIClient().get_token_holders_from_logs("compound", rpc_url=url)
+    assert [(holder["address"], holder["balance"]) for holder in holders] == [
+        ("0x" + "1" * 40, "4.5"),
+        ("0x" + "2" * 40, "2.5"),
+    ]
+
+    monkeypatch.delenv("ALCHEMY_API_KEY", raising=False)
+    monkeypatch.delenv("INFURA_PROJECT_ID", raising=False)
+    with pytest.raises(ValueError, match="JSON-RPC endpoint"):
+        APIClient().get_token_holders_from_logs("compound")
@@ -0,0 +1,123 @@
+"""Tests for the shared pooled HTTP transport."""
+
+import gzip
+import json
+import random
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from governance_token_analyzer.core.transport import HTTPTransport, parse_retry_after
+
+
+class _ProviderHandler(BaseHTTPRequestHandler):
+    """Keep-alive provider that gzips its answers and fails the first requests on demand."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # noqa: N802
+        server = self.server
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.requests += 1
+            failing = server.failures > 0
+            server.failures -= failing
+
+        if failing:
+            self.send_response(server.failure_status)
+            self.send_header("Retry-After", server.retry_after)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        body = json.dumps({"result": [{"id": server.requests}], "encoding": self.headers["Accept-Encoding"]}).encode()
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def provider():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _ProviderHandler)
+    server.lock = threading.Lock()
+    server.connections = set()
+    server.requests = 0
+    server.failures = 0
+    server.failure_status = 503
+    server.retry_after = "1"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}/api"
+    server.shutdown()
+    server.server_close()
+
+
+def _transport(**options):
+    sleeps = []
+    transport = HTTPTransport(sleep=sleeps.append, rng=random.Random(7), **options)
+    return transport, sleeps
+
+
+def test_sessions_share_keep_alive_connections_and_decompress(provider):
+    server, url = provider
+    transport, _ = _transport()
+    first, second = transport.create_session(), transport.create_session({"User-Agent": "test"})
+
+    for session in (first, second, first, second):
+        response = transport.request(session, "etherscan", "GET", url)
+        assert response.json()["result"]
+
+    assert "gzip" in response.json()["encoding"]
+    assert len(server.connections) == 1
+    stats = transport.stats()["etherscan"]
+    assert (stats["requests"], stats["retries"], stats["failures"]) == (4, 0, 0)
+    assert stats["p50"] > 0
+
+
+def test_overload_is_retried_after_the_requested_delay(provider):
+    server, url = provider
+    server.failures, server.failure_status, server.retry_after = 2, 429, "2"
+    transport, sleeps = _transport(max_retries=3, backoff=0.5)
+    throttled = []
+
+    session = transport.create_session()
+    response = transport.request(session, "moralis", "GET", url, throttle=lambda: throttled.append(1))
+
+    assert response.status_code == 200
+    assert len(sleeps) == 2 and all(2 <= delay <= 3 for delay in sleeps)
+    assert len(throttled) == 3  # one rate limit token per attempt
+    assert transport.stats()["moralis"]["retries"] == 2
+
+
+def test_gives_up_when_retries_run_out_or_the_wait_is_too_long(provider):
+    server, url = provider
+    server.failures = 5
+    transport, sleeps = _transport(max_retries=1)
+    response = transport.request(transport.create_session(), "graph", "GET", url)
+    assert response.status_code == 503 and len(sleeps) == 1
+    assert transport.stats()["graph"]["failures"] == 2
+
+    server.failures, server.retry_after = 5, "3600"
+    transport, sleeps = _transport(max_retries=3, max_backoff=30)
+    response = transport.request(transport.create_session(), "graph", "GET", url)
+    assert response.status_code == 503 and sleeps == []
+
+
+def test_retry_after_accepts_seconds_and_dates():
+    now = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Mon, 01 Jan 2024 12:00:30 GMT", now=now) == 30
+    assert parse_retry_after("Mon, 01 Jan 2024 11:00:00 GMT", now=now) == 0
+    assert parse_retry_after("soon") is None and parse_retry_after(None) is None